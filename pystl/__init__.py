@@ -1,3 +1,7 @@
 # -*- coding: utf-8 -*-
 
-from .vector import Vector, VectorInt, VectorLong
+from . import engine
+from .vector import (Vector, VectorInt, VectorLong, VectorInt8, VectorInt16,
+                     VectorInt32, VectorInt64, VectorUInt8, VectorUInt16,
+                     VectorUInt32, VectorUInt64, VectorFloat, VectorDouble,
+                     Mask)
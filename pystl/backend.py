@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+"""
+backend
+~~~~~~~
+
+Bindings between the `vector_*` functions used by :class:`pystl.vector.Vector`
+and their C implementation.
+
+Every element type exposes the same set of functions, declared in
+:data:`FUNCTIONS`, :data:`CHECKED_FUNCTIONS` and :data:`REDUCTIONS`, which a backend turns into
+Python callables taking the `void *` to the vector as a plain integer:
+
+- :class:`CtypesBackend` calls the `py_vector_<type>_*` C interface in
+  `_pystl.so` through ctypes. It is always available and implements them all.
+- :class:`SpeedupsBackend` calls the per element functions through the
+  `pystl._speedups` CPython extension module, built from the very same C++
+  templates, which avoids the ctypes argument conversion on every call. The
+  rest of the functions, whose cost does not depend on the call overhead, are
+  still called through ctypes.
+
+The fastest available backend is picked at import time, unless the
+`PYSTL_BACKEND` environment variable names one of :data:`BACKENDS`.
+
+Both backends follow the same conventions, so the :class:`Vector` code does not
+depend on which one is in use: checked functions take only their input
+arguments, return their output value and raise `IndexError` on failure or
+for indexes which do not fit in a `ssize_t`, and arguments of the wrong type
+raise `TypeError`.
+"""
+import operator
+import os
+from functools import partial
+from ctypes import (cdll, sizeof, ArgumentError, CFUNCTYPE, POINTER, c_void_p, c_size_t,
+                    c_ssize_t, c_int, c_int64, c_uint64, c_double)
+from ctypes import _Pointer
+
+
+def here(path):
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), path))
+
+
+lib = cdll.LoadLibrary(here('_pystl.so'))
+
+
+#: Status codes returned by the checked `vector_*` functions
+OUT_OF_RANGE, EMPTY, ZERO_DIVISION, NEGATIVE_SHIFT, UNSUPPORTED, NO_MEMORY = \
+    -1, -2, -3, -4, -5, -6
+
+#: Elementwise operations of `vector_operate`
+ADD, SUB, MUL, FLOORDIV, MOD, AND, OR, XOR, LSHIFT, RSHIFT = range(10)
+
+#: Operands of `vector_operate`, which can be vectors or scalars
+BOTH_VECTORS, RIGHT_SCALAR, LEFT_SCALAR = range(3)
+
+#: Elementwise comparisons of `vector_compare`
+EQ, NE, LT, LE, GT, GE = range(6)
+
+#: Operations over sorted vectors of `vector_set_operation`
+UNION, INTERSECTION, DIFFERENCE, SYMMETRIC_DIFFERENCE, MERGE = range(5)
+
+#: Algorithms of `vector_sort`
+AUTO, INTROSORT, RADIX, COUNTING = range(4)
+
+#: Instructions of `vector_evaluate` programs besides the operations
+PUSH_VECTOR, PUSH_SCALAR = -1, -2
+
+
+def _check_index(status, function, args):
+    """ctypes `errcheck` raising `IndexError` for failed checked accessors"""
+    if status == EMPTY:
+        raise IndexError(u'pop from empty vector')
+    if status == OUT_OF_RANGE:
+        raise IndexError(u'Vector index {} out of range'.format(args[1]))
+    return args
+
+
+def _check_empty(status, function, args):
+    """ctypes `errcheck` raising `ValueError` for reductions of empty vectors"""
+    if status == EMPTY:
+        raise ValueError(u'empty vector has nothing to reduce')
+    return args
+
+
+def _call(function, *args):
+    """Call a ctypes function, raising `TypeError` instead of
+    `ctypes.ArgumentError` for arguments of the wrong type, like the
+    functions of CPython extension modules"""
+    try:
+        return function(*args)
+    except ArgumentError as error:
+        raise TypeError(*error.args)
+
+
+#: Range of the indexes of the checked accessors, which take a `ssize_t`
+SSIZE_MIN, SSIZE_MAX = -2 ** (8 * sizeof(c_ssize_t) - 1), 2 ** (8 * sizeof(c_ssize_t) - 1) - 1
+
+
+def _checked_call(function, vector, index, *args):
+    """Call a checked accessor through ctypes, raising `IndexError` for
+    indexes which do not fit in a `ssize_t` instead of truncating them, as
+    CPython extension modules do"""
+    index = operator.index(index)
+    if not SSIZE_MIN <= index <= SSIZE_MAX:
+        raise IndexError(u"cannot fit '{}' into an index-sized integer"
+                         .format(type(index).__name__))
+    return _call(function, vector, index, *args)
+
+
+def _checked_function(name, argtypes, errcheck=_check_index):
+    """Declare a checked C function, which returns a status code.
+
+    Pointer arguments are output parameters, so the resulting function
+    takes only the input ones, returns the output values and raises
+    through `errcheck` on failure, by default `IndexError` if the index was
+    out of range.
+    """
+    prototype = CFUNCTYPE(c_int, *argtypes)
+    paramflags = tuple((2 if issubclass(argtype, _Pointer) else 1,)
+                       for argtype in argtypes)
+    function = prototype((name, lib), paramflags)
+    function.errcheck = errcheck
+    return function
+
+
+#: Functions wrapped by every vector type as `(name, restype, argtypes)`,
+#: bound to `py_vector_<type>_<name>` and set as `vector_<name>`.
+#: `T` stands for the value type and `T_POINTER` for a pointer to it.
+T, T_POINTER = object(), object()
+
+FUNCTIONS = (
+    ('new', c_void_p, []),
+    ('delete', None, [c_void_p]),
+    ('size', c_size_t, [c_void_p]),
+    ('capacity', c_size_t, [c_void_p]),
+    ('reserve', c_int, [c_void_p, c_size_t]),
+    ('shrink_to_fit', None, [c_void_p]),
+    ('resize', c_int, [c_void_p, c_size_t, T]),
+    ('at', T, [c_void_p, c_size_t]),
+    ('set', None, [c_void_p, c_size_t, T]),
+    ('push_back', None, [c_void_p, T]),
+    ('adopt', c_int, [c_void_p, c_void_p, c_size_t, c_size_t]),
+    ('release', None, [c_void_p]),
+    ('data', c_void_p, [c_void_p]),
+    ('operate', c_int, [c_int, c_int, c_void_p, c_void_p, c_void_p, c_size_t]),
+    ('compare', None, [c_int, c_int, c_void_p, c_void_p, c_void_p, c_size_t]),
+    ('filter', c_void_p, [c_void_p, c_void_p]),
+    ('take', c_int, [c_void_p, c_void_p, c_size_t, c_void_p]),
+    ('put', c_int, [c_void_p, c_void_p, c_size_t, c_void_p, c_size_t]),
+    ('evaluate', c_int, [c_void_p, c_size_t, c_void_p, c_void_p, c_size_t, c_size_t,
+                          c_void_p]),
+    ('extend', None, [c_void_p, c_void_p, c_size_t]),
+    ('replace', None, [c_void_p, c_size_t, c_size_t, c_void_p, c_size_t]),
+    ('assign_strided', None, [c_void_p, c_size_t, c_ssize_t, c_void_p, c_size_t]),
+    ('copy_range', None, [c_void_p, c_ssize_t, c_ssize_t, c_ssize_t, c_void_p]),
+    ('slice', c_void_p, [c_void_p, c_ssize_t, c_ssize_t, c_ssize_t]),
+    ('insert', None, [c_void_p, c_size_t, T]),
+    ('erase', None, [c_void_p, c_size_t]),
+    ('erase_slice', None, [c_void_p, c_size_t, c_size_t]),
+    ('find', c_ssize_t, [c_void_p, T]),
+    ('pop_back', T, [c_void_p]),
+    ('count', c_size_t, [c_void_p, T]),
+    ('is_sorted', c_int, [c_void_p]),
+    ('lower_bound', c_size_t, [c_void_p, c_size_t, c_size_t, T]),
+    ('upper_bound', c_size_t, [c_void_p, c_size_t, c_size_t, T]),
+    ('searchsorted', None, [c_void_p, c_void_p, c_size_t, c_int, c_void_p]),
+    ('sorted_find', c_ssize_t, [c_void_p, T]),
+    ('sorted_count', c_size_t, [c_void_p, T]),
+    ('set_operation', None, [c_int, c_void_p, c_size_t, c_void_p, c_size_t, c_void_p]),
+    ('includes', c_int, [c_void_p, c_size_t, c_void_p, c_size_t]),
+    ('merge_many', None, [c_void_p, c_void_p, c_size_t, c_void_p]),
+    ('unique', c_void_p, [c_void_p, c_int]),
+    ('value_counts', None, [c_void_p, c_void_p, c_void_p]),
+    ('bincount', c_int, [c_void_p, c_size_t, c_void_p]),
+    ('histogram', None, [c_void_p, c_void_p, c_size_t, c_int, c_void_p]),
+    ('sort', c_int, [c_void_p, c_int, c_int, c_int]),
+    ('partial_sort', None, [c_void_p, c_size_t]),
+    ('nth_element', None, [c_void_p, c_size_t]),
+    ('argsort', None, [c_void_p, c_int, c_int, c_void_p]),
+    ('topk', None, [c_void_p, c_size_t, c_int, c_void_p, c_void_p]),
+    ('reverse', None, [c_void_p]),
+    ('equal', c_int, [c_void_p, c_void_p]),
+)
+
+#: Checked accessors wrapped by every vector type as `(name, argtypes)`.
+#: See :func:`_checked_function`.
+CHECKED_FUNCTIONS = (
+    ('checked_at', [c_void_p, c_ssize_t, T_POINTER]),
+    ('checked_set', [c_void_p, c_ssize_t, T]),
+    ('checked_insert', [c_void_p, c_ssize_t, T]),
+    ('checked_erase', [c_void_p, c_ssize_t]),
+    ('checked_pop', [c_void_p, c_ssize_t, T_POINTER]),
+)
+
+#: Reductions wrapped by every vector type as `(name, argtypes)`, checked
+#: like :data:`CHECKED_FUNCTIONS` but raising `ValueError` if empty.
+REDUCTIONS = (
+    ('sum', [c_void_p, c_int, POINTER(c_int64), POINTER(c_uint64), POINTER(c_double)]),
+    ('min', [c_void_p, T_POINTER]),
+    ('max', [c_void_p, T_POINTER]),
+    ('minmax', [c_void_p, T_POINTER, T_POINTER]),
+    ('argmin', [c_void_p, POINTER(c_size_t)]),
+    ('argmax', [c_void_p, POINTER(c_size_t)]),
+)
+
+
+class CtypesBackend(object):
+    """Call the C interface through ctypes"""
+
+    name = 'ctypes'
+
+    def bind(self, suffix, value_type):
+        """Get the `vector_*` functions for a type as a `dict`.
+
+        :param suffix: Name of the type in the C interface.
+        :param value_type: ctypes type of the elements.
+        """
+        def resolve(argtype):
+            if argtype is T:
+                return value_type
+            if argtype is T_POINTER:
+                return POINTER(value_type)
+            return argtype
+
+        # partials, unlike functions, are not bound as methods of the vectors
+        functions = {}
+
+        for function, restype, argtypes in FUNCTIONS:
+            c_function = getattr(lib, 'py_vector_{}_{}'.format(suffix, function))
+            c_function.restype = resolve(restype)
+            c_function.argtypes = [resolve(argtype) for argtype in argtypes]
+            functions['vector_' + function] = partial(_call, c_function)
+
+        for function, argtypes in CHECKED_FUNCTIONS:
+            functions['vector_' + function] = partial(_checked_call, _checked_function(
+                'py_vector_{}_{}'.format(suffix, function),
+                [resolve(argtype) for argtype in argtypes]))
+
+        for function, argtypes in REDUCTIONS:
+            functions['vector_' + function] = partial(_call, _checked_function(
+                'py_vector_{}_{}'.format(suffix, function),
+                [resolve(argtype) for argtype in argtypes], _check_empty))
+
+        return functions
+
+
+class SpeedupsBackend(CtypesBackend):
+    """Call the per element functions through `pystl._speedups`.
+
+    The extension module exports them as `<type>_<name>`, and anything it
+    does not export is bound through ctypes.
+    """
+
+    name = 'speedups'
+
+    def __init__(self):
+        from . import _speedups
+        self.module = _speedups
+
+    def bind(self, suffix, value_type):
+        functions = super(SpeedupsBackend, self).bind(suffix, value_type)
+
+        for name in list(functions):
+            function = name[len('vector_'):]
+            speedup = getattr(self.module, '{}_{}'.format(suffix, function), None)
+            if speedup is not None:
+                functions[name] = speedup
+
+        return functions
+
+
+#: Available backends by name, fastest first
+BACKENDS = (('speedups', SpeedupsBackend), ('ctypes', CtypesBackend))
+
+
+def load_backend(name=None):
+    """Instantiate a backend.
+
+    :param name: Name of the backend in :data:`BACKENDS`. Defaults to the
+     `PYSTL_BACKEND` environment variable, or else to the fastest one which
+     can be loaded.
+    """
+    name = name or os.environ.get('PYSTL_BACKEND')
+    backends = dict(BACKENDS)
+
+    if name is not None:
+        if name not in backends:
+            raise ValueError(u'unknown pystl backend {!r}'.format(name))
+        return backends[name]()
+
+    for name, backend in BACKENDS:
+        try:
+            return backend()
+        except ImportError:
+            continue
+
+
+#: Backend used by the vector types by default
+backend = load_backend()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+engine
+~~~~~~
+
+Settings of the multi-threaded execution of the vector algorithms.
+
+Sorting, reductions, :meth:`Vector.count` and :meth:`Vector.index` or `in`
+split vectors of at least :func:`get_threshold` elements into chunks, which
+are processed in parallel by a pool of :func:`get_threads` threads and then
+combined. Smaller vectors are processed serially, as the threads would cost
+more than they save.
+
+The pool is shared by all the vector types and runs one algorithm at a time,
+so the ones called meanwhile from other Python threads run serially. The GIL
+is released during the C calls, so other Python threads keep running anyway.
+
+Results are the same than the serial ones, except for the rounding of
+floating point sums, which depends on how the values are grouped.
+
+.. code::
+    >> engine.set_threads(8)
+    >> vector.sort()  # 8 threads for vectors of 65536 elements or more
+
+The number of threads can be set by the `PYSTL_THREADS` environment variable
+as well, and defaults to one per CPU.
+"""
+import os
+from contextlib import contextmanager
+from ctypes import c_size_t
+
+from .backend import lib
+
+
+lib.py_vector_parallel_get_threads.restype = c_size_t
+lib.py_vector_parallel_get_threads.argtypes = []
+lib.py_vector_parallel_get_threads_setting.restype = c_size_t
+lib.py_vector_parallel_get_threads_setting.argtypes = []
+lib.py_vector_parallel_set_threads.restype = None
+lib.py_vector_parallel_set_threads.argtypes = [c_size_t]
+lib.py_vector_parallel_get_threshold.restype = c_size_t
+lib.py_vector_parallel_get_threshold.argtypes = []
+lib.py_vector_parallel_set_threshold.restype = None
+lib.py_vector_parallel_set_threshold.argtypes = [c_size_t]
+
+
+def get_threads():
+    """Number of threads running the parallel algorithms"""
+    return int(lib.py_vector_parallel_get_threads())
+
+
+def set_threads(threads=None):
+    """Set the number of threads running the parallel algorithms.
+
+    :param threads: Number of threads, the calling one included, so `1`
+     disables parallel execution. `None` means one per CPU.
+    """
+    if threads is not None and threads < 1:
+        raise ValueError(u'threads must be positive')
+    lib.py_vector_parallel_set_threads(threads or 0)
+
+
+def get_threshold():
+    """Minimum number of elements for which algorithms run in parallel"""
+    return int(lib.py_vector_parallel_get_threshold())
+
+
+def set_threshold(size):
+    """Set the minimum number of elements to run algorithms in parallel"""
+    if size < 0:
+        raise ValueError(u'threshold must be non negative')
+    lib.py_vector_parallel_set_threshold(size)
+
+
+@contextmanager
+def settings(threads=None, threshold=None):
+    """Change the settings given within a `with` block.
+
+    They are global, so they apply to all the threads meanwhile.
+    """
+    previous_threads = lib.py_vector_parallel_get_threads_setting()  # 0 is one per CPU
+    previous_threshold = get_threshold()
+    try:
+        if threads is not None:
+            set_threads(threads)
+        if threshold is not None:
+            set_threshold(threshold)
+        yield
+    finally:
+        lib.py_vector_parallel_set_threads(previous_threads)
+        set_threshold(previous_threshold)
+
+
+if os.environ.get('PYSTL_THREADS'):
+    set_threads(int(os.environ['PYSTL_THREADS']))
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+expression
+~~~~~~~~~~
+
+Lazy elementwise arithmetic over vectors.
+
+The arithmetic operators of vectors compute their result right away, so
+chaining them allocates and fills a whole temporary vector per operator.
+Operating on :meth:`Vector.lazy` instead builds an :class:`Expression`, which
+is only computed when it is evaluated into a vector, reduced or iterated.
+
+.. code::
+    >> expression = (a.lazy() * 3 + b) % m
+    >> expression.evaluate()  # a single pass over a and b
+    [1, 0, 4]
+    >> expression.sum()
+
+Expressions are compiled into a postfix program, which is run in C by blocks
+of elements small enough for the intermediate results to stay in cache, so
+the memory used is proportional to the inputs and not to the number of
+operators. Reductions evaluate :attr:`Expression.block_size` elements at a
+time and reduce them before going on, so they do not hold the whole result
+either.
+
+Vectors must not change their size between building an expression and
+evaluating it.
+"""
+from ctypes import c_int, c_void_p
+
+from .backend import (ADD, SUB, MUL, FLOORDIV, MOD, AND, OR, XOR, LSHIFT,
+                      RSHIFT, PUSH_VECTOR, PUSH_SCALAR)
+from .vector import (Vector, VectorIterator, BITWISE_OPERATIONS, FLOATING_TYPES,
+                     _check_operation)
+
+
+def _operator(operation, reflected=False):
+    """Define an arithmetic operator method building an :class:`Operation`"""
+    def operator(self, other):
+        return Operation.build(operation, other, self) if reflected else \
+            Operation.build(operation, self, other)
+    return operator
+
+
+class Expression(object):
+    """Elementwise arithmetic expression over vectors of the same type"""
+
+    #: :class:`Vector` subclass of the vectors in the expression
+    vector_type = None
+
+    #: Number of elements of the vectors in the expression
+    size = 0
+
+    #: Number of elements evaluated at a time by the reductions
+    block_size = 1 << 16
+
+    __add__, __radd__ = _operator(ADD), _operator(ADD, reflected=True)
+    __sub__, __rsub__ = _operator(SUB), _operator(SUB, reflected=True)
+    __mul__, __rmul__ = _operator(MUL), _operator(MUL, reflected=True)
+    __floordiv__, __rfloordiv__ = (_operator(FLOORDIV),
+                                   _operator(FLOORDIV, reflected=True))
+    __mod__, __rmod__ = _operator(MOD), _operator(MOD, reflected=True)
+    __and__, __rand__ = _operator(AND), _operator(AND, reflected=True)
+    __or__, __ror__ = _operator(OR), _operator(OR, reflected=True)
+    __xor__, __rxor__ = _operator(XOR), _operator(XOR, reflected=True)
+    __lshift__, __rlshift__ = _operator(LSHIFT), _operator(LSHIFT, reflected=True)
+    __rshift__, __rrshift__ = _operator(RSHIFT), _operator(RSHIFT, reflected=True)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        """Evaluate the expression by chunks, without a whole vector"""
+        value_type, chunk_size = self.vector_type.value_type, VectorIterator.chunk_size
+        for offset in range(0, self.size, chunk_size):
+            values = (value_type * min(chunk_size, self.size - offset))()
+            self._evaluate(offset, len(values), values)
+            for value in values:
+                yield value
+
+    def __repr__(self):
+        return u'{}.lazy({})'.format(self.vector_type.__name__, self._format())
+
+    def evaluate(self, out=None):
+        """Compute the expression with a single C call.
+
+        :param out: Vector of the same type to write the result into, which
+         can be one of the vectors in the expression, instead of a new one.
+        :returns: `out` or the new vector.
+        """
+        if out is None:
+            out = self.vector_type()
+        elif not isinstance(out, self.vector_type):
+            raise TypeError(u'out must be a {}'.format(self.vector_type.__name__))
+
+        out.resize(self.size)
+        out.sorted = False
+        if self.size:
+            self._evaluate(0, self.size, out.vector_data(out.vector))
+        return out
+
+    def sum(self, wide=False):
+        """See :meth:`Vector.sum`, which is called on every block of results"""
+        value_type = self.vector_type.value_type
+        if value_type._type_ in FLOATING_TYPES:
+            return sum((block.sum(wide) for _, block in self._blocks()), 0.0)
+        total = sum(block.sum(wide=True) for _, block in self._blocks())
+        return total if wide else value_type(total).value  # wraps around like C
+
+    def mean(self):
+        if not self.size:
+            raise ValueError(u'mean of empty vector')
+        return self.sum(wide=True) / float(self.size)
+
+    def min(self):
+        self._check_empty()
+        return min(block.min() for _, block in self._blocks())
+
+    def max(self):
+        self._check_empty()
+        return max(block.max() for _, block in self._blocks())
+
+    def minmax(self):
+        self._check_empty()
+        blocks = [block.minmax() for _, block in self._blocks()]
+        return min(lowest for lowest, _ in blocks), max(highest for _, highest in blocks)
+
+    def argmin(self):
+        self._check_empty()
+        return min((block[index], offset + index) for offset, block in self._blocks()
+                   for index in [block.argmin()])[1]
+
+    def argmax(self):
+        self._check_empty()
+        return -max((block[index], -(offset + index)) for offset, block in self._blocks()
+                    for index in [block.argmax()])[1]  # the first one on ties
+
+    def _blocks(self):
+        """Evaluate the expression :attr:`block_size` elements at a time into
+        the same vector, generating it along with the offset of the block"""
+        block = self.vector_type()
+        for offset in range(0, self.size, self.block_size):
+            size = min(self.block_size, self.size - offset)
+            block.resize(size)
+            self._evaluate(offset, size, block.vector_data(block.vector))
+            yield offset, block
+
+    def _check_empty(self):
+        if not self.size:
+            raise ValueError(u'empty vector has nothing to reduce')
+
+    def _evaluate(self, offset, size, out):
+        """Run the program of the expression for `size` elements into `out`"""
+        program, vectors, scalars = [], [], []
+        self._compile(program, vectors, scalars)
+
+        for vector in vectors:
+            if len(vector) != self.size:
+                raise ValueError(u'vector changed size since the expression '
+                                 u'was built')
+
+        value_type = self.vector_type.value_type
+        status = self.vector_type.vector_evaluate(
+            (c_int * len(program))(*program), len(program),
+            (c_void_p * len(vectors))(*[v.vector_data(v.vector) for v in vectors]),
+            (value_type * len(scalars))(*scalars), offset, size, out)
+        _check_operation(status)
+
+
+class Operand(Expression):
+    """A vector within an expression"""
+
+    def __init__(self, vector):
+        self.vector = vector
+        self.vector_type = type(vector)
+        self.size = len(vector)
+
+    def _compile(self, program, vectors, scalars):
+        """Append the postfix instructions of the expression to `program`"""
+        for index, vector in enumerate(vectors):
+            if vector is self.vector:
+                break
+        else:
+            index = len(vectors)
+            vectors.append(self.vector)
+        program.extend((PUSH_VECTOR, index))
+
+    def _format(self):
+        return repr(self.vector)
+
+
+class Operation(Expression):
+    """An arithmetic operation between expressions or scalars"""
+
+    #: Python symbols of the operations
+    symbols = {ADD: u'+', SUB: u'-', MUL: u'*', FLOORDIV: u'//', MOD: u'%',
+               AND: u'&', OR: u'|', XOR: u'^', LSHIFT: u'<<', RSHIFT: u'>>'}
+
+    def __init__(self, operation, left, right, vector_type, size):
+        self.operation = operation
+        self.left, self.right = left, right
+        self.vector_type, self.size = vector_type, size
+
+    @classmethod
+    def build(cls, operation, left, right):
+        """Combine two operands, any of them an expression, into an operation.
+
+        Vectors are taken as operands and scalars are converted to the type
+        of the vectors. Returns `NotImplemented` for unsupported operands.
+        """
+        left, right = cls._operand(left), cls._operand(right)
+        expression = left if isinstance(left, Expression) else right
+        vector_type = expression.vector_type
+
+        for operand in (left, right):
+            if isinstance(operand, Expression):
+                if operand.vector_type is not vector_type:
+                    return NotImplemented
+                if operand.size != expression.size:
+                    raise ValueError(u'operands could not be broadcast together '
+                                     u'with sizes {} and {}'.format(
+                                         expression.size, operand.size))
+
+        if operation in BITWISE_OPERATIONS and \
+                vector_type.value_type._type_ in FLOATING_TYPES:
+            return NotImplemented
+
+        try:
+            left, right = [operand if isinstance(operand, Expression)
+                           else vector_type.value_type(operand).value
+                           for operand in (left, right)]
+        except TypeError:
+            return NotImplemented
+
+        return cls(operation, left, right, vector_type, expression.size)
+
+    @staticmethod
+    def _operand(operand):
+        return Operand(operand) if isinstance(operand, Vector) else operand
+
+    def _compile(self, program, vectors, scalars):
+        for operand in (self.left, self.right):
+            if isinstance(operand, Expression):
+                operand._compile(program, vectors, scalars)
+            else:
+                program.extend((PUSH_SCALAR, len(scalars)))
+                scalars.append(operand)
+        program.append(self.operation)
+
+    def _format(self):
+        left, right = [
+            operand._format() if isinstance(operand, Expression) else repr(operand)
+            for operand in (self.left, self.right)]
+        return u'({} {} {})'.format(left, self.symbols[self.operation], right)
@@ -0,0 +1,254 @@
+#ifndef __PY_VECTOR_PARALLEL__
+#define __PY_VECTOR_PARALLEL__
+
+#include <algorithm>
+#include <atomic>
+#include <condition_variable>
+#include <exception>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <thread>
+#include <vector>
+#include <unistd.h>
+
+using namespace std;
+
+
+// Pool of worker threads running the chunks of one task at a time, along
+// with the thread which submits it.
+class py_vector_thread_pool {
+public:
+    typedef function<void(size_t)> task_type;
+
+    py_vector_thread_pool(size_t threads) : pid(getpid()), busy(false), task(NULL),
+            count(0), next(0), pending(0), generation(0), stopping(false) {
+        for( size_t index = 1; index < threads; ++index )
+            workers.push_back(thread(&py_vector_thread_pool::work, this));
+    }
+
+    ~py_vector_thread_pool() {
+        {
+            lock_guard<mutex> lock(state);
+            stopping = true;
+        }
+        wake.notify_all();
+        for( size_t index = 0; index < workers.size(); ++index )
+            workers[index].join();
+    }
+
+    size_t size() const {
+        return workers.size() + 1;
+    }
+
+    // The workers are not copied along the process by `fork`
+    bool forked() const {
+        return getpid() != pid;
+    }
+
+    // Call `task(chunk)` for every chunk in [0, chunks) and wait for them.
+    // Returns false without calling it if the pool is busy with another one.
+    bool run(size_t chunks, const task_type & task) {
+        bool idle = false;
+        if( !busy.compare_exchange_strong(idle, true) )
+            return false;
+
+        size_t job;
+        {
+            lock_guard<mutex> lock(state);
+            this->task = &task;
+            count = pending = chunks;
+            next = 0;
+            error = exception_ptr();
+            job = ++generation;
+        }
+        wake.notify_all();
+        execute(job);
+
+        unique_lock<mutex> lock(state);
+        while( pending )
+            finished.wait(lock);
+        this->task = NULL;
+        busy = false;
+        if( error )
+            rethrow_exception(error);
+        return true;
+    }
+
+private:
+    void work() {
+        size_t job = 0;
+        for( ;; ) {
+            {
+                unique_lock<mutex> lock(state);
+                while( !stopping && generation == job )
+                    wake.wait(lock);
+                if( stopping )
+                    return;
+                job = generation;
+            }
+            execute(job);
+        }
+    }
+
+    // Claim and run chunks of `job` until there are none left
+    void execute(size_t job) {
+        for( ;; ) {
+            const task_type * current;
+            size_t chunk;
+            {
+                lock_guard<mutex> lock(state);
+                if( generation != job || next >= count )
+                    return;
+                chunk = next++;
+                current = task;
+            }
+
+            try {
+                (*current)(chunk);
+            } catch( ... ) {
+                lock_guard<mutex> lock(state);
+                if( !error )
+                    error = current_exception();
+            }
+
+            lock_guard<mutex> lock(state);
+            if( --pending == 0 )
+                finished.notify_all();
+        }
+    }
+
+    pid_t pid;
+    vector<thread> workers;
+    atomic<bool> busy;
+    mutex state;
+    condition_variable wake, finished;
+    const task_type * task;
+    size_t count, next, pending, generation;
+    bool stopping;
+    exception_ptr error;
+};
+
+
+// Settings of the parallel algorithms, shared by all the vector types. They
+// are atomic as they are set from Python while the pool threads read them.
+struct py_vector_parallel_settings {
+    atomic<size_t> threads;    // 0 means one per hardware thread
+    atomic<size_t> threshold;  // minimum number of elements to go parallel
+    shared_ptr<py_vector_thread_pool> pool;
+    mutex lock;
+
+    py_vector_parallel_settings() : threads(0), threshold(1 << 16) {}
+};
+
+inline py_vector_parallel_settings & py_vector_parallel() {
+    static py_vector_parallel_settings settings;
+    return settings;
+}
+
+inline size_t py_vector_get_threads() {
+    size_t threads = py_vector_parallel().threads;
+    return threads ? threads : max(thread::hardware_concurrency(), 1u);
+}
+
+// Number of chunks to split `size` elements into, one if it is not worth it
+inline size_t py_vector_chunks(size_t size) {
+    if( size < 2 || size < py_vector_parallel().threshold )
+        return 1;
+    return min(py_vector_get_threads(), size);
+}
+
+// Start of `chunk` out of `chunks` over `size` elements
+inline size_t py_vector_chunk_begin(size_t chunk, size_t chunks, size_t size) {
+    return size / chunks * chunk + min(chunk, size % chunks);
+}
+
+inline shared_ptr<py_vector_thread_pool> py_vector_get_pool() {
+    py_vector_parallel_settings & settings = py_vector_parallel();
+    lock_guard<mutex> lock(settings.lock);
+    size_t threads = py_vector_get_threads();
+
+    if( settings.pool && settings.pool->forked() )
+        // its threads are gone, so it cannot be joined: leak it
+        new shared_ptr<py_vector_thread_pool>(settings.pool);
+    if( !settings.pool || settings.pool->forked() || settings.pool->size() != threads )
+        settings.pool = make_shared<py_vector_thread_pool>(threads);
+    return settings.pool;
+}
+
+// Call `task(chunk)` for every chunk in [0, chunks), in parallel when there
+// are many. It falls back to calling them in turn from this thread when the
+// pool is busy, such as with nested calls or calls from several threads.
+inline void py_vector_parallel_run(size_t chunks, const function<void(size_t)> & task) {
+    if( chunks > 1 && py_vector_get_pool()->run(chunks, task) )
+        return;
+    for( size_t chunk = 0; chunk < chunks; ++chunk )
+        task(chunk);
+}
+
+// Call `task(begin, end)` over consecutive ranges covering [0, size)
+template <typename Task>
+void py_vector_parallel_for(size_t size, Task task) {
+    size_t chunks = py_vector_chunks(size);
+    py_vector_parallel_run(chunks, [&](size_t chunk) {
+        task(py_vector_chunk_begin(chunk, chunks, size),
+             py_vector_chunk_begin(chunk + 1, chunks, size));
+    });
+}
+
+// Reduce consecutive ranges covering [0, size) with `reduce(begin, end)`
+// and then their results, in order, with `combine(result, chunk_result)`.
+template <typename R, typename Reduce, typename Combine>
+R py_vector_parallel_reduce(size_t size, Reduce reduce, Combine combine) {
+    size_t chunks = py_vector_chunks(size);
+    if( chunks == 1 )
+        return reduce(0, size);
+
+    vector<R> results(chunks);
+    py_vector_parallel_run(chunks, [&](size_t chunk) {
+        results[chunk] = reduce(py_vector_chunk_begin(chunk, chunks, size),
+                                py_vector_chunk_begin(chunk + 1, chunks, size));
+    });
+
+    R result = results[0];
+    for( size_t chunk = 1; chunk < chunks; ++chunk )
+        result = combine(result, results[chunk]);
+    return result;
+}
+
+// Merge `runs` consecutive sorted runs, the one at `run` starting at
+// `first + bound(run)` and the last one ending at `first + bound(runs)`, by
+// pairs in rounds, whose merges run in parallel if `parallel`.
+template <typename T, typename Bound, typename Compare>
+void py_vector_merge_runs(T * first, size_t runs, Bound bound, Compare compare, bool parallel) {
+    for( size_t width = 1; width < runs; width *= 2 ) {
+        size_t pairs = (runs + 2 * width - 1) / (2 * width);
+        auto merge = [&](size_t pair) {
+            size_t begin = 2 * width * pair;
+            size_t middle = min(begin + width, runs), end = min(begin + 2 * width, runs);
+            inplace_merge(first + bound(begin), first + bound(middle), first + bound(end), compare);
+        };
+
+        if( parallel ) {
+            py_vector_parallel_run(pairs, merge);
+        } else {
+            for( size_t pair = 0; pair < pairs; ++pair )
+                merge(pair);
+        }
+    }
+}
+
+// Stable sort of [first, first + size), sorting chunks in parallel and
+// then merging them by pairs in parallel rounds.
+template <typename T, typename Compare>
+void py_vector_parallel_sort(T * first, size_t size, Compare compare) {
+    size_t chunks = py_vector_chunks(size);
+    auto bound = [&](size_t chunk) { return py_vector_chunk_begin(chunk, chunks, size); };
+
+    py_vector_parallel_run(chunks, [&](size_t chunk) {
+        stable_sort(first + bound(chunk), first + bound(chunk + 1), compare);
+    });
+    py_vector_merge_runs(first, chunks, bound, compare, true);
+}
+
+#endif
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+processes
+~~~~~~~~~
+
+Python functions over vectors in parallel, in a pool of processes.
+
+The vector is split into contiguous chunks, and the function gets each one
+as a vector of the same type in one of the processes. Chunks are sent as
+the raw bytes of their elements. Vectors on shared memory, see
+:meth:`Vector.shared`, are not sent at all: every process maps its chunk
+in place, so changes made by the function go to the shared vector.
+
+.. code::
+    >> scores = processes.transform_chunks(score, ids, VectorDouble)
+    >> total = processes.reduce_chunks(sum, ids, operator.add)
+
+Functions, and their results, must be picklable, so they have to be defined
+at the top level of a module. Results which are vectors are sent back as
+raw bytes too.
+
+The pool is a :class:`concurrent.futures.ProcessPoolExecutor`, or a
+:class:`multiprocessing.Pool` in python 2 without the `futures` backport.
+Any other one with a `map` method can be given as `executor` instead, which
+saves starting a new pool on every call.
+"""
+import functools
+import multiprocessing
+from contextlib import contextmanager
+from ctypes import sizeof, string_at
+
+try:
+    from concurrent.futures import ProcessPoolExecutor
+except ImportError:  # python 2 without the futures backport
+    ProcessPoolExecutor = None
+
+from .storage import SharedMemory, Slice
+from .vector import _rebuild
+
+#: Default of arguments for which `None` is a valid value
+_MISSING = object()
+
+
+def map_chunks(function, vector, processes=None, chunks=None, executor=None):
+    """Call `function` on every chunk of `vector` in a pool of processes.
+
+    :param processes: Number of processes of the new pool, one per CPU by
+     default.
+    :param chunks: Number of chunks, one per process by default.
+    :param executor: Pool to run them in instead of a new one.
+    :returns: The list of results, in the order of the chunks.
+    """
+    processes = processes or multiprocessing.cpu_count()
+    tasks = list(_tasks(function, vector, chunks or processes))
+    if executor is not None:
+        return list(executor.map(_run, tasks))
+    with _executor(processes) as pool:
+        return list(pool.map(_run, tasks))
+
+
+def transform_chunks(function, vector, vector_type=None, **kwargs):
+    """Join the vectors or iterables which `function` returns for every
+    chunk of `vector` into a new vector of `vector_type`, by default the type
+    of `vector`. See :func:`map_chunks`."""
+    result = (vector_type or type(vector))()
+    for values in map_chunks(function, vector, **kwargs):
+        result.extend(values)
+    return result
+
+
+def reduce_chunks(function, vector, combine, initial=_MISSING, **kwargs):
+    """Combine the results of `function` for every chunk of `vector`, in
+    order, with `combine(result, chunk_result)`, starting from `initial` if
+    given, as :func:`functools.reduce` does. See :func:`map_chunks`."""
+    results = map_chunks(function, vector, **kwargs)
+    if initial is _MISSING:
+        return functools.reduce(combine, results)
+    return functools.reduce(combine, results, initial)
+
+
+def _tasks(function, vector, chunks):
+    """Arguments of :func:`_run` for every chunk, as in C++ ones"""
+    size, itemsize = len(vector), sizeof(vector.value_type)
+    chunks = min(chunks, size)
+    shared = isinstance(vector.storage, SharedMemory) and vector.storage.attached(vector)
+
+    for chunk in range(chunks):
+        start = size // chunks * chunk + min(chunk, size % chunks)
+        stop = size // chunks * (chunk + 1) + min(chunk + 1, size % chunks)
+        if shared:
+            yield function, type(vector), None, vector.storage.name, start, stop
+        else:
+            address = vector.vector_data(vector.vector) + start * itemsize
+            data = string_at(address, (stop - start) * itemsize)
+            yield function, type(vector), data, None, start, stop
+
+
+def _run(task):
+    """Call the function of `task` on its chunk, in a process of the pool"""
+    function, vector_type, data, name, start, stop = task
+    if name is None:
+        return function(_rebuild(vector_type, data))
+
+    memory, chunk = SharedMemory(name), vector_type()
+    try:
+        Slice(memory, start, stop, sizeof(vector_type.value_type)).attach(chunk, stop - start)
+        result = function(chunk)
+        return vector_type(chunk) if result is chunk else result  # it is closed below
+    finally:
+        if chunk.storage is not None:
+            chunk.close()
+        memory.map.close()
+        memory.file.close()
+
+
+@contextmanager
+def _executor(processes):
+    if ProcessPoolExecutor is not None:
+        executor = ProcessPoolExecutor(processes)
+        try:
+            yield executor
+        finally:
+            executor.shutdown()
+    else:
+        pool = multiprocessing.Pool(processes)
+        try:
+            yield pool
+        finally:
+            pool.close()
+            pool.join()
@@ -0,0 +1,410 @@
+// CPython extension calling the per element vector functions without the
+// ctypes argument conversion. See `pystl.backend.SpeedupsBackend`.
+//
+// Every function takes the `vector<T> *` as a python integer, and follows
+// the same conventions than the ctypes bindings: values wrap around the
+// element type and checked functions raise `IndexError` on failure.
+
+#include <Python.h>
+#include <stdint.h>
+#include <limits>
+#include <stdexcept>
+
+#include "vector_base.h"
+
+#if PY_MAJOR_VERSION >= 3
+#define PyInt_FromLong PyLong_FromLong
+#define PyInt_FromSize_t PyLong_FromSize_t
+#define PyInt_FromSsize_t PyLong_FromSsize_t
+#endif
+
+
+template <typename T>
+static bool py_speedups_vector(PyObject * object, vector<T> * & pvector) {
+    pvector = (vector<T> *) PyLong_AsVoidPtr(object);
+    if( pvector == NULL ) {
+        if( !PyErr_Occurred() )
+            PyErr_SetString(PyExc_ValueError, "NULL vector pointer");
+        return false;
+    }
+    return true;
+}
+
+template <typename T>
+static bool py_speedups_value(PyObject * object, T & value) {
+    if( !numeric_limits<T>::is_integer ) {
+        double number = PyFloat_AsDouble(object);
+        if( number == -1.0 && PyErr_Occurred() )
+            return false;
+        value = (T) number;
+        return true;
+    }
+
+    if( PyFloat_Check(object) ) {
+        PyErr_SetString(PyExc_TypeError, "integer expected");
+        return false;
+    }
+
+    PyObject * integer = PyNumber_Index(object);
+    if( integer == NULL )
+        return false;
+
+    unsigned long long bits;
+#if PY_MAJOR_VERSION < 3
+    if( PyInt_Check(integer) )
+        bits = (unsigned long long) PyInt_AS_LONG(integer);
+    else
+#endif
+    bits = PyLong_AsUnsignedLongLongMask(integer);
+    Py_DECREF(integer);
+
+    if( bits == (unsigned long long) -1 && PyErr_Occurred() )
+        return false;
+
+    value = (T) bits;  // wraps around, like ctypes does
+    return true;
+}
+
+template <typename T>
+static PyObject * py_speedups_object(T value) {
+    if( !numeric_limits<T>::is_integer )
+        return PyFloat_FromDouble(value);
+
+    if( numeric_limits<T>::is_signed ) {
+        long long number = value;
+        if( number >= LONG_MIN && number <= LONG_MAX )
+            return PyInt_FromLong((long) number);
+        return PyLong_FromLongLong(number);
+    }
+
+    unsigned long long number = value;
+    if( number <= LONG_MAX )
+        return PyInt_FromLong((long) number);
+    return PyLong_FromUnsignedLongLong(number);
+}
+
+static bool py_speedups_index(PyObject * object, ptrdiff_t & index) {
+    index = PyNumber_AsSsize_t(object, PyExc_IndexError);
+    return !(index == -1 && PyErr_Occurred());
+}
+
+static PyObject * py_speedups_status(int status, ptrdiff_t index) {
+    if( status == PY_VECTOR_EMPTY ) {
+        PyErr_SetString(PyExc_IndexError, "pop from empty vector");
+        return NULL;
+    }
+    if( status == PY_VECTOR_OUT_OF_RANGE ) {
+        PyErr_Format(PyExc_IndexError, "Vector index %zd out of range", (Py_ssize_t) index);
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+
+template <typename T>
+static PyObject * py_speedups_new(PyObject * args) {
+    if( !PyArg_UnpackTuple(args, "new", 0, 0) )
+        return NULL;
+    return PyLong_FromVoidPtr(py_vector_new<T>());
+}
+
+template <typename T>
+static PyObject * py_speedups_delete(PyObject * args) {
+    PyObject * object;
+    vector<T> * pvector;
+    if( !PyArg_UnpackTuple(args, "delete", 1, 1, &object) || !py_speedups_vector(object, pvector) )
+        return NULL;
+    py_vector_delete(pvector);
+    Py_RETURN_NONE;
+}
+
+template <typename T>
+static PyObject * py_speedups_size(PyObject * args) {
+    PyObject * object;
+    vector<T> * pvector;
+    if( !PyArg_UnpackTuple(args, "size", 1, 1, &object) || !py_speedups_vector(object, pvector) )
+        return NULL;
+    return PyInt_FromSize_t(py_vector_size(pvector));
+}
+
+template <typename T>
+static PyObject * py_speedups_capacity(PyObject * args) {
+    PyObject * object;
+    vector<T> * pvector;
+    if( !PyArg_UnpackTuple(args, "capacity", 1, 1, &object) || !py_speedups_vector(object, pvector) )
+        return NULL;
+    return PyInt_FromSize_t(py_vector_capacity(pvector));
+}
+
+template <typename T>
+static PyObject * py_speedups_data(PyObject * args) {
+    PyObject * object;
+    vector<T> * pvector;
+    if( !PyArg_UnpackTuple(args, "data", 1, 1, &object) || !py_speedups_vector(object, pvector) )
+        return NULL;
+
+    T * data = py_vector_data(pvector);
+    if( data == NULL )
+        Py_RETURN_NONE;  // as ctypes does with c_void_p
+    return PyLong_FromVoidPtr(data);
+}
+
+template <typename T>
+static PyObject * py_speedups_at(PyObject * args) {
+    PyObject * object, * pyindex;
+    vector<T> * pvector;
+    ptrdiff_t index;
+    if( !PyArg_UnpackTuple(args, "at", 2, 2, &object, &pyindex) ||
+            !py_speedups_vector(object, pvector) || !py_speedups_index(pyindex, index) )
+        return NULL;
+
+    if( index < 0 || (size_t) index >= pvector->size() )
+        return py_speedups_status(PY_VECTOR_OUT_OF_RANGE, index);
+    return py_speedups_object((*pvector)[index]);
+}
+
+template <typename T>
+static PyObject * py_speedups_set(PyObject * args) {
+    PyObject * object, * pyindex, * pyvalue;
+    vector<T> * pvector;
+    ptrdiff_t index;
+    T value;
+    if( !PyArg_UnpackTuple(args, "set", 3, 3, &object, &pyindex, &pyvalue) ||
+            !py_speedups_vector(object, pvector) || !py_speedups_index(pyindex, index) ||
+            !py_speedups_value(pyvalue, value) )
+        return NULL;
+
+    if( index < 0 || (size_t) index >= pvector->size() )
+        return py_speedups_status(PY_VECTOR_OUT_OF_RANGE, index);
+    (*pvector)[index] = value;
+    Py_RETURN_NONE;
+}
+
+template <typename T>
+static PyObject * py_speedups_push_back(PyObject * args) {
+    PyObject * object, * pyvalue;
+    vector<T> * pvector;
+    T value;
+    if( !PyArg_UnpackTuple(args, "push_back", 2, 2, &object, &pyvalue) ||
+            !py_speedups_vector(object, pvector) || !py_speedups_value(pyvalue, value) )
+        return NULL;
+
+    try {
+        py_vector_push_back(pvector, value);
+    } catch( const exception & ) {
+        return PyErr_NoMemory();
+    }
+    Py_RETURN_NONE;
+}
+
+template <typename T>
+static PyObject * py_speedups_pop_back(PyObject * args) {
+    PyObject * object;
+    vector<T> * pvector;
+    if( !PyArg_UnpackTuple(args, "pop_back", 1, 1, &object) || !py_speedups_vector(object, pvector) )
+        return NULL;
+
+    if( pvector->empty() )
+        return py_speedups_status(PY_VECTOR_EMPTY, -1);
+    return py_speedups_object(py_vector_pop_back(pvector));
+}
+
+template <typename T>
+static PyObject * py_speedups_sorted_find(PyObject * args) {
+    PyObject * object, * pyvalue;
+    vector<T> * pvector;
+    T value;
+    if( !PyArg_UnpackTuple(args, "sorted_find", 2, 2, &object, &pyvalue) ||
+            !py_speedups_vector(object, pvector) || !py_speedups_value(pyvalue, value) )
+        return NULL;
+
+    return PyInt_FromSsize_t(py_vector_sorted_find(pvector, value));
+}
+
+template <typename T>
+static PyObject * py_speedups_sorted_count(PyObject * args) {
+    PyObject * object, * pyvalue;
+    vector<T> * pvector;
+    T value;
+    if( !PyArg_UnpackTuple(args, "sorted_count", 2, 2, &object, &pyvalue) ||
+            !py_speedups_vector(object, pvector) || !py_speedups_value(pyvalue, value) )
+        return NULL;
+
+    return PyInt_FromSize_t(py_vector_sorted_count(pvector, value));
+}
+
+template <typename T>
+static PyObject * py_speedups_checked_at(PyObject * args) {
+    PyObject * object, * pyindex;
+    vector<T> * pvector;
+    ptrdiff_t index;
+    T value;
+    if( !PyArg_UnpackTuple(args, "checked_at", 2, 2, &object, &pyindex) ||
+            !py_speedups_vector(object, pvector) || !py_speedups_index(pyindex, index) )
+        return NULL;
+
+    if( py_vector_checked_at(pvector, index, &value) != PY_VECTOR_OK )
+        return py_speedups_status(PY_VECTOR_OUT_OF_RANGE, index);
+    return py_speedups_object(value);
+}
+
+template <typename T>
+static PyObject * py_speedups_checked_set(PyObject * args) {
+    PyObject * object, * pyindex, * pyvalue;
+    vector<T> * pvector;
+    ptrdiff_t index;
+    T value;
+    if( !PyArg_UnpackTuple(args, "checked_set", 3, 3, &object, &pyindex, &pyvalue) ||
+            !py_speedups_vector(object, pvector) || !py_speedups_index(pyindex, index) ||
+            !py_speedups_value(pyvalue, value) )
+        return NULL;
+
+    return py_speedups_status(py_vector_checked_set(pvector, index, value), index);
+}
+
+template <typename T>
+static PyObject * py_speedups_checked_insert(PyObject * args) {
+    PyObject * object, * pyindex, * pyvalue;
+    vector<T> * pvector;
+    ptrdiff_t index;
+    T value;
+    int status;
+    if( !PyArg_UnpackTuple(args, "checked_insert", 3, 3, &object, &pyindex, &pyvalue) ||
+            !py_speedups_vector(object, pvector) || !py_speedups_index(pyindex, index) ||
+            !py_speedups_value(pyvalue, value) )
+        return NULL;
+
+    try {
+        status = py_vector_checked_insert(pvector, index, value);
+    } catch( const exception & ) {
+        return PyErr_NoMemory();
+    }
+    return py_speedups_status(status, index);
+}
+
+template <typename T>
+static PyObject * py_speedups_checked_erase(PyObject * args) {
+    PyObject * object, * pyindex;
+    vector<T> * pvector;
+    ptrdiff_t index;
+    if( !PyArg_UnpackTuple(args, "checked_erase", 2, 2, &object, &pyindex) ||
+            !py_speedups_vector(object, pvector) || !py_speedups_index(pyindex, index) )
+        return NULL;
+
+    return py_speedups_status(py_vector_checked_erase(pvector, index), index);
+}
+
+template <typename T>
+static PyObject * py_speedups_checked_pop(PyObject * args) {
+    PyObject * object, * pyindex;
+    vector<T> * pvector;
+    ptrdiff_t index;
+    T value;
+    int status;
+    if( !PyArg_UnpackTuple(args, "checked_pop", 2, 2, &object, &pyindex) ||
+            !py_speedups_vector(object, pvector) || !py_speedups_index(pyindex, index) )
+        return NULL;
+
+    status = py_vector_checked_pop(pvector, index, &value);
+    if( status != PY_VECTOR_OK )
+        return py_speedups_status(status, index);
+    return py_speedups_object(value);
+}
+
+
+// Python functions `<name>_<function>` for the `vector<T>` functions above
+#define PY_SPEEDUPS_FUNCTION(name, T, function) \
+static PyObject * py_speedups_##name##_##function(PyObject * self, PyObject * args) { \
+	return py_speedups_##function<T>(args); \
+}
+
+#define PY_SPEEDUPS_DEFINE(name, T) \
+	PY_SPEEDUPS_FUNCTION(name, T, new) \
+	PY_SPEEDUPS_FUNCTION(name, T, delete) \
+	PY_SPEEDUPS_FUNCTION(name, T, size) \
+	PY_SPEEDUPS_FUNCTION(name, T, capacity) \
+	PY_SPEEDUPS_FUNCTION(name, T, data) \
+	PY_SPEEDUPS_FUNCTION(name, T, at) \
+	PY_SPEEDUPS_FUNCTION(name, T, set) \
+	PY_SPEEDUPS_FUNCTION(name, T, push_back) \
+	PY_SPEEDUPS_FUNCTION(name, T, pop_back) \
+	PY_SPEEDUPS_FUNCTION(name, T, sorted_find) \
+	PY_SPEEDUPS_FUNCTION(name, T, sorted_count) \
+	PY_SPEEDUPS_FUNCTION(name, T, checked_at) \
+	PY_SPEEDUPS_FUNCTION(name, T, checked_set) \
+	PY_SPEEDUPS_FUNCTION(name, T, checked_insert) \
+	PY_SPEEDUPS_FUNCTION(name, T, checked_erase) \
+	PY_SPEEDUPS_FUNCTION(name, T, checked_pop)
+
+#define PY_SPEEDUPS_METHOD(name, function) \
+	{#name "_" #function, py_speedups_##name##_##function, METH_VARARGS, NULL},
+
+#define PY_SPEEDUPS_METHODS(name) \
+	PY_SPEEDUPS_METHOD(name, new) \
+	PY_SPEEDUPS_METHOD(name, delete) \
+	PY_SPEEDUPS_METHOD(name, size) \
+	PY_SPEEDUPS_METHOD(name, capacity) \
+	PY_SPEEDUPS_METHOD(name, data) \
+	PY_SPEEDUPS_METHOD(name, at) \
+	PY_SPEEDUPS_METHOD(name, set) \
+	PY_SPEEDUPS_METHOD(name, push_back) \
+	PY_SPEEDUPS_METHOD(name, pop_back) \
+	PY_SPEEDUPS_METHOD(name, sorted_find) \
+	PY_SPEEDUPS_METHOD(name, sorted_count) \
+	PY_SPEEDUPS_METHOD(name, checked_at) \
+	PY_SPEEDUPS_METHOD(name, checked_set) \
+	PY_SPEEDUPS_METHOD(name, checked_insert) \
+	PY_SPEEDUPS_METHOD(name, checked_erase) \
+	PY_SPEEDUPS_METHOD(name, checked_pop)
+
+
+// Same types than in vector.h
+PY_SPEEDUPS_DEFINE(int, int)
+PY_SPEEDUPS_DEFINE(long, long)
+
+PY_SPEEDUPS_DEFINE(int8, int8_t)
+PY_SPEEDUPS_DEFINE(int16, int16_t)
+PY_SPEEDUPS_DEFINE(int32, int32_t)
+PY_SPEEDUPS_DEFINE(int64, int64_t)
+
+PY_SPEEDUPS_DEFINE(uint8, uint8_t)
+PY_SPEEDUPS_DEFINE(uint16, uint16_t)
+PY_SPEEDUPS_DEFINE(uint32, uint32_t)
+PY_SPEEDUPS_DEFINE(uint64, uint64_t)
+
+PY_SPEEDUPS_DEFINE(float, float)
+PY_SPEEDUPS_DEFINE(double, double)
+
+static PyMethodDef py_speedups_methods[] = {
+	PY_SPEEDUPS_METHODS(int)
+	PY_SPEEDUPS_METHODS(long)
+	PY_SPEEDUPS_METHODS(int8)
+	PY_SPEEDUPS_METHODS(int16)
+	PY_SPEEDUPS_METHODS(int32)
+	PY_SPEEDUPS_METHODS(int64)
+	PY_SPEEDUPS_METHODS(uint8)
+	PY_SPEEDUPS_METHODS(uint16)
+	PY_SPEEDUPS_METHODS(uint32)
+	PY_SPEEDUPS_METHODS(uint64)
+	PY_SPEEDUPS_METHODS(float)
+	PY_SPEEDUPS_METHODS(double)
+	{NULL, NULL, 0, NULL}
+};
+
+#if PY_MAJOR_VERSION >= 3
+
+static struct PyModuleDef py_speedups_module = {
+	PyModuleDef_HEAD_INIT, "_speedups", NULL, -1, py_speedups_methods
+};
+
+PyMODINIT_FUNC PyInit__speedups(void) {
+	return PyModule_Create(&py_speedups_module);
+}
+
+#else
+
+PyMODINIT_FUNC init_speedups(void) {
+	Py_InitModule("_speedups", py_speedups_methods);
+}
+
+#endif
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+storage
+~~~~~~~
+
+Vectors on memory they do not own, such as memory mapped files.
+
+A vector can be pointed to elements already in memory without copying them,
+and it keeps working as any other vector on top of them. It moves them to
+memory of its own only if it has to grow beyond the room available, as the
+memory cannot be reallocated.
+
+.. code::
+    >> vector.save('ids.vector')
+    >> ids = VectorLong.open('ids.vector')  # nothing is read until needed
+    >> ids[1000000]
+
+Files
+-----
+
+Vector files hold a header of :data:`HEADER_SIZE` bytes and then the raw
+elements, which are mapped in place. The header has the :data:`MAGIC`
+string, the file layout version, the NumPy type string of the elements,
+which tells their kind, size and byte order, and the number of elements, all
+in little endian:
+
+.. code::
+    magic (8 bytes) | version (uint16) | padding (6 bytes) |
+    type string (8 bytes, NUL padded) | count (uint64) | padding
+
+Files opened with `'r'` are mapped copy on write, so all the processes
+mapping them share the same pages in the OS page cache, and changes are
+never written back.
+
+Files opened with `'r+'` are mapped shared, so changes go to the file and are
+seen by the other processes mapping it. :meth:`Vector.reserve` grows the
+file. Growing the vector beyond the file otherwise moves it to memory of its
+own until :meth:`Vector.flush` writes it back, which is also when the count
+of elements in the header is updated. :meth:`Vector.close` and collecting the
+vector flush it too.
+
+Shared memory
+-------------
+
+:meth:`Vector.shared` creates a vector file with a fixed capacity in a named
+POSIX shared memory segment, which other processes map by name. All of them
+work on the same elements in memory, and changes are seen right away by
+everyone. The number of elements is taken from the header when attaching,
+which :meth:`Vector.flush` updates.
+
+.. code::
+    >> ids = VectorLong.shared('ids', capacity=10 ** 9)  # in one process
+    >> ids.extend(load_ids())
+    >> ids.flush()
+    >> ids = VectorLong.shared('ids')  # in the others
+    >> ids.storage.unlink()  # once no new process needs to attach
+
+Segments live until they are unlinked or the system restarts, as files under
+:data:`SHARED_MEMORY_DIRECTORY`.
+"""
+import io
+import mmap
+import os
+import struct
+from ctypes import addressof, memmove, sizeof, c_char
+
+from .backend import UNSUPPORTED
+from .vector import _typestr
+
+#: Prefix of vector files
+MAGIC = b'PYSTLVEC'
+
+#: Version of the layout of vector files
+VERSION = 1
+
+#: Magic, version, type string and count at the start of vector files
+HEADER = struct.Struct('<8sH6x8sQ')
+
+#: Bytes before the elements in vector files, which keeps them aligned
+HEADER_SIZE = 64
+
+#: Directory where POSIX shared memory segments are files, as in Linux
+SHARED_MEMORY_DIRECTORY = '/dev/shm'
+
+
+def save(vector, path):
+    """Write a vector to a new file. See :meth:`Vector.save`"""
+    with io.open(path, 'wb') as stream:
+        stream.write(_header(vector.value_type, len(vector)))
+        if len(vector):
+            stream.write(vector.view())
+
+
+def _header(value_type, count):
+    typestr = _typestr(value_type).encode('ascii')
+    return HEADER.pack(MAGIC, VERSION, typestr, count).ljust(HEADER_SIZE, b'\0')
+
+
+class Storage(object):
+    """Memory which a vector is pointed to, at :attr:`address`"""
+
+    #: Address of the first element
+    address = None
+
+    #: Room in elements of the vector type
+    capacity = 0
+
+    def flush(self, vector):
+        """Write back the elements of the vector"""
+
+    def reserve(self, vector, capacity):
+        """Make room for `capacity` elements if possible, or do nothing for
+        the vector to move to memory of its own"""
+
+    def close(self, vector):
+        """Flush the vector and leave it empty, releasing the storage"""
+        self.flush(vector)
+        vector.vector_release(vector.vector)
+        vector.storage = None
+
+    def attach(self, vector, size):
+        """Point `vector` to the first `size` elements of the storage"""
+        status = vector.vector_adopt(vector.vector, self.address, size,
+                                     self.capacity)
+        if status == UNSUPPORTED:
+            raise RuntimeError(u'vectors cannot be pointed to memory they do not '
+                               u'own with this C++ standard library')
+        vector.storage = self
+
+    def attached(self, vector):
+        """Whether `vector` still points to the storage"""
+        return vector.vector_data(vector.vector) == self.address
+
+
+class Slice(Storage):
+    """Elements `start` to `stop` of another storage, kept open meanwhile"""
+
+    def __init__(self, storage, start, stop, itemsize):
+        self.storage = storage
+        self.address = storage.address + start * itemsize
+        self.capacity = stop - start
+
+
+class MappedFile(Storage):
+    """Memory map of a file written by :meth:`Vector.save`"""
+
+    def __init__(self, path, mode='r'):
+        if mode not in ('r', 'r+'):
+            raise ValueError(u"mode must be 'r' or 'r+'")
+        self.path, self.mode = path, mode
+
+        self.file = io.open(path, 'rb' if mode == 'r' else 'r+b')
+        try:
+            magic, version, typestr, self.count = HEADER.unpack(
+                self.file.read(HEADER_SIZE)[:HEADER.size])
+        except struct.error:
+            magic = version = None
+        if magic != MAGIC or version != VERSION:
+            self.file.close()
+            raise ValueError(u'{} is not a vector file'.format(path))
+        self.typestr = typestr.rstrip(b'\0').decode('ascii')
+
+        self._map()
+        if mode == 'r':
+            self.file.close()  # the map keeps its own handle
+
+    def open(self, vector_type):
+        """Get a new vector of `vector_type` on the elements of the file"""
+        typestr = _typestr(vector_type.value_type)
+        if typestr != self.typestr:
+            raise TypeError(u'{} holds {} elements, not {} like {}'.format(
+                self.path, self.typestr, typestr, vector_type.__name__))
+
+        self.itemsize = sizeof(vector_type.value_type)
+        self.capacity = (len(self.map) - HEADER_SIZE) // self.itemsize
+        if self.count > self.capacity:
+            raise ValueError(u'{} is truncated'.format(self.path))
+
+        vector = vector_type()
+        self.attach(vector, self.count)
+        return vector
+
+    def flush(self, vector):
+        if self.mode == 'r':
+            return
+        if not self.attached(vector):
+            self._remap(vector, vector.capacity())
+        self.map[:HEADER_SIZE] = _header(vector.value_type, len(vector))
+        self.map.flush()
+
+    def reserve(self, vector, capacity):
+        if self.mode == 'r+' and capacity > vector.capacity():
+            self._remap(vector, capacity)
+
+    def close(self, vector):
+        super(MappedFile, self).close(vector)
+        self.map.close()
+        self.file.close()
+
+    def _map(self):
+        access = mmap.ACCESS_COPY if self.mode == 'r' else mmap.ACCESS_WRITE
+        self.map = mmap.mmap(self.file.fileno(), 0, access=access)
+        self.address = addressof(c_char.from_buffer(self.map)) + HEADER_SIZE
+
+    def _remap(self, vector, capacity):
+        """Grow the file to `capacity` elements and point the vector to
+        them, copying back the elements if it moved to memory of its own"""
+        size, data = len(vector), vector.vector_data(vector.vector)
+        attached = data == self.address
+        if attached:
+            vector.vector_release(vector.vector)  # the file keeps the elements
+
+        self.map.close()
+        self.file.truncate(HEADER_SIZE + capacity * self.itemsize)
+        self._map()
+        self.capacity = capacity
+
+        if not attached:
+            memmove(self.address, data, size * self.itemsize)
+        self.attach(vector, size)
+
+
+class SharedMemory(MappedFile):
+    """Named POSIX shared memory segment holding a vector file, which does
+    not grow: vectors growing beyond it move to memory of their own"""
+
+    def __init__(self, name):
+        self.name = name
+        super(SharedMemory, self).__init__(self._path(name), 'r+')
+
+    @classmethod
+    def create(cls, name, vector_type, capacity):
+        """Create a new segment with room for `capacity` elements"""
+        if capacity < 0:
+            raise ValueError(u'capacity must be non negative')
+
+        descriptor = os.open(cls._path(name), os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o600)
+        with io.open(descriptor, 'wb') as stream:
+            stream.write(_header(vector_type.value_type, 0))
+            stream.truncate(HEADER_SIZE + capacity * sizeof(vector_type.value_type))
+        return cls(name)
+
+    def flush(self, vector):
+        if not self.attached(vector):
+            raise ValueError(u'vector grew beyond its shared memory of {} elements'
+                             .format(self.capacity))
+        super(SharedMemory, self).flush(vector)
+
+    def reserve(self, vector, capacity):
+        if capacity > self.capacity:
+            raise ValueError(u'shared memory has room for {} elements only'
+                             .format(self.capacity))
+
+    def close(self, vector):
+        if self.attached(vector):
+            self.flush(vector)
+        vector.vector_release(vector.vector)
+        vector.storage = None
+        self.map.close()
+        self.file.close()
+
+    def unlink(self):
+        """Remove the name of the segment, which is freed once every process
+        releases it"""
+        os.unlink(self.path)
+
+    @staticmethod
+    def _path(name):
+        name = name.lstrip('/')
+        if not name or '/' in name:
+            raise ValueError(u'invalid shared memory name {!r}'.format(name))
+        return os.path.join(SHARED_MEMORY_DIRECTORY, name)
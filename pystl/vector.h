@@ -1,7 +1,49 @@
 #ifndef __PY_VECTOR__
 #define __PY_VECTOR__
 
-#include "vector_int.h"
-#include "vector_long.h"
+#include <stdint.h>
+
+#include "vector_define.h"
+
+PY_VECTOR_DEFINE(int, int)
+PY_VECTOR_DEFINE(long, long)
+
+PY_VECTOR_DEFINE(int8, int8_t)
+PY_VECTOR_DEFINE(int16, int16_t)
+PY_VECTOR_DEFINE(int32, int32_t)
+PY_VECTOR_DEFINE(int64, int64_t)
+
+PY_VECTOR_DEFINE(uint8, uint8_t)
+PY_VECTOR_DEFINE(uint16, uint16_t)
+PY_VECTOR_DEFINE(uint32, uint32_t)
+PY_VECTOR_DEFINE(uint64, uint64_t)
+
+PY_VECTOR_DEFINE(float, float)
+PY_VECTOR_DEFINE(double, double)
+
+// Settings of the parallel algorithms, see parallel.h
+extern "C" {
+
+	size_t py_vector_parallel_get_threads() {
+		return py_vector_get_threads();
+	}
+
+	// As set, 0 meaning one per hardware thread
+	size_t py_vector_parallel_get_threads_setting() {
+		return py_vector_parallel().threads;
+	}
+
+	void py_vector_parallel_set_threads(size_t threads) {
+		py_vector_parallel().threads = threads;
+	}
+
+	size_t py_vector_parallel_get_threshold() {
+		return py_vector_parallel().threshold;
+	}
+
+	void py_vector_parallel_set_threshold(size_t threshold) {
+		py_vector_parallel().threshold = threshold;
+	}
+}
 
 #endif
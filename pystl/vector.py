@@ -68,11 +68,119 @@ the object.
     >>> map(zip(vector, vector))
     {1:1, 2:2, 3:3}
 
+Sharing the memory
+------------------
+
+The vector storage can be read and written without copying through a
+`memoryview`, which can be handed to any code accepting buffers.
+
+.. code::
+    >> view = vector.view()
+    >> view.itemsize, len(view)
+    (4, 3)
+    >> hashlib.md5(view).hexdigest()
+    >> vector.tobytes()
+    '\\x01\\x00\\x00\\x00\\x02\\x00\\x00\\x00\\x03\\x00\\x00\\x00'
+
+A view points straight to the elements in the `std::vector`, so it is only
+valid while the vector does not reallocate its storage. Any call which may
+grow the vector (`append`, `extend`, `insert`...) invalidates all the views
+previously taken, which must not be used afterwards. Just take a new one.
+
+NumPy
+-----
+
+Vectors implement the NumPy array interface, so NumPy arrays can be built on
+top of the vector storage without copying, with the same validity rules as
+views. NumPy is not required by this module at all.
+
+.. code::
+    >> array = numpy.asarray(vector)
+    >> array.sum()
+    6
+
+Files
+-----
+
+Vectors are written to files by :meth:`Vector.save`, which
+:meth:`Vector.open` maps back in memory without reading them, so opening
+them takes no time and processes opening the same file share its pages.
+
+.. code::
+    >> vector.save('ids.vector')
+    >> ids = VectorInt.open('ids.vector')
+    >> ids[1]
+    2
+
+Vectors can also be shared by processes through named shared memory with
+:meth:`Vector.shared`. See :mod:`pystl.storage`.
+
+Sorted vectors
+--------------
+
+Sorted vectors can be searched with :meth:`Vector.bisect_left` and
+:meth:`Vector.bisect_right`, and kept sorted with :meth:`Vector.insort`, like
+with the :mod:`bisect` module. Vectors created with `track_sorted=True`
+remember when they have been sorted, and search them in logarithmic time.
+
+.. code::
+    >> vector = VectorInt([3, 1, 2], track_sorted=True)
+    >> vector.sort()
+    >> 2 in vector  # binary search
+    True
+
+Sorted vectors are combined in a single pass like sorted sets, keeping
+repeated elements like the `std::set_*` algorithms, or merged.
+
+.. code::
+    >> VectorInt([1, 2, 4]).intersection(VectorInt([2, 3, 4]))
+    [2, 4]
+    >> VectorInt.merge_many([VectorInt([1, 4]), VectorInt([2]), VectorInt([3])])
+    [1, 2, 3, 4]
+
+Arithmetic
+----------
+
+Vectors support the arithmetic and bitwise operators elementwise, with
+another vector of the same type and size or with a scalar. Each operation is
+a single C call, and in-place ones do not allocate at all.
+
+.. code::
+    >> (vector * 2 + vector) % 4
+    [3, 2, 1]
+    >> vector <<= 1
+
+Chained operators can be fused in a single pass by starting from
+:meth:`Vector.lazy`. See :mod:`pystl.expression`.
+
+Selection
+---------
+
+Ordering comparisons with a scalar or another vector give a :class:`Mask`,
+with a byte per element, which selects elements by indexing. Vectors of
+indexes gather elements the same way, and :meth:`Vector.put` scatters them.
+
+.. code::
+    >> vector[vector > 1]
+    [3, 2]
+    >> vector[VectorLong([2, 0])]
+    [2, 3]
+    >> vector.put(VectorLong([0, 2]), 0)
+
+`==` and `!=` still compare whole vectors like lists, while :meth:`Vector.eq`
+and :meth:`Vector.ne` compare them elementwise.
+
 Types
 -----
 
 Notice that this classes must be type consistent and do not manage all
-possible types.
+possible types. These are available:
+
+- :class:`VectorInt` and :class:`VectorLong`, for C `int` and `long`.
+- :class:`VectorInt8`, :class:`VectorInt16`, :class:`VectorInt32` and
+  :class:`VectorInt64`, and their unsigned `VectorUInt*` versions.
+- :class:`VectorFloat` and :class:`VectorDouble`.
+- :class:`Mask`, a :class:`VectorUInt8` of selected elements.
 
 A new wrapper must be set per each new type, linked to C wrapper
 functions, which will call C++ code and instantiate all the needed templates
@@ -82,49 +190,172 @@ This is annoying, so effort has been put into making it as decoupled as possible
 
 The :class:`Vector` class defines most of `list` logic and methods, using
 `vector_*` functions, which implement all the operations by a given container
-and type, exposing it through a pure C interface wrapper. They have to be
+and type, exposing it through a pure C interface wrapper. They are
 referenced in Python by subclassing the `Vector` class and setting references
-to the needed functions.
+to the needed functions, which :func:`vector_type` does from the
+declarations in :data:`pystl.backend.FUNCTIONS`.
 
 .. code::
-    class VectorInt(Vector):
-        vector_new = lib.py_vector_int_new
-        vector_new.restype = c_void_p
-        vector_new.argtypes = []
-        (..)
+    VectorInt = vector_type('VectorInt', 'int', c_int)
 
-Wich is using a type-aware C function that does the work using the C++ template:
+Wich is using type-aware C functions that do the work using the C++
+templates, all of them instantiated at once by a macro:
 
 .. code::
 
-    #include <vector>
+    #include "vector_define.h"
 
-    using namespace std;
+    PY_VECTOR_DEFINE(int, int)  // py_vector_int_new, py_vector_int_size...
 
-    extern "C" {
-        void py_vector_int_new() {
-            return new vector<int>();
-
-        }
-    }
+So adding a new type takes a `PY_VECTOR_DEFINE` line in `vector.h` and a
+:func:`vector_type` call.
 """
-import os
-from ctypes import cdll, c_void_p, c_size_t, c_int, c_long
+import math
+import numbers
+import operator
+import sys
+from array import array
+from ctypes import (sizeof, c_void_p, c_size_t, c_int, c_long, c_int8, c_int16, c_int32, c_int64,
+                    c_uint8, c_uint16, c_uint32, c_uint64, c_float, c_double)
+from functools import partial
+from itertools import chain
+
+try:
+    from pickle import PickleBuffer  # python 3.8
+except ImportError:
+    PickleBuffer = None
+
+from . import backend as backends
+from .backend import (OUT_OF_RANGE, ZERO_DIVISION, NEGATIVE_SHIFT, UNSUPPORTED, NO_MEMORY,
+                      ADD, SUB, MUL, FLOORDIV, MOD, AND, OR, XOR, LSHIFT, RSHIFT,
+                      BOTH_VECTORS, RIGHT_SCALAR, LEFT_SCALAR,
+                      EQ, NE, LT, LE, GT, GE, UNION, INTERSECTION, DIFFERENCE,
+                      SYMMETRIC_DIFFERENCE, MERGE, AUTO, INTROSORT, RADIX, COUNTING)
+
+
+#: `memoryview` formats which are copied as raw bytes
+BYTE_FORMATS = ('B', 'b', 'c')
+
+#: ctypes type codes of floating point types
+FLOATING_TYPES = 'fdg'
+
+#: `struct` prefixes meaning native byte order
+NATIVE_ORDER = '@=' + ('<' if sys.byteorder == 'little' else '>')
+
+
+def _typestr(value_type):
+    """NumPy array interface type string for a ctypes type"""
+    code = value_type._type_
+    if code in FLOATING_TYPES:
+        kind = 'f'
+    elif code == '?':
+        kind = 'b'
+    else:
+        kind = 'u' if code.isupper() else 'i'
+    order = '<' if sys.byteorder == 'little' else '>'
+    return '{}{}{}'.format(order, kind, sizeof(value_type))
+
+
+def _limits(value_type):
+    """Smallest and largest values of an integer ctypes type"""
+    bits = 8 * sizeof(value_type)
+    if value_type._type_.isupper():
+        return 0, 2 ** bits - 1
+    return -2 ** (bits - 1), 2 ** (bits - 1) - 1
+
+
+def _integer_comparison(value_type, comparison, value):
+    """Turn the comparison of integers of `value_type` with a real `value`
+    into a `(comparison, integer)` in the range of the type, or into its
+    result for all of them, `True` or `False`, when there is none"""
+    lowest, highest = _limits(value_type)
+    if math.isnan(value):
+        return comparison == NE
+    if math.isinf(value):
+        value = lowest - 1 if value < 0 else highest + 1
+
+    if not isinstance(value, numbers.Integral):
+        if comparison in (LT, GE):  # x < 2.5 is x < 3
+            value = math.ceil(value)
+        elif comparison in (LE, GT):  # x <= 2.5 is x <= 2
+            value = math.floor(value)
+        elif value != int(value):  # no integer is equal
+            return comparison == NE
+        value = int(value)
+
+    if value < lowest:
+        return comparison in (NE, GT, GE)
+    if value > highest:
+        return comparison in (NE, LT, LE)
+    return comparison, value
+
+
+#: Largest number of elements, which C takes as a `size_t`
+SIZE_MAX = 2 ** (8 * sizeof(c_size_t)) - 1
+
+
+#: Algorithms of :meth:`Vector.sort` by name
+SORT_ALGORITHMS = {'auto': AUTO, 'introsort': INTROSORT, 'radix': RADIX,
+                   'counting': COUNTING}
+
+#: Elementwise operations only available for integers
+BITWISE_OPERATIONS = (AND, OR, XOR, LSHIFT, RSHIFT)
+
+
+def _operator(operation, reflected=False, inplace=False):
+    """Define an arithmetic operator method. See :meth:`Vector.operate`"""
+    def operator(self, other):
+        return self.operate(operation, other, reflected=reflected,
+                            out=self if inplace else None)
+    return operator
+
+
+def _comparison(comparison):
+    """Define an elementwise comparison method. See :meth:`Vector.compare`"""
+    def compare(self, other):
+        return self.compare(comparison, other)
+    return compare
 
 
-def here(path):
-    return os.path.abspath(os.path.join(os.path.dirname(__file__), path))
+def _check_operation(status):
+    """Raise the python exception for the status of an arithmetic operation"""
+    if status == ZERO_DIVISION:
+        raise ZeroDivisionError(u'division or modulo by zero')
+    if status == NEGATIVE_SHIFT:
+        raise ValueError(u'negative shift count')
+    if status == UNSUPPORTED:
+        raise TypeError(u'unsupported operation for the vector type')
 
 
-lib = cdll.LoadLibrary(here('_pystl.so'))
+def _rebuild(vector_type, data, track_sorted=False, sorted=False):
+    """Unpickle a vector from the raw bytes of its elements"""
+    view = memoryview(data)
+    cast = getattr(view, 'cast', None)  # out of band buffers keep their format
+    vector = vector_type(view if cast is None else cast('B'), track_sorted=track_sorted)
+    vector.sorted = sorted
+    return vector
+
+
+def _nbytes(view):
+    """Size in bytes of a `memoryview`, also under python 2.7"""
+    nbytes = getattr(view, 'nbytes', None)
+    return len(view) * view.itemsize if nbytes is None else nbytes
 
 
 class Vector(object):
 
-    def __init__(self, collection=None, ref=None, managed=None):
+    #: ctypes type of the vector elements
+    value_type = None
+
+    #: :class:`pystl.storage.Storage` of the elements if not in the C++ heap
+    storage = None
+
+    def __init__(self, collection=None, ref=None, managed=None, capacity=None,
+                 track_sorted=False):
         """Initialize a vector adapter and optionally populate it.
 
         :param collection: An `iterable` which would be consumed and copied.
+         See :meth:`extend`.
         :param ref: `void *` to an existing vector object. Passing this
          argument will prevent from allocating a new vector object.
         :param managed: Wether the vector reference should be deleted at the
@@ -140,30 +371,49 @@ class Vector(object):
         allocate/populate a new vector or manipulate an existing one through
         `ref`, set `managed` to `False` and then access directly to the `void`
         pointer in `self.vector` to send the reference somewhere else.
+
+        :param capacity: Number of elements to reserve room for, so the
+         vector won't reallocate until it grows beyond it.
+        :param track_sorted: Remember when the vector is sorted, so searches
+         can use binary search. See :meth:`sort`.
         """
         self.managed = ref is None if managed is None else managed
         self.vector = ref or self.vector_new()
+        self.track_sorted = track_sorted
+        self.sorted = False
+
+        if capacity is not None:
+            self.reserve(capacity)
 
         if collection is not None:
             self.extend(collection)
 
     def __del__(self):
-        if self.managed:
-            self.vector_delete(self.vector)
+        try:
+            if self.storage is not None:
+                self.storage.close(self)
+        finally:
+            if self.managed:
+                self.vector_delete(self.vector)
 
     def __len__(self):
         return self.vector_size(self.vector)
 
     def __getitem__(self, index):
         if isinstance(index, slice):
-            return [self[i] for i in self._getslice(index)]
-        return self.vector_at(self.vector, self._index(index))
+            return self.getslice(index)
+        if isinstance(index, Vector):
+            return self.filter(index) if isinstance(index, Mask) else self.take(index)
+        return self.vector_checked_at(self.vector, index)
 
     def __setitem__(self, index, value):
-        self.vector_set(self.vector, self._index(index), value)
+        self.sorted = False
+        if isinstance(index, slice):
+            return self._setslice(index, value)
+        self.vector_checked_set(self.vector, index, value)
 
     def __iter__(self):
-        return (self[i] for i in xrange(len(self)))
+        return iter(VectorIterator(self))
 
     def __delitem__(self, index):
         if isinstance(index, slice):
@@ -174,9 +424,14 @@ class Vector(object):
             start, stop, step = self._resolve_iterator_slice(index, size)
             self.vector_erase_slice(self.vector, start, stop)
         else:
-            self.vector_erase(self.vector, self._index(index))
+            self.vector_checked_erase(self.vector, index)
 
     def __contains__(self, value):
+        value = self._search_value(EQ, value)
+        if isinstance(value, bool):
+            return value
+        if self.sorted:
+            return self.vector_sorted_find(self.vector, value) != -1
         return self.vector_find(self.vector, value) != -1
 
     def __eq__(self, other):
@@ -189,69 +444,902 @@ class Vector(object):
             return False
         return not (self == other)
 
+    eq, ne = _comparison(EQ), _comparison(NE)
+    lt, le = _comparison(LT), _comparison(LE)
+    gt, ge = _comparison(GT), _comparison(GE)
+    __lt__, __le__, __gt__, __ge__ = lt, le, gt, ge
+
+    def __reduce__(self):
+        return self.__reduce_ex__(2)
+
+    def __reduce_ex__(self, protocol):
+        """Pickle the elements as a single blob of raw bytes in native byte
+        order, which protocol 5 can send out of band without copying"""
+        if protocol >= 5 and PickleBuffer is not None:
+            data = PickleBuffer(self._values())
+        else:
+            data = self.tobytes()
+        return _rebuild, (type(self), data, self.track_sorted, self.sorted)
+
+    def __bytes__(self):
+        return self.tobytes()
+
+    def __buffer__(self, flags):
+        return self.view()
+
+    @property
+    def __array_interface__(self):
+        data = self.vector_data(self.vector)
+        return {
+            'version': 3,
+            'shape': (len(self),),
+            'typestr': _typestr(self.value_type),
+            # NumPy does not accept NULL, which empty vectors might have
+            'data': (data, False) if data else self._values(),
+        }
+
+    __add__, __radd__, __iadd__ = (_operator(ADD), _operator(ADD, reflected=True),
+                                   _operator(ADD, inplace=True))
+    __sub__, __rsub__, __isub__ = (_operator(SUB), _operator(SUB, reflected=True),
+                                   _operator(SUB, inplace=True))
+    __mul__, __rmul__, __imul__ = (_operator(MUL), _operator(MUL, reflected=True),
+                                   _operator(MUL, inplace=True))
+    __floordiv__, __rfloordiv__, __ifloordiv__ = (
+        _operator(FLOORDIV), _operator(FLOORDIV, reflected=True),
+        _operator(FLOORDIV, inplace=True))
+    __mod__, __rmod__, __imod__ = (_operator(MOD), _operator(MOD, reflected=True),
+                                   _operator(MOD, inplace=True))
+    __and__, __rand__, __iand__ = (_operator(AND), _operator(AND, reflected=True),
+                                   _operator(AND, inplace=True))
+    __or__, __ror__, __ior__ = (_operator(OR), _operator(OR, reflected=True),
+                                _operator(OR, inplace=True))
+    __xor__, __rxor__, __ixor__ = (_operator(XOR), _operator(XOR, reflected=True),
+                                   _operator(XOR, inplace=True))
+    __lshift__, __rlshift__, __ilshift__ = (
+        _operator(LSHIFT), _operator(LSHIFT, reflected=True),
+        _operator(LSHIFT, inplace=True))
+    __rshift__, __rrshift__, __irshift__ = (
+        _operator(RSHIFT), _operator(RSHIFT, reflected=True),
+        _operator(RSHIFT, inplace=True))
+
     def __repr__(self):
         return u"[" + u", ".join(repr(i) for i in self) + u"]"
 
     def __str__(self):
         return repr(self)
 
+    def getslice(self, sliced, as_vector=False):
+        """Copy the elements selected by a `slice` with a single C call.
+
+        :param sliced: `slice` object, with the same semantics as in lists.
+        :param as_vector: Return a new vector of the same type instead of
+         a `list`.
+        """
+        start, stop, step = sliced.indices(len(self))
+
+        if as_vector:
+            ref = self.vector_slice(self.vector, start, stop, step)
+            return type(self)(ref=ref, managed=True)
+
+        size = len(xrange(start, stop, step))
+        values = (self.value_type * size)()
+        if size:
+            self.vector_copy_range(self.vector, start, stop, step, values)
+        return values[:]
+
+    def capacity(self):
+        """Number of elements the vector can hold without reallocating"""
+        return self.vector_capacity(self.vector)
+
+    def reserve(self, capacity):
+        """Make room for at least `capacity` elements.
+
+        Appending up to `capacity` elements won't reallocate the vector
+        storage afterwards. It never shrinks the vector.
+        """
+        if capacity < 0:
+            raise ValueError(u'capacity must be non negative')
+        if capacity > SIZE_MAX:
+            raise OverflowError(u'capacity does not fit in a size_t')
+        if self.storage is not None:
+            self.storage.reserve(self, capacity)
+        if self.vector_reserve(self.vector, capacity) != 0:
+            raise MemoryError(u'cannot reserve {} elements'.format(capacity))
+
+    def shrink_to_fit(self):
+        """Release the unused capacity of the vector"""
+        self.vector_shrink_to_fit(self.vector)
+
+    def resize(self, size, fill=0):
+        """Change the number of elements, filling new positions with `fill`"""
+        if size < 0:
+            raise ValueError(u'size must be non negative')
+        if size > SIZE_MAX:
+            raise OverflowError(u'size does not fit in a size_t')
+        self.sorted = False
+        if self.vector_resize(self.vector, size, fill) != 0:
+            raise MemoryError(u'cannot resize to {} elements'.format(size))
+
+    def view(self):
+        """Get a writable `memoryview` on the vector elements without copying.
+
+        The view keeps the vector alive, but it is invalidated by any
+        reallocation of the vector storage.
+        """
+        view = memoryview(self._values())
+        cast = getattr(view, 'cast', None)  # plain format codes on python 3
+        return view if cast is None else cast('B').cast(self.value_type._type_)
+
+    def tobytes(self):
+        """Copy the raw vector elements into a `bytes` object"""
+        return self.view().tobytes()
+
+    def save(self, path):
+        """Write the elements to a new file, which :meth:`open` maps back.
+
+        The file holds a small header with the type and number of elements,
+        followed by the raw elements as they are in memory.
+        """
+        from .storage import save  # which imports this module
+        save(self, path)
+
+    @classmethod
+    def open(cls, path, mode='r'):
+        """Map a file written by :meth:`save` as a new vector, without
+        reading it, so it is loaded by the OS as it is used.
+
+        :param mode: `'r'` to keep changes to the vector in memory, or
+         `'r+'` to write them to the file, which grows along the vector.
+         See :mod:`pystl.storage`.
+        """
+        from .storage import MappedFile
+        return MappedFile(path, mode).open(cls)
+
+    @classmethod
+    def shared(cls, name, capacity=None):
+        """Map a named shared memory segment as a new vector, which other
+        processes map by name, all of them sharing the same elements.
+
+        :param capacity: Create a new segment with room for `capacity`
+         elements instead of mapping an existing one. The vector cannot grow
+         beyond it. See :mod:`pystl.storage`.
+        """
+        from .storage import SharedMemory
+        memory = SharedMemory(name) if capacity is None else \
+            SharedMemory.create(name, cls, capacity)
+        return memory.open(cls)
+
+    def flush(self):
+        """Write the changes to the file of a vector opened with `'r+'`, or
+        the number of elements of a shared one"""
+        if self.storage is not None:
+            self.storage.flush(self)
+
+    def close(self):
+        """Flush the vector and release its file, leaving it empty"""
+        if self.storage is not None:
+            self.storage.close(self)
+
     def insert(self, index, value):
-        return self.vector_insert(self.vector, self._index(index), value)
+        self.sorted = False
+        self.vector_checked_insert(self.vector, index, value)
 
     def append(self, value):
+        self.sorted = False
         self.vector_push_back(self.vector, value)
 
     def extend(self, collection):
-        for item in collection:
-            self.append(item)
+        """Append all the elements in `collection` with a single C call.
+
+        `collection` can be a vector of the same type, any object exposing
+        the buffer protocol (`array.array`, `bytes`, `memoryview`...) or any
+        other iterable of numbers.
+
+        Buffers with the same item type as the vector are copied as they
+        are, and raw byte buffers are reinterpreted as native values, so
+        their size must be a multiple of the value size.
+        """
+        values, size = self._as_buffer(collection)
+        if size:
+            self.sorted = False
+            self.vector_extend(self.vector, values, size)
 
     def index(self, value):
-        index = self.vector_find(self.vector, value)
+        find = self.vector_sorted_find if self.sorted else self.vector_find
+        element = self._search_value(EQ, value)
+        index = -1 if isinstance(element, bool) else find(self.vector, element)
         if index < 0:
             raise ValueError(repr(value) + " is not in vector")
         return index
 
     def pop(self, index=None):
-        if len(self) == 0:
-            raise IndexError('pop from empty vector')
-
-        if index is None:
-            return self._pop_last()
-        else:
-            return self._pop_index(index)
-
-    def _pop_last(self):
-        return self.vector_pop_back(self.vector)
-
-    def _pop_index(self, index):
-        value = self[index]
-        del self[index]
-        return value
+        index = -1 if index is None else index
+        return self.vector_checked_pop(self.vector, index)
 
     def remove(self, value):
         del self[self.index(value)]
 
     def count(self, value):
+        value = self._search_value(EQ, value)
+        if isinstance(value, bool):
+            return 0
+        if self.sorted:
+            return self.vector_sorted_count(self.vector, value)
         return self.vector_count(self.vector, value)
 
-    def sort(self):
-        self.vector_sort(self.vector)
+    def sort(self, reverse=False, stable=False, algorithm='auto'):
+        """Sort the vector in ascending order, or descending if `reverse`.
+
+        When tracking the order, the vector is then known to be sorted until
+        a change which may break the order, and :meth:`index`, :meth:`count`
+        and `in` use binary search meanwhile. Deleting elements or adding them
+        through :meth:`insort` keeps it sorted. Descending order is not tracked.
+
+        Writes through views, the array interface or other references to the
+        `std::vector` are not tracked. Sort again after making any.
+
+        :param stable: Keep equal elements in their order, such as `0.0` and
+         `-0.0`, with a merge sort instead of `std::sort`.
+        :param algorithm: `'introsort'` for comparison sorts, `'radix'` for a
+         LSD radix sort or `'counting'` for a counting sort, which falls back
+         to radix sort if the values are too far apart. The last two are only
+         available for integers. `'auto'` takes counting sort for large
+         vectors of values close together, radix sort for other large
+         vectors of integers and comparison sorts for the rest.
+        """
+        if algorithm not in SORT_ALGORITHMS:
+            raise ValueError(u'unknown sort algorithm {!r}'.format(algorithm))
+        _check_operation(self.vector_sort(self.vector, reverse, stable,
+                                          SORT_ALGORITHMS[algorithm]))
+        self.sorted = self.track_sorted and not reverse
+
+    def partial_sort(self, k):
+        """Sort just the `k` smallest elements into the first positions,
+        leaving the rest in any order, in `O(n log k)`"""
+        if k < 0:
+            raise ValueError(u'k must be non negative')
+        self.sorted = False
+        self.vector_partial_sort(self.vector, min(k, len(self)))
+
+    def nth_element(self, n):
+        """Put the element which would be at `n` after sorting in its place,
+        in linear time. Elements before it are not larger and elements after
+        it are not smaller, in any order.
+
+        :param n: Position, which can be negative like in lists.
+        :returns: The element at `n`.
+        """
+        size = len(self)
+        position = self._resolve_negative_index(n, size)
+        if not 0 <= position < size:
+            raise IndexError(u'Vector index {} out of range'.format(n))
+
+        self.sorted = False
+        self.vector_nth_element(self.vector, position)
+        return self[position]
+
+    def argsort(self, reverse=False, stable=False):
+        """Positions which would sort the vector, like `numpy.argsort`.
+
+        They can reorder other vectors of the same size with :meth:`take`.
+        See :meth:`sort` for the arguments.
+
+        :returns: New :class:`VectorLong`.
+        """
+        positions = VectorLong()
+        positions.resize(len(self))
+        self.vector_argsort(self.vector, reverse, stable,
+                            positions.vector_data(positions.vector))
+        return positions
+
+    def topk(self, k, largest=True):
+        """Largest or smallest `k` elements, in `O(n log k)` without sorting.
+
+        :param largest: Get the largest elements instead of the smallest.
+        :returns: `(values, positions)`, a vector of this type with the
+         elements from the best one, the first one among equal ones, and a
+         :class:`VectorLong` with their positions.
+        """
+        if k < 0:
+            raise ValueError(u'k must be non negative')
+        k = min(k, len(self))
+
+        values, positions = type(self)(), VectorLong()
+        values.resize(k)
+        positions.resize(k)
+        self.vector_topk(self.vector, k, largest, values.vector_data(values.vector),
+                         positions.vector_data(positions.vector))
+        return values, positions
+
+    def is_sorted(self):
+        """Whether the elements are in ascending order"""
+        if self.sorted:
+            return True
+        is_sorted = bool(self.vector_is_sorted(self.vector))
+        self.sorted = is_sorted and self.track_sorted
+        return is_sorted
+
+    def bisect_left(self, value, lo=0, hi=None):
+        """Position to insert `value` before any equal elements.
+
+        Same as :func:`bisect.bisect_left`, the vector must be sorted.
+        """
+        lo, hi = self._bisect_range(lo, hi)
+        value = self._search_value(LT, value)
+        if lo >= hi:
+            return lo
+        if isinstance(value, bool):  # below or above all the elements
+            return hi if value else lo
+        return self.vector_lower_bound(self.vector, lo, hi, value)
+
+    def bisect_right(self, value, lo=0, hi=None):
+        """Position to insert `value` after any equal elements.
+
+        Same as :func:`bisect.bisect_right`, the vector must be sorted.
+        """
+        lo, hi = self._bisect_range(lo, hi)
+        value = self._search_value(LE, value)
+        if lo >= hi:
+            return lo
+        if isinstance(value, bool):
+            return hi if value else lo
+        return self.vector_upper_bound(self.vector, lo, hi, value)
+
+    bisect = upper_bound = bisect_right
+    lower_bound = bisect_left
+
+    def insort_left(self, value, lo=0, hi=None):
+        """Insert `value` keeping the vector sorted, before any equal ones"""
+        self._check_element(value)
+        position = min(self.bisect_left(value, lo, hi), len(self))
+        self.vector_insert(self.vector, position, value)
+
+    def insort_right(self, value, lo=0, hi=None):
+        """Insert `value` keeping the vector sorted, after any equal ones"""
+        self._check_element(value)
+        position = min(self.bisect_right(value, lo, hi), len(self))
+        self.vector_insert(self.vector, position, value)
+
+    insort = insort_right
+
+    def searchsorted(self, values, side='left', out=None):
+        """Find the insertion positions of many values with a single C call.
+
+        Like `numpy.searchsorted`, the vector must be sorted. Positions are
+        found with a single merge-style walk when `values` are sorted too.
+
+        :param values: Values to look for, as accepted by :meth:`extend`.
+        :param side: `'left'` for the positions given by :meth:`bisect_left`
+         or `'right'` for the ones by :meth:`bisect_right`.
+        :param out: :class:`VectorLong`, which is resized to fit, or writable
+         buffer of C `long` to write the positions into instead of a new
+         :class:`VectorLong`.
+        :returns: `out` or the new vector.
+        """
+        if side not in ('left', 'right'):
+            raise ValueError(u"side must be 'left' or 'right'")
+
+        below, above, convert = [], [], None
+        if self.value_type._type_ not in FLOATING_TYPES:
+            convert = partial(self._as_keys, side == 'right', below, above)
+
+        values, size = self._as_buffer(values, convert=convert)
+        if out is None:
+            out = VectorLong()
+        positions = _as_output(out, size, c_long)
+
+        if size:
+            self.vector_searchsorted(self.vector, values, size, side == 'right',
+                                     positions)
+        for index in below:
+            positions[index] = 0
+        for index in above:
+            positions[index] = len(self)
+        return out
+
+    def union(self, other, out=None):
+        """Elements in any of two sorted vectors, in a new sorted vector.
+
+        Elements repeated `m` times in one and `n` times in the other appear
+        `max(m, n)` times, like with `std::set_union`.
+
+        :param other: Sorted vector, or anything accepted by :meth:`extend`.
+        :param out: Vector of the same type to write the result into, which
+         can be any of the operands, instead of a new one.
+        :returns: `out` or the new vector.
+        """
+        return self._set_operation(UNION, other, out)
+
+    def intersection(self, other, out=None):
+        """Elements in both sorted vectors, `min(m, n)` times. See :meth:`union`"""
+        return self._set_operation(INTERSECTION, other, out)
+
+    def difference(self, other, out=None):
+        """Elements in this sorted vector and not in `other`, `max(m - n, 0)`
+        times. See :meth:`union`"""
+        return self._set_operation(DIFFERENCE, other, out)
+
+    def symmetric_difference(self, other, out=None):
+        """Elements in just one of the sorted vectors, `|m - n|` times. See
+        :meth:`union`"""
+        return self._set_operation(SYMMETRIC_DIFFERENCE, other, out)
+
+    def merge(self, other, out=None):
+        """All the elements of both sorted vectors, `m + n` times, ones in
+        this vector first among equal ones. See :meth:`union`"""
+        return self._set_operation(MERGE, other, out)
+
+    def includes(self, other):
+        """Whether all elements of sorted `other` are in this sorted vector,
+        as many times as they are repeated in `other`"""
+        values, size = self._as_buffer(other)
+        return bool(self.vector_includes(self.vector_data(self.vector), len(self),
+                                         values, size))
+
+    @classmethod
+    def merge_many(cls, vectors, out=None):
+        """Merge any number of sorted vectors with a single C call.
+
+        :param vectors: Sorted vectors of this type, or anything accepted
+         by :meth:`extend`. Equal elements keep the order of `vectors`.
+        :param out: Vector of this type to write the result into, which can
+         be any of `vectors`, instead of a new one.
+        :returns: `out` or the new vector.
+        """
+        vectors = [vector if isinstance(vector, cls) else cls(vector)
+                   for vector in vectors]
+        out = cls._set_output(out)
+
+        count = len(vectors)
+        cls.vector_merge_many(
+            (c_void_p * count)(*[v.vector_data(v.vector) for v in vectors]),
+            (c_size_t * count)(*[len(v) for v in vectors]), count, out.vector)
+        out.sorted = out.track_sorted
+        return out
+
+    def unique(self, keep_order=False):
+        """Distinct elements, with a single C call.
+
+        :param keep_order: Keep the first occurrence of every element, in
+         the order of the vector, using a hash set instead of sorting.
+        :returns: New vector, sorted unless `keep_order`.
+        """
+        unique = type(self)(ref=self.vector_unique(self.vector, keep_order),
+                            managed=True, track_sorted=self.track_sorted)
+        unique.sorted = self.track_sorted and (self.sorted or not keep_order)
+        return unique
+
+    def value_counts(self):
+        """Distinct elements and the number of times each one appears.
+
+        :returns: `(values, counts)`, a sorted vector of this type and a
+         :class:`VectorLong` of the same size.
+        """
+        values, counts = type(self)(), VectorLong()
+        self.vector_value_counts(self.vector, values.vector, counts.vector)
+        return values, counts
+
+    def bincount(self, minlength=0):
+        """Count the occurrences of every integer from 0 to the largest one.
+
+        :param minlength: Minimum number of counts to return.
+        :returns: :class:`VectorLong` with the count of every integer at its
+         position. `ValueError` is raised for negative elements, and
+         `MemoryError` if there is no room for the counts.
+        """
+        if self.value_type._type_ in FLOATING_TYPES:
+            raise TypeError(u'cannot count floating point values into bins')
+        if minlength < 0:
+            raise ValueError(u'minlength must be non negative')
+
+        counts = VectorLong()
+        status = self.vector_bincount(self.vector, minlength, counts.vector)
+        if status == OUT_OF_RANGE:
+            raise ValueError(u'cannot count negative or too large values into bins')
+        if status == NO_MEMORY:
+            raise MemoryError(u'cannot allocate the counts of the bins')
+        return counts
+
+    def histogram(self, bins=10, range=None):
+        """Count the elements into bins, like `numpy.histogram`.
+
+        :param bins: Number of bins of the same width, or their edges as an
+         increasing sequence. All bins but the last one are half open.
+        :param range: `(min, max)` range of the bins of the same width,
+         which defaults to the smallest and largest elements. Elements out
+         of the bins are not counted.
+        :returns: `(counts, edges)`, a :class:`VectorLong` and a
+         :class:`VectorDouble` with one more element.
+        """
+        try:
+            count = operator.index(bins)
+        except TypeError:
+            edges, uniform = VectorDouble(bins), False
+            if len(edges) < 2 or not edges.is_sorted():
+                raise ValueError(u'bins must be at least two increasing edges')
+        else:
+            if count < 1:
+                raise ValueError(u'bins must be positive')
+            if range is None:
+                range = self.minmax() if len(self) else (0, 1)
+            first, last = float(range[0]), float(range[1])
+            if first > last:
+                raise ValueError(u'max must be larger than min in range')
+            if first == last:
+                first, last = first - 0.5, last + 0.5
+            edges = VectorDouble([first + (last - first) * bin / count
+                                  for bin in xrange(count)] + [last])
+            uniform = True
+
+        counts = VectorLong()
+        counts.resize(len(edges) - 1)
+        self.vector_histogram(self.vector, edges.vector_data(edges.vector),
+                              len(counts), uniform, counts.vector_data(counts.vector))
+        return counts, edges
 
     def reverse(self):
+        self.sorted = False
         self.vector_reverse(self.vector)
 
-    def _resolve_negative_index(self, index, size):
-        return index if index >= 0 else size + index
+    def operate(self, operation, other, reflected=False, out=None):
+        """Apply an arithmetic operation elementwise with a single C call.
+
+        This is what the arithmetic operators do, `vector + other` being
+        `vector.operate(ADD, other)`. Integers wrap around on overflow like
+        in C, while divisions and modulo round like in python.
+
+        :param operation: One of the operations in :mod:`pystl.backend`.
+        :param other: Vector of the same type and size, or a scalar.
+        :param reflected: Use `other` as the left operand.
+        :param out: Vector of the same type to write the results into, which
+         can be this one, instead of a new one.
+        :returns: `out` or the new vector, or `NotImplemented` for operands
+         which are not supported.
+        """
+        if operation in BITWISE_OPERATIONS and \
+                self.value_type._type_ in FLOATING_TYPES:
+            return NotImplemented
+
+        operand = self._operand(other)
+        if operand is None:
+            return NotImplemented
+        operands, right = operand
+        size, left = len(self), self.vector_data(self.vector)
+
+        if reflected:
+            left, right = right, left
+            operands = LEFT_SCALAR if operands == RIGHT_SCALAR else operands
+
+        if out is None:
+            out = type(self)()
+        elif out.value_type is not self.value_type:
+            raise TypeError(u'out must be a vector of {}'
+                            .format(self.value_type.__name__))
+        if len(out) != size:
+            out.resize(size)
+        out.sorted = False
+
+        status = self.vector_operate(operation, operands, left, right,
+                                     out.vector_data(out.vector), size)
+        _check_operation(status)
+        return out
+
+    def compare(self, comparison, other):
+        """Compare elementwise with a single C call.
+
+        This is what the ordering operators do, `vector < other` being
+        `vector.compare(LT, other)`, also available as `vector.lt(other)`.
+        `==` and `!=` compare whole vectors instead, so elementwise equality
+        is only available as :meth:`eq` and :meth:`ne`.
+
+        :param comparison: One of the comparisons in :mod:`pystl.backend`.
+        :param other: Vector of the same type and size, or a scalar, which
+         is compared by its value even if the elements cannot hold it.
+        :returns: A new :class:`Mask`.
+        """
+        size, mask = len(self), Mask()
+        if self.value_type._type_ not in FLOATING_TYPES and isinstance(other, numbers.Real):
+            result = _integer_comparison(self.value_type, comparison, other)
+            if isinstance(result, bool):
+                mask.resize(size, int(result))
+                return mask
+            comparison, other = result
+
+        operand = self._operand(other)
+        if operand is None:
+            raise TypeError(u'cannot compare {} with {}'.format(
+                type(self).__name__, type(other).__name__))
+        operands, right = operand
+
+        mask.resize(size)
+        self.vector_compare(comparison, operands, self.vector_data(self.vector),
+                            right, mask.vector_data(mask.vector), size)
+        return mask
+
+    def filter(self, mask):
+        """Copy the elements selected by `mask` with a single C call.
+
+        :param mask: :class:`Mask` of the same size, or anything accepted by
+         :meth:`extend` as bytes or booleans.
+        :returns: New vector with the selected elements, in order.
+        """
+        values, size = self._as_buffer(mask, c_uint8)
+        if size != len(self):
+            raise ValueError(u'mask of size {} does not match vector of size {}'
+                             .format(size, len(self)))
+
+        filtered = type(self)(ref=self.vector_filter(self.vector, values),
+                              managed=True, track_sorted=self.track_sorted)
+        filtered.sorted = self.sorted
+        return filtered
+
+    def take(self, indices):
+        """Copy the elements at `indices` with a single C call.
+
+        :param indices: :class:`VectorLong`, or anything accepted by
+         :meth:`extend` as C `long`, with indexes which can be negative like
+         in lists. `IndexError` is raised if any is out of range.
+        :returns: New vector with the elements in the order of `indices`.
+        """
+        indices, count = self._as_buffer(indices, c_long, self._as_indices)
+        taken = type(self)()
+        taken.resize(count)
+
+        if self.vector_take(self.vector, indices, count,
+                            taken.vector_data(taken.vector)) == OUT_OF_RANGE:
+            raise IndexError(u'vector index out of range')
+        return taken
+
+    def put(self, indices, values):
+        """Set the elements at `indices` with a single C call.
+
+        :param indices: Indexes as accepted by :meth:`take`. Nothing is set if
+         any is out of range, and the last value wins for repeated ones.
+        :param values: A scalar for all of them, or one value per index as
+         accepted by :meth:`extend`.
+        """
+        indices, count = self._as_buffer(indices, c_long, self._as_indices)
+        try:
+            values, size = (self.value_type * 1)(values), 1
+        except TypeError:
+            values, size = self._as_buffer(values)
+            if size != count:
+                raise ValueError(u'cannot put {} values into {} indices'
+                                 .format(size, count))
+
+        self.sorted = False
+        if self.vector_put(self.vector, indices, count, values, size) == OUT_OF_RANGE:
+            raise IndexError(u'vector index out of range')
+
+    def lazy(self):
+        """Start a lazy arithmetic expression on the vector.
+
+        Operators on the result build an expression which is computed in a
+        single pass only when needed. See :mod:`pystl.expression`.
+        """
+        from .expression import Operand  # which imports this module
+        return Operand(self)
 
-    def _check_index_boundaries(self, index, size):
-        if index < 0 or index >= size:
-            raise IndexError(u'Vector index {} out of range'.format(index))
+    def sum(self, wide=False):
+        """Add up all the elements with a single C call.
 
-    def _index(self, index):
+        :param wide: Add up integers in 128 bits instead of in the vector
+         type, where the sum wraps around on overflow like in C, and floating
+         point values in `long double` instead of `double`.
+        """
+        high, low, real = self.vector_sum(self.vector, wide)
+        if self.value_type._type_ in FLOATING_TYPES:
+            return real
+        return int((high << 64) | low)
+
+    def mean(self):
+        """Arithmetic mean of the elements, exact sum included"""
         size = len(self)
-        index = self._resolve_negative_index(index, size)
-        self._check_index_boundaries(index, size)
-        return index
+        if not size:
+            raise ValueError(u'mean of empty vector')
+        return self.sum(wide=True) / float(size)
+
+    def min(self):
+        """Smallest element, raising `ValueError` if empty"""
+        return self.vector_min(self.vector)
+
+    def max(self):
+        """Largest element, raising `ValueError` if empty"""
+        return self.vector_max(self.vector)
+
+    def minmax(self):
+        """Smallest and largest elements in a single pass, as a `tuple`"""
+        return self.vector_minmax(self.vector)
+
+    def argmin(self):
+        """Position of the first smallest element"""
+        return int(self.vector_argmin(self.vector))
+
+    def argmax(self):
+        """Position of the first largest element"""
+        return int(self.vector_argmax(self.vector))
+
+    def _operand(self, other):
+        """Get the `(operands, right)` C arguments of an elementwise operation
+        with `other`, or `None` if it is not supported"""
+        if isinstance(other, Vector):
+            if other.value_type is not self.value_type:
+                return None
+            if len(other) != len(self):
+                raise ValueError(u'operands could not be broadcast together '
+                                 u'with sizes {} and {}'.format(len(self), len(other)))
+            return BOTH_VECTORS, other.vector_data(other.vector)
+
+        try:
+            return RIGHT_SCALAR, (self.value_type * 1)(other)
+        except TypeError:
+            return None
+
+    def _set_operation(self, operation, other, out):
+        """Apply an operation over sorted vectors. See :meth:`union`"""
+        values, size = self._as_buffer(other)
+        out = self._set_output(out)
+
+        self.vector_set_operation(operation, self.vector_data(self.vector),
+                                  len(self), values, size, out.vector)
+        out.sorted = out.track_sorted
+        return out
+
+    @classmethod
+    def _set_output(cls, out):
+        """Check the `out` vector of operations over sorted vectors"""
+        if out is None:
+            return cls()
+        if not isinstance(out, Vector) or out.value_type is not cls.value_type:
+            raise TypeError(u'out must be a vector of {}'
+                            .format(cls.value_type.__name__))
+        return out
+
+    def _setslice(self, sliced, collection):
+        """Replace the elements selected by a `slice` with a single C call"""
+        start, stop, step = sliced.indices(len(self))
+        values, size = self._as_buffer(collection)
+
+        if step == 1:
+            self.vector_replace(self.vector, start, max(start, stop), values, size)
+            return
+
+        length = len(xrange(start, stop, step))
+        if size != length:
+            raise ValueError(u'attempt to assign sequence of size {} to extended '
+                             u'slice of size {}'.format(size, length))
+        if size:
+            self.vector_assign_strided(self.vector, start, step, values, size)
+
+    def _search_value(self, comparison, value):
+        """Get `value` as an element to search for elements `comparison` it,
+        or whether all of them are when it is out of the range of integers.
+        See :func:`_integer_comparison`"""
+        if self.value_type._type_ in FLOATING_TYPES or not isinstance(value, numbers.Real):
+            return value
+        result = _integer_comparison(self.value_type, comparison, value)
+        return result if isinstance(result, bool) else int(result[1])
+
+    def _check_element(self, value):
+        """Raise `OverflowError` for integers the elements cannot hold, which
+        would be stored wrapped around"""
+        if self.value_type._type_ in FLOATING_TYPES or not isinstance(value, numbers.Integral):
+            return
+        lowest, highest = _limits(self.value_type)
+        if not lowest <= value <= highest:
+            raise OverflowError(u'{} does not fit in {}'.format(value, type(self).__name__))
+
+    def _bisect_range(self, lo, hi):
+        """Clip `hi` of the `[lo, hi)` range of a binary search to the
+        vector. Empty ranges, with `lo >= hi`, give `lo` as `bisect` does"""
+        if lo < 0:
+            raise ValueError(u'lo must be non-negative')
+        size = len(self)
+        hi = size if hi is None else min(hi, size)
+        return lo, hi
+
+    def _values(self):
+        """Get a ctypes array on the current vector storage"""
+        size = len(self)
+        array_type = self.value_type * size
+        if size:
+            values = array_type.from_address(self.vector_data(self.vector))
+        else:
+            values = array_type()
+        values.vector = self  # keep the storage alive along the array
+        return values
+
+    def _as_buffer(self, collection, value_type=None, convert=None):
+        """Get a `(pointer, size)` pair with `collection` as C values of
+        `value_type`, by default the vector one. Collections which are not
+        buffers of them already are converted with `convert(collection,
+        value_type)`, by default :meth:`_as_array`"""
+        value_type = value_type or self.value_type
+        convert = convert or self._as_array
+
+        if isinstance(collection, Vector) and collection.value_type is value_type:
+            return collection.vector_data(collection.vector), len(collection)
+
+        if isinstance(collection, array):
+            if collection.typecode == value_type._type_ and \
+                    collection.itemsize == sizeof(value_type):
+                return collection.buffer_info()
+            return convert(collection, value_type)
+
+        try:
+            view = memoryview(collection)
+        except TypeError:
+            return convert(collection, value_type)
+
+        format = view.format.lstrip(NATIVE_ORDER)
+        if format == value_type._type_ and view.itemsize == sizeof(value_type):
+            size = _nbytes(view) // sizeof(value_type)
+        elif format in BYTE_FORMATS:
+            size, remainder = divmod(_nbytes(view), sizeof(value_type))
+            if remainder:
+                raise ValueError(u'buffer size must be a multiple of {}'
+                                 .format(sizeof(value_type)))
+        else:
+            return convert(view.tolist(), value_type)
+
+        buffer_type = value_type * size
+        try:
+            return buffer_type.from_buffer(collection), size
+        except (TypeError, BufferError):
+            pass  # read only or not contiguous
+        try:
+            return buffer_type.from_buffer_copy(collection), size
+        except (TypeError, BufferError):
+            return buffer_type.from_buffer_copy(view.tobytes()), size
+
+    def _as_array(self, collection, value_type=None):
+        """Copy any iterable into a new C array of `value_type`"""
+        if not isinstance(collection, (list, tuple)):
+            collection = list(collection)
+
+        values = ((value_type or self.value_type) * len(collection))()
+        values[:] = collection
+        return values, len(collection)
+
+    def _as_indices(self, indices, value_type):
+        """Convert indexes like :meth:`_as_array`, raising `IndexError` for
+        the ones which do not fit in `value_type`, instead of wrapping them
+        around into valid ones"""
+        indices = indices if isinstance(indices, (list, tuple)) else list(indices)
+        lowest, highest = _limits(value_type)
+        if indices and not (lowest <= min(indices) and max(indices) <= highest):
+            raise IndexError(u'vector index out of range')
+        return self._as_array(indices, value_type)
+
+    def _as_keys(self, right, below, above, keys, value_type):
+        """Convert the keys of a search over integers like :meth:`_as_array`,
+        turning the ones which the elements cannot hold into ones giving the
+        same positions, as :meth:`bisect_left`, or :meth:`bisect_right` if
+        `right`, do. The positions of the keys below and above all of them
+        are appended to `below` and `above`, as they are not searched."""
+        keys = keys if isinstance(keys, (list, tuple)) else list(keys)
+        lowest, highest = _limits(self.value_type)
+        if keys and lowest <= min(keys) and max(keys) <= highest:
+            try:
+                return self._as_array(keys, value_type)
+            except TypeError:
+                pass  # floating point keys
+
+        comparison, converted = LE if right else LT, []
+        for index, key in enumerate(keys):
+            if isinstance(key, numbers.Real):
+                key = self._search_value(comparison, key)
+            if key is True:
+                above.append(index)
+                key = highest
+            elif key is False:
+                below.append(index)
+                key = lowest
+            converted.append(key)
+        return self._as_array(converted, value_type)
+
+    def _resolve_negative_index(self, index, size):
+        return index if index >= 0 else size + index
 
     def _init_slice(self, sliced, size):
         """Get (start, stop, step) from a python sliced object"""
@@ -278,150 +1366,103 @@ class Vector(object):
 
         return start, stop, step
 
-    def _resolve_slice(self, sliced, size):
-        """Compute indexes [begin, end) for a range python call"""
-        start, stop, step = self._init_slice(sliced, size)
-
-        # assure boundaries
-        # corner case for start: range(size, x) --> index error
-        # corner case for stop: range(x, size) --> missing last value
-        start = max(0, min(start, size - 1))
-        stop = max(-1, min(stop, size))
-
-        return start, stop, step
-
-    def _getslice(self, sliced):
-        size = len(self)
-
-        if size == 0:
-            return []
-
-        start, stop, step = self._resolve_slice(sliced, size)
-
-        return xrange(start, stop, step)
 
+def _as_output(out, size, value_type):
+    """Get a ctypes array of `size` elements on the storage of `out`.
 
-class VectorInt(Vector):
+    Vectors are resized to `size` and other objects must be writable buffers
+    with room for them.
+    """
+    if isinstance(out, Vector):
+        if out.value_type is not value_type:
+            raise TypeError(u'out must be a vector of {}'.format(value_type.__name__))
+        out.resize(size)
+        return out._values()
 
-    vector_new = lib.py_vector_int_new
-    vector_new.restype = c_void_p
-    vector_new.argtypes = []
+    itemsize = out.itemsize if isinstance(out, array) else memoryview(out).itemsize
+    if itemsize != sizeof(value_type):
+        raise TypeError(u'out must be a buffer of {}'.format(value_type.__name__))
+    return (value_type * size).from_buffer(out)
 
-    vector_delete = lib.py_vector_int_delete
-    vector_delete.restype = None
-    vector_delete.argtypes = [c_void_p]
 
-    vector_size = lib.py_vector_int_size
-    vector_size.restype = c_size_t
-    vector_size.argtypes = [c_void_p]
+class VectorIterator(object):
+    """Iterable over the elements of a vector, copied out in chunks.
 
-    vector_at = lib.py_vector_int_at
-    vector_at.restype = c_int
-    vector_at.argtypes = [c_void_p, c_size_t]
+    Every chunk of `chunk_size` elements is read with a single copy from
+    the vector storage, instead of the two C calls per element that going
+    through `__getitem__` would cost.
 
-    vector_set = lib.py_vector_int_set
-    vector_set.restype = None
-    vector_set.argtypes = [c_void_p, c_size_t, c_int]
+    Changing the vector size while iterating raises `RuntimeError`, which is
+    checked every time a new chunk is read.
+    """
 
-    vector_push_back = lib.py_vector_int_push_back
-    vector_push_back.restype = None
-    vector_push_back.argtypes = [c_void_p, c_int]
+    #: default number of elements read at once
+    chunk_size = 4096
 
-    vector_insert = lib.py_vector_int_insert
-    vector_insert.restype = None
-    vector_insert.argtypes = [c_void_p, c_size_t, c_int]
+    def __init__(self, vector, chunk_size=None):
+        self.vector = vector
+        self.chunk_size = chunk_size or self.chunk_size
 
-    vector_erase = lib.py_vector_int_erase
-    vector_erase.restype = None
-    vector_erase.argtypes = [c_void_p, c_size_t]
-
-    vector_erase_slice = lib.py_vector_int_erase_slice
-    vector_erase_slice.restype = None
-    vector_erase_slice.argtypes = [c_void_p, c_size_t, c_size_t]
-
-    vector_find = lib.py_vector_int_find
-    vector_find.restype = c_int
-    vector_find.argtypes = [c_void_p, c_int]
-
-    vector_pop_back = lib.py_vector_int_pop_back
-    vector_pop_back.restype = c_int
-    vector_pop_back.argtypes = [c_void_p]
-
-    vector_count = lib.py_vector_int_count
-    vector_count.restype = c_int
-    vector_count.argtypes = [c_void_p, c_int]
-
-    vector_sort = lib.py_vector_int_sort
-    vector_sort.restype = c_void_p
-    vector_sort.argtypes = [c_void_p]
-
-    vector_reverse = lib.py_vector_int_reverse
-    vector_reverse.restype = c_void_p
-    vector_reverse.argtypes = [c_void_p]
-
-    vector_equal = lib.py_vector_int_equal
-    vector_equal.restype = c_int
-    vector_equal.argtypes = [c_void_p, c_void_p]
+    def __iter__(self):
+        return chain.from_iterable(self.chunks())
 
+    def chunks(self):
+        """Generate lists with the vector elements, `chunk_size` at a time"""
+        vector = self.vector
+        value_type, itemsize = vector.value_type, sizeof(vector.value_type)
+        size = len(vector)
 
-class VectorLong(Vector):
+        for start in xrange(0, size, self.chunk_size):
+            if len(vector) != size:
+                raise RuntimeError(u'vector changed size during iteration')
 
-    vector_new = lib.py_vector_long_new
-    vector_new.restype = c_void_p
-    vector_new.argtypes = []
+            count = min(self.chunk_size, size - start)
+            address = vector.vector_data(vector.vector) + start * itemsize
+            yield (value_type * count).from_address(address)[:]
 
-    vector_delete = lib.py_vector_long_delete
-    vector_delete.restype = None
-    vector_delete.argtypes = [c_void_p]
 
-    vector_size = lib.py_vector_long_size
-    vector_size.restype = c_size_t
-    vector_size.argtypes = [c_void_p]
+def vector_type(name, suffix, value_type, backend=None):
+    """Create a :class:`Vector` subclass for a C++ `vector<value_type>`.
 
-    vector_at = lib.py_vector_long_at
-    vector_at.restype = c_long
-    vector_at.argtypes = [c_void_p, c_size_t]
+    :param name: Name of the new class.
+    :param suffix: Name of the type in the C interface, which must have
+     been instantiated with `PY_VECTOR_DEFINE(suffix, T)`.
+    :param value_type: ctypes type of the elements.
+    :param backend: :mod:`pystl.backend` backend to call the C interface
+     through. Defaults to the fastest available one.
+    """
+    backend = backend or backends.backend
 
-    vector_set = lib.py_vector_long_set
-    vector_set.restype = None
-    vector_set.argtypes = [c_void_p, c_size_t, c_long]
+    attributes = backend.bind(suffix, value_type)
+    attributes['value_type'] = value_type
 
-    vector_push_back = lib.py_vector_long_push_back
-    vector_push_back.restype = None
-    vector_push_back.argtypes = [c_void_p, c_long]
+    return type(name, (Vector,), attributes)
 
-    vector_insert = lib.py_vector_long_insert
-    vector_insert.restype = None
-    vector_insert.argtypes = [c_void_p, c_size_t, c_long]
 
-    vector_erase = lib.py_vector_long_erase
-    vector_erase.restype = None
-    vector_erase.argtypes = [c_void_p, c_size_t]
+VectorInt = vector_type('VectorInt', 'int', c_int)
+VectorLong = vector_type('VectorLong', 'long', c_long)
 
-    vector_erase_slice = lib.py_vector_long_erase_slice
-    vector_erase_slice.restype = None
-    vector_erase_slice.argtypes = [c_void_p, c_size_t, c_size_t]
+VectorInt8 = vector_type('VectorInt8', 'int8', c_int8)
+VectorInt16 = vector_type('VectorInt16', 'int16', c_int16)
+VectorInt32 = vector_type('VectorInt32', 'int32', c_int32)
+VectorInt64 = vector_type('VectorInt64', 'int64', c_int64)
 
-    vector_find = lib.py_vector_long_find
-    vector_find.restype = c_int
-    vector_find.argtypes = [c_void_p, c_long]
+VectorUInt8 = vector_type('VectorUInt8', 'uint8', c_uint8)
+VectorUInt16 = vector_type('VectorUInt16', 'uint16', c_uint16)
+VectorUInt32 = vector_type('VectorUInt32', 'uint32', c_uint32)
+VectorUInt64 = vector_type('VectorUInt64', 'uint64', c_uint64)
 
-    vector_pop_back = lib.py_vector_long_pop_back
-    vector_pop_back.restype = c_long
-    vector_pop_back.argtypes = [c_void_p]
+VectorFloat = vector_type('VectorFloat', 'float', c_float)
+VectorDouble = vector_type('VectorDouble', 'double', c_double)
 
-    vector_count = lib.py_vector_long_count
-    vector_count.restype = c_size_t
-    vector_count.argtypes = [c_void_p, c_long]
 
-    vector_sort = lib.py_vector_long_sort
-    vector_sort.restype = c_void_p
-    vector_sort.argtypes = [c_void_p]
+class Mask(VectorUInt8):
+    """Vector of 1 and 0 for the elements of another one which are selected
+    or not, as given by comparisons.
 
-    vector_reverse = lib.py_vector_long_reverse
-    vector_reverse.restype = c_void_p
-    vector_reverse.argtypes = [c_void_p]
+    Vectors indexed with a mask give their selected elements. Masks are
+    combined with `&`, `|` and `^`, and inverted with `~`.
+    """
 
-    vector_equal = lib.py_vector_long_equal
-    vector_equal.restype = c_int
-    vector_equal.argtypes = [c_void_p, c_void_p]
+    def __invert__(self):
+        return self ^ 1
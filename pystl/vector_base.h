@@ -3,10 +3,127 @@
 
 #include <vector>
 #include <algorithm>
+#include <array>
+#include <functional>
+#include <cmath>
+#include <cstdint>
+#include <exception>
+#include <numeric>
+#include <type_traits>
+#include <mutex>
+#include <unordered_set>
+#include <stdint.h>
+
+#include "parallel.h"
 
 using namespace std;
 
 
+// Status codes of the checked accessors
+enum {
+    PY_VECTOR_OK = 0,
+    PY_VECTOR_OUT_OF_RANGE = -1,
+    PY_VECTOR_EMPTY = -2,
+    PY_VECTOR_ZERO_DIVISION = -3,
+    PY_VECTOR_NEGATIVE_SHIFT = -4,
+    PY_VECTOR_UNSUPPORTED = -5,
+    PY_VECTOR_NO_MEMORY = -6
+};
+
+// Vectors on storage which they do not own, such as memory maps. Their
+// storage is never freed nor reallocated: they move to storage of their own
+// before growing beyond it, see `py_vector_own`.
+struct py_vector_foreign_registry {
+    unordered_set<const void *> vectors;
+    atomic<size_t> size;  // to skip the lock for the usual empty registry
+    mutex lock;
+
+    py_vector_foreign_registry() : size(0) {}
+};
+
+inline py_vector_foreign_registry & py_vector_foreign() {
+    static py_vector_foreign_registry registry;
+    return registry;
+}
+
+inline bool py_vector_is_foreign(const void * pvector) {
+    py_vector_foreign_registry & registry = py_vector_foreign();
+    if( !registry.size )
+        return false;
+    lock_guard<mutex> lock(registry.lock);
+    return registry.vectors.count(pvector) > 0;
+}
+
+// The three pointers of a `std::vector` in libstdc++ and libc++
+template <typename T>
+struct py_vector_layout {
+    T * begin;
+    T * end;
+    T * end_of_storage;
+};
+
+// Leave the vector empty, forgetting its foreign storage or freeing its own
+template <typename T>
+void py_vector_release(vector<T> * pvector) {
+    if( py_vector_is_foreign(pvector) ) {
+        py_vector_foreign_registry & registry = py_vector_foreign();
+        {
+            lock_guard<mutex> lock(registry.lock);
+            registry.vectors.erase(pvector);
+            registry.size = registry.vectors.size();
+        }
+        py_vector_layout<T> * layout = reinterpret_cast<py_vector_layout<T> *>(pvector);
+        layout->begin = layout->end = layout->end_of_storage = NULL;
+    } else {
+        vector<T>().swap(*pvector);
+    }
+}
+
+// Point the vector to the foreign storage of `capacity` elements at `data`,
+// of which the first `size` are in use, without copying them. It fails with
+// `PY_VECTOR_UNSUPPORTED` if vectors are laid out otherwise.
+template <typename T>
+int py_vector_adopt(vector<T> * pvector, T * data, size_t size, size_t capacity) {
+    static_assert(sizeof(vector<T>) == sizeof(py_vector_layout<T>), "unknown vector layout");
+    py_vector_release(pvector);
+
+    py_vector_layout<T> * layout = reinterpret_cast<py_vector_layout<T> *>(pvector);
+    layout->begin = data;
+    layout->end = data + size;
+    layout->end_of_storage = data + capacity;
+    if( pvector->data() != data || pvector->size() != size || pvector->capacity() != capacity ) {
+        layout->begin = layout->end = layout->end_of_storage = NULL;
+        return PY_VECTOR_UNSUPPORTED;
+    }
+
+    py_vector_foreign_registry & registry = py_vector_foreign();
+    lock_guard<mutex> lock(registry.lock);
+    registry.vectors.insert(pvector);
+    registry.size = registry.vectors.size();
+    return PY_VECTOR_OK;
+}
+
+// Move a vector on foreign storage to storage of its own before it needs
+// room for more than `capacity` elements, which would reallocate it
+template <typename T>
+void py_vector_own(vector<T> * pvector, size_t capacity) {
+    if( capacity <= pvector->capacity() || !py_vector_is_foreign(pvector) )
+        return;
+
+    vector<T> own;
+    own.reserve(max(capacity, 2 * pvector->size()));
+    own.assign(pvector->begin(), pvector->end());
+    py_vector_release(pvector);
+    pvector->swap(own);
+}
+
+// Replace the elements of the vector with the ones of `other`, taking its storage
+template <typename T>
+void py_vector_take_storage(vector<T> * pvector, vector<T> & other) {
+    py_vector_release(pvector);
+    pvector->swap(other);
+}
+
 template <typename T>
 static vector<T> * py_vector_new() {
 	return new vector<T>;
@@ -14,7 +131,9 @@ static vector<T> * py_vector_new() {
 
 template <typename T>
 static void py_vector_delete(vector<T> * pvector) {
-	delete pvector;
+    if( py_vector_is_foreign(pvector) )
+        py_vector_release(pvector);
+    delete pvector;
 }
 
 template <typename T>
@@ -22,6 +141,39 @@ static size_t py_vector_size(vector<T> * pvector){
 	return pvector->size();
 }
 
+template <typename T>
+static size_t py_vector_capacity(vector<T> * pvector){
+	return pvector->capacity();
+}
+
+template <typename T>
+int py_vector_reserve(vector<T> * pvector, size_t capacity) {
+    try {
+        py_vector_own(pvector, capacity);
+        pvector->reserve(capacity);
+    } catch( const exception & ) {  // bad_alloc or length_error
+        return -1;
+    }
+    return 0;
+}
+
+template <typename T>
+void py_vector_shrink_to_fit(vector<T> * pvector) {
+    if( !py_vector_is_foreign(pvector) )
+        pvector->shrink_to_fit();
+}
+
+template <typename T>
+int py_vector_resize(vector<T> * pvector, size_t size, T fill) {
+    try {
+        py_vector_own(pvector, size);
+        pvector->resize(size, fill);
+    } catch( const exception & ) {  // bad_alloc or length_error
+        return -1;
+    }
+    return 0;
+}
+
 template <typename T>
 static T py_vector_at(vector<T> * pvector, size_t index) {
 	return pvector->at(index);
@@ -34,11 +186,727 @@ static void py_vector_set(vector<T> * pvector, size_t index, T value) {
 
 template <typename T>
 void py_vector_push_back(vector<T> * pvector, T number) {
+    py_vector_own(pvector, pvector->size() + 1);
 	pvector->push_back(number);
 }
 
+// Resolve a python index, negative ones counting from the back, into
+// `position`. Returns false if it falls out of [0, size).
+template <typename T>
+bool py_vector_resolve_index(vector<T> * pvector, ptrdiff_t index, size_t & position) {
+    ptrdiff_t size = pvector->size();
+    if( index < 0 )
+        index += size;
+    if( index < 0 || index >= size )
+        return false;
+    position = index;
+    return true;
+}
+
+template <typename T>
+int py_vector_checked_at(vector<T> * pvector, ptrdiff_t index, T * value) {
+    size_t position;
+    if( !py_vector_resolve_index(pvector, index, position) )
+        return PY_VECTOR_OUT_OF_RANGE;
+    *value = (*pvector)[position];
+    return PY_VECTOR_OK;
+}
+
+template <typename T>
+int py_vector_checked_set(vector<T> * pvector, ptrdiff_t index, T value) {
+    size_t position;
+    if( !py_vector_resolve_index(pvector, index, position) )
+        return PY_VECTOR_OUT_OF_RANGE;
+    (*pvector)[position] = value;
+    return PY_VECTOR_OK;
+}
+
+template <typename T>
+int py_vector_checked_insert(vector<T> * pvector, ptrdiff_t index, T value) {
+    size_t position;
+    if( !py_vector_resolve_index(pvector, index, position) )
+        return PY_VECTOR_OUT_OF_RANGE;
+    py_vector_own(pvector, pvector->size() + 1);
+    pvector->insert(pvector->begin() + position, value);
+    return PY_VECTOR_OK;
+}
+
+template <typename T>
+int py_vector_checked_erase(vector<T> * pvector, ptrdiff_t index) {
+    size_t position;
+    if( !py_vector_resolve_index(pvector, index, position) )
+        return PY_VECTOR_OUT_OF_RANGE;
+    pvector->erase(pvector->begin() + position);
+    return PY_VECTOR_OK;
+}
+
+template <typename T>
+int py_vector_checked_pop(vector<T> * pvector, ptrdiff_t index, T * value) {
+    size_t position;
+    if( pvector->empty() )
+        return PY_VECTOR_EMPTY;
+    if( !py_vector_resolve_index(pvector, index, position) )
+        return PY_VECTOR_OUT_OF_RANGE;
+    *value = (*pvector)[position];
+    pvector->erase(pvector->begin() + position);
+    return PY_VECTOR_OK;
+}
+
+// Elementwise operations, like python operators
+enum {
+    PY_VECTOR_ADD = 0,
+    PY_VECTOR_SUB,
+    PY_VECTOR_MUL,
+    PY_VECTOR_FLOORDIV,
+    PY_VECTOR_MOD,
+    PY_VECTOR_AND,
+    PY_VECTOR_OR,
+    PY_VECTOR_XOR,
+    PY_VECTOR_LSHIFT,
+    PY_VECTOR_RSHIFT
+};
+
+// Operands of the elementwise operations, any of them can be a scalar
+enum {
+    PY_VECTOR_BOTH_VECTORS = 0,
+    PY_VECTOR_RIGHT_SCALAR,
+    PY_VECTOR_LEFT_SCALAR
+};
+
+template <typename T, bool = is_integral<T>::value>
+struct py_vector_arithmetic;
+
+// Integer operations wrap around like in C, but divisions round down and
+// the modulo takes the sign of the divisor like in python.
+template <typename T>
+struct py_vector_arithmetic<T, true> {
+    // unsigned, and wide enough not to be promoted to `int`
+    typedef typename conditional<sizeof(T) < sizeof(unsigned),
+            unsigned, typename make_unsigned<T>::type>::type U;
+
+    static const unsigned bits = sizeof(T) * 8;
+
+    static T add(T left, T right) { return (T)((U)left + (U)right); }
+    static T sub(T left, T right) { return (T)((U)left - (U)right); }
+    static T mul(T left, T right) { return (T)((U)left * (U)right); }
+
+    static T floordiv(T left, T right) {
+        if( right == (T)-1 && is_signed<T>::value )
+            return sub(0, left);  // the minimum value would overflow
+        T quotient = left / right;
+        if( left % right != 0 && ((left < 0) != (right < 0)) )
+            --quotient;
+        return quotient;
+    }
+
+    static T mod(T left, T right) {
+        if( right == (T)-1 && is_signed<T>::value )
+            return 0;
+        T remainder = left % right;
+        if( remainder != 0 && ((remainder < 0) != (right < 0)) )
+            remainder += right;
+        return remainder;
+    }
+
+    static T bitand_(T left, T right) { return left & right; }
+    static T bitor_(T left, T right) { return left | right; }
+    static T bitxor_(T left, T right) { return left ^ right; }
+
+    static T lshift(T left, T right) {
+        return (U)right >= bits ? 0 : (T)((U)left << right);
+    }
+
+    static T rshift(T left, T right) {
+        if( (U)right >= bits )
+            return left < 0 ? -1 : 0;
+        return left >> right;
+    }
+};
+
+// Floating point ones follow python too, and have no bitwise operations
+template <typename T>
+struct py_vector_arithmetic<T, false> {
+    static T add(T left, T right) { return left + right; }
+    static T sub(T left, T right) { return left - right; }
+    static T mul(T left, T right) { return left * right; }
+    static T floordiv(T left, T right) { return floor(left / right); }
+
+    static T mod(T left, T right) {
+        T remainder = fmod(left, right);
+        if( remainder == 0 )
+            return copysign(T(0), right);
+        if( (remainder < 0) != (right < 0) )
+            remainder += right;
+        return remainder;
+    }
+};
+
+// Apply `operation` elementwise over `size` values into `out`
+template <typename T, typename R, typename Operation>
+void py_vector_transform(const T * left, const T * right, R * out, size_t size, int operands, Operation operation) {
+    if( operands == PY_VECTOR_RIGHT_SCALAR ) {
+        const T scalar = *right;
+        for( size_t index = 0; index < size; ++index )
+            out[index] = operation(left[index], scalar);
+    }
+    else if( operands == PY_VECTOR_LEFT_SCALAR ) {
+        const T scalar = *left;
+        for( size_t index = 0; index < size; ++index )
+            out[index] = operation(scalar, right[index]);
+    }
+    else
+        for( size_t index = 0; index < size; ++index )
+            out[index] = operation(left[index], right[index]);
+}
+
+// Check the operands up front, so that nothing is written on failure
+template <typename T>
+int py_vector_check_operands(int operation, const T * right, size_t size, int operands) {
+    const T * end = right + (operands == PY_VECTOR_RIGHT_SCALAR ? 1 : size);
+
+    if( operation == PY_VECTOR_FLOORDIV || operation == PY_VECTOR_MOD )
+        if( find(right, end, T(0)) != end )
+            return PY_VECTOR_ZERO_DIVISION;
+
+    if( operation >= PY_VECTOR_AND && !is_integral<T>::value )
+        return PY_VECTOR_UNSUPPORTED;
+
+    if( operation == PY_VECTOR_LSHIFT || operation == PY_VECTOR_RSHIFT )
+        if( find_if(right, end, [](T value) { return value < T(0); }) != end )
+            return PY_VECTOR_NEGATIVE_SHIFT;
+
+    return PY_VECTOR_OK;
+}
+
+template <typename T>
+void py_vector_bitwise(int operation, const T * left, const T * right, T * out, size_t size, int operands, true_type) {
+    typedef py_vector_arithmetic<T> A;
+
+    switch( operation ) {
+    case PY_VECTOR_AND:
+        py_vector_transform(left, right, out, size, operands, [](T a, T b) { return A::bitand_(a, b); });
+        break;
+    case PY_VECTOR_OR:
+        py_vector_transform(left, right, out, size, operands, [](T a, T b) { return A::bitor_(a, b); });
+        break;
+    case PY_VECTOR_XOR:
+        py_vector_transform(left, right, out, size, operands, [](T a, T b) { return A::bitxor_(a, b); });
+        break;
+    case PY_VECTOR_LSHIFT:
+        py_vector_transform(left, right, out, size, operands, [](T a, T b) { return A::lshift(a, b); });
+        break;
+    case PY_VECTOR_RSHIFT:
+        py_vector_transform(left, right, out, size, operands, [](T a, T b) { return A::rshift(a, b); });
+        break;
+    }
+}
+
+template <typename T>
+void py_vector_bitwise(int, const T *, const T *, T *, size_t, int, false_type) {
+}
+
+// `out = left <operation> right` over `size` values, whose operands have
+// been checked already by `py_vector_check_operands`.
+template <typename T>
+void py_vector_apply(int operation, int operands, const T * left, const T * right, T * out, size_t size) {
+    typedef py_vector_arithmetic<T> A;
+
+    switch( operation ) {
+    case PY_VECTOR_ADD:
+        py_vector_transform(left, right, out, size, operands, [](T a, T b) { return A::add(a, b); });
+        break;
+    case PY_VECTOR_SUB:
+        py_vector_transform(left, right, out, size, operands, [](T a, T b) { return A::sub(a, b); });
+        break;
+    case PY_VECTOR_MUL:
+        py_vector_transform(left, right, out, size, operands, [](T a, T b) { return A::mul(a, b); });
+        break;
+    case PY_VECTOR_FLOORDIV:
+        py_vector_transform(left, right, out, size, operands, [](T a, T b) { return A::floordiv(a, b); });
+        break;
+    case PY_VECTOR_MOD:
+        py_vector_transform(left, right, out, size, operands, [](T a, T b) { return A::mod(a, b); });
+        break;
+    default:
+        py_vector_bitwise(operation, left, right, out, size, operands, is_integral<T>());
+    }
+}
+
+// `out = left <operation> right` over `size` elements, where `out` can be
+// any of the operands to operate in place. In parallel for large vectors.
+template <typename T>
+int py_vector_operate(int operation, int operands, const T * left, const T * right, T * out, size_t size) {
+    int status = py_vector_check_operands(operation, right, size, operands);
+    if( status != PY_VECTOR_OK )
+        return status;
+
+    py_vector_parallel_for(size, [&](size_t begin, size_t end) {
+        py_vector_apply(operation, operands,
+                        left + (operands == PY_VECTOR_LEFT_SCALAR ? 0 : begin),
+                        right + (operands == PY_VECTOR_RIGHT_SCALAR ? 0 : begin),
+                        out + begin, end - begin);
+    });
+    return PY_VECTOR_OK;
+}
+
+// Elementwise comparisons
+enum {
+    PY_VECTOR_EQ = 0,
+    PY_VECTOR_NE,
+    PY_VECTOR_LT,
+    PY_VECTOR_LE,
+    PY_VECTOR_GT,
+    PY_VECTOR_GE
+};
+
+// `out = left <comparison> right` as 0 or 1 over `size` elements
+template <typename T>
+void py_vector_compare(int comparison, int operands, const T * left, const T * right, uint8_t * out, size_t size) {
+    py_vector_parallel_for(size, [&](size_t begin, size_t end) {
+        const T * lefts = left + (operands == PY_VECTOR_LEFT_SCALAR ? 0 : begin);
+        const T * rights = right + (operands == PY_VECTOR_RIGHT_SCALAR ? 0 : begin);
+        uint8_t * outs = out + begin;
+        size_t count = end - begin;
+
+        switch( comparison ) {
+        case PY_VECTOR_EQ:
+            py_vector_transform(lefts, rights, outs, count, operands, [](T a, T b) { return a == b; });
+            break;
+        case PY_VECTOR_NE:
+            py_vector_transform(lefts, rights, outs, count, operands, [](T a, T b) { return a != b; });
+            break;
+        case PY_VECTOR_LT:
+            py_vector_transform(lefts, rights, outs, count, operands, [](T a, T b) { return a < b; });
+            break;
+        case PY_VECTOR_LE:
+            py_vector_transform(lefts, rights, outs, count, operands, [](T a, T b) { return a <= b; });
+            break;
+        case PY_VECTOR_GT:
+            py_vector_transform(lefts, rights, outs, count, operands, [](T a, T b) { return a > b; });
+            break;
+        case PY_VECTOR_GE:
+            py_vector_transform(lefts, rights, outs, count, operands, [](T a, T b) { return a >= b; });
+            break;
+        }
+    });
+}
+
+// Instructions of the expression programs besides the operations, which
+// are followed by the index of their operand.
+enum {
+    PY_VECTOR_PUSH_VECTOR = -1,
+    PY_VECTOR_PUSH_SCALAR = -2
+};
+
+// Number of elements evaluated at once by the expression programs, so
+// the intermediate results stay in cache.
+enum { PY_VECTOR_BLOCK_SIZE = 1024 };
+
+// Evaluate a postfix `program` for `size` elements from `begin` into `out`.
+// Operands are pointers to elements, into the inputs or the `buffers` of
+// the intermediate results, one per stack position, or to a scalar.
+template <typename T>
+int py_vector_evaluate_block(const int * program, size_t length, const T * const * vectors, const T * scalars,
+                             size_t begin, size_t size, T * out, vector< vector<T> > & buffers) {
+    vector< pair<const T *, bool> > stack;  // values and whether they are a scalar
+
+    for( size_t position = 0; position < length; ++position ) {
+        int instruction = program[position];
+
+        if( instruction == PY_VECTOR_PUSH_VECTOR )
+            stack.push_back(make_pair(vectors[program[++position]] + begin, false));
+        else if( instruction == PY_VECTOR_PUSH_SCALAR )
+            stack.push_back(make_pair(scalars + program[++position], true));
+        else {
+            pair<const T *, bool> right = stack.back();
+            stack.pop_back();
+            pair<const T *, bool> left = stack.back();
+            stack.pop_back();
+
+            int operands = left.second ? PY_VECTOR_LEFT_SCALAR :
+                right.second ? PY_VECTOR_RIGHT_SCALAR : PY_VECTOR_BOTH_VECTORS;
+            int status = py_vector_check_operands(instruction, right.first, size, operands);
+            if( status != PY_VECTOR_OK )
+                return status;
+
+            // the last result goes straight to `out`
+            if( buffers.size() <= stack.size() )
+                buffers.resize(stack.size() + 1, vector<T>(PY_VECTOR_BLOCK_SIZE));
+            T * result = position + 1 == length ? out : buffers[stack.size()].data();
+
+            py_vector_apply(instruction, operands, left.first, right.first, result, size);
+            stack.push_back(make_pair((const T *)result, false));
+        }
+    }
+
+    if( stack.back().first != out )  // a program without operations
+        copy(stack.back().first, stack.back().first + size, out);
+    return PY_VECTOR_OK;
+}
+
+// Evaluate a postfix expression `program` over the elements in
+// [offset, offset + size) of the `vectors` into `out`, in a single pass by
+// blocks, which are evaluated in parallel for large vectors.
+template <typename T>
+int py_vector_evaluate(const int * program, size_t length, const T * const * vectors, const T * scalars,
+                       size_t offset, size_t size, T * out) {
+    return py_vector_parallel_reduce<int>(size, [&](size_t begin, size_t end) {
+        vector< vector<T> > buffers;
+        for( size_t block = begin; block < end; block += PY_VECTOR_BLOCK_SIZE ) {
+            size_t count = min((size_t)PY_VECTOR_BLOCK_SIZE, end - block);
+            int status = py_vector_evaluate_block(program, length, vectors, scalars,
+                                                  offset + block, count, out + block, buffers);
+            if( status != PY_VECTOR_OK )
+                return status;
+        }
+        return (int)PY_VECTOR_OK;
+    }, [](int status, int other) {
+        return status != PY_VECTOR_OK ? status : other;
+    });
+}
+
+// Reductions, which return PY_VECTOR_EMPTY if there is nothing to reduce
+
+// Sum of the elements accumulated in `S`, in parallel for large vectors
+template <typename S, typename T>
+S py_vector_accumulate(const vector<T> * pvector) {
+    const T * values = pvector->data();
+    return py_vector_parallel_reduce<S>(pvector->size(), [&](size_t begin, size_t end) {
+        return accumulate(values + begin, values + end, (S)0);
+    }, plus<S>());
+}
+
+// Integers are summed in `T`, wrapping around like in C, or in 128 bits if
+// `wide`, and the result is split in the `high` and `low` halves.
+template <typename T>
+void py_vector_accumulate(const vector<T> * pvector, bool wide, int64_t & high, uint64_t & low, double &, false_type) {
+    typedef typename make_unsigned<T>::type U;  // which does not overflow
+    __int128 sum;
+
+    if( wide )
+        sum = py_vector_accumulate<__int128>(pvector);
+    else
+        sum = (T)py_vector_accumulate<U>(pvector);
+
+    high = (int64_t)(sum >> 64);
+    low = (uint64_t)sum;
+}
+
+// Floating point values are summed in `double`, or `long double` if `wide`
+template <typename T>
+void py_vector_accumulate(const vector<T> * pvector, bool wide, int64_t &, uint64_t &, double & real, true_type) {
+    if( wide )
+        real = py_vector_accumulate<long double>(pvector);
+    else
+        real = py_vector_accumulate<double>(pvector);
+}
+
+template <typename T>
+int py_vector_sum(vector<T> * pvector, int wide, int64_t * high, uint64_t * low, double * real) {
+    *high = 0, *low = 0, *real = 0;
+    py_vector_accumulate(pvector, wide, *high, *low, *real, is_floating_point<T>());
+    return PY_VECTOR_OK;
+}
+
+// First smallest element of a non empty vector, in parallel for large ones
+template <typename T>
+const T * py_vector_min_element(vector<T> * pvector) {
+    const T * values = pvector->data();
+    return py_vector_parallel_reduce<const T *>(pvector->size(), [&](size_t begin, size_t end) {
+        return min_element(values + begin, values + end);
+    }, [](const T * first, const T * other) {
+        return *other < *first ? other : first;
+    });
+}
+
+// First largest element of a non empty vector, in parallel for large ones
+template <typename T>
+const T * py_vector_max_element(vector<T> * pvector) {
+    const T * values = pvector->data();
+    return py_vector_parallel_reduce<const T *>(pvector->size(), [&](size_t begin, size_t end) {
+        return max_element(values + begin, values + end);
+    }, [](const T * first, const T * other) {
+        return *first < *other ? other : first;
+    });
+}
+
+template <typename T>
+int py_vector_min(vector<T> * pvector, T * value) {
+    if( pvector->empty() )
+        return PY_VECTOR_EMPTY;
+    *value = *py_vector_min_element(pvector);
+    return PY_VECTOR_OK;
+}
+
+template <typename T>
+int py_vector_max(vector<T> * pvector, T * value) {
+    if( pvector->empty() )
+        return PY_VECTOR_EMPTY;
+    *value = *py_vector_max_element(pvector);
+    return PY_VECTOR_OK;
+}
+
+template <typename T>
+int py_vector_minmax(vector<T> * pvector, T * minimum, T * maximum) {
+    if( pvector->empty() )
+        return PY_VECTOR_EMPTY;
+
+    typedef pair<T, T> extremes;
+    const T * values = pvector->data();
+    extremes result = py_vector_parallel_reduce<extremes>(pvector->size(), [&](size_t begin, size_t end) {
+        pair<const T *, const T *> found = minmax_element(values + begin, values + end);
+        return extremes(*found.first, *found.second);
+    }, [](const extremes & first, const extremes & other) {
+        return extremes(min(first.first, other.first), max(first.second, other.second));
+    });
+
+    *minimum = result.first, *maximum = result.second;
+    return PY_VECTOR_OK;
+}
+
+template <typename T>
+int py_vector_argmin(vector<T> * pvector, size_t * index) {
+    if( pvector->empty() )
+        return PY_VECTOR_EMPTY;
+    *index = py_vector_min_element(pvector) - pvector->data();
+    return PY_VECTOR_OK;
+}
+
+template <typename T>
+int py_vector_argmax(vector<T> * pvector, size_t * index) {
+    if( pvector->empty() )
+        return PY_VECTOR_EMPTY;
+    *index = py_vector_max_element(pvector) - pvector->data();
+    return PY_VECTOR_OK;
+}
+
+template <typename T>
+T * py_vector_data(vector<T> * pvector) {
+	return pvector->data();
+}
+
+template <typename T>
+bool py_vector_contains_range(vector<T> * pvector, const T * values) {
+    const T * begin = pvector->data();
+    return !less<const T *>()(values, begin) && less<const T *>()(values, begin + pvector->size());
+}
+
+// New vector with the elements whose `mask` value is not 0. Chunks of the
+// vector are counted and then copied in parallel for large vectors.
+template <typename T>
+vector<T> * py_vector_filter(vector<T> * pvector, const uint8_t * mask) {
+    const T * values = pvector->data();
+    size_t size = pvector->size(), chunks = py_vector_chunks(size);
+    vector<size_t> offsets(chunks + 1, 0);
+
+    py_vector_parallel_run(chunks, [&](size_t chunk) {
+        size_t begin = py_vector_chunk_begin(chunk, chunks, size);
+        size_t end = py_vector_chunk_begin(chunk + 1, chunks, size);
+        offsets[chunk + 1] = end - begin - count(mask + begin, mask + end, 0);
+    });
+    partial_sum(offsets.begin(), offsets.end(), offsets.begin());
+
+    vector<T> * pfiltered = new vector<T>(offsets[chunks]);
+    T * out = pfiltered->data();
+    py_vector_parallel_run(chunks, [&](size_t chunk) {
+        size_t end = py_vector_chunk_begin(chunk + 1, chunks, size);
+        T * position = out + offsets[chunk];
+        for( size_t index = py_vector_chunk_begin(chunk, chunks, size); index < end; ++index )
+            if( mask[index] )
+                *position++ = values[index];
+    });
+    return pfiltered;
+}
+
+// Check python `indices`, which can be negative, against the vector size
+template <typename T>
+bool py_vector_check_indices(vector<T> * pvector, const long * indices, size_t count) {
+    long size = pvector->size();
+    return find_if(indices, indices + count, [size](long index) {
+        return index < -size || index >= size;
+    }) == indices + count;
+}
+
+// Gather the elements at `indices` into `out`
+template <typename T>
+int py_vector_take(vector<T> * pvector, const long * indices, size_t count, T * out) {
+    if( !py_vector_check_indices(pvector, indices, count) )
+        return PY_VECTOR_OUT_OF_RANGE;
+
+    const T * values = pvector->data();
+    long size = pvector->size();
+    py_vector_parallel_for(count, [&](size_t begin, size_t end) {
+        for( size_t index = begin; index < end; ++index )
+            out[index] = values[indices[index] < 0 ? indices[index] + size : indices[index]];
+    });
+    return PY_VECTOR_OK;
+}
+
+// Scatter `values` to `indices`, which is a single value for all of them if
+// `size` is 1. The last one wins for repeated indices.
+template <typename T>
+int py_vector_put(vector<T> * pvector, const long * indices, size_t count, const T * values, size_t size) {
+    if( !py_vector_check_indices(pvector, indices, count) )
+        return PY_VECTOR_OUT_OF_RANGE;
+
+    if( py_vector_contains_range(pvector, values) ) {
+        vector<T> copy(values, values + size);
+        return py_vector_put(pvector, indices, count, copy.data(), size);
+    }
+
+    T * out = pvector->data();
+    long length = pvector->size();
+    for( size_t index = 0; index < count; ++index )
+        out[indices[index] < 0 ? indices[index] + length : indices[index]] = values[size == 1 ? 0 : index];
+    return PY_VECTOR_OK;
+}
+
+// Set operations over sorted ranges
+enum {
+    PY_VECTOR_UNION = 0,
+    PY_VECTOR_INTERSECTION,
+    PY_VECTOR_DIFFERENCE,
+    PY_VECTOR_SYMMETRIC_DIFFERENCE,
+    PY_VECTOR_MERGE
+};
+
+// Replace `out` with the result of `operation` over two sorted ranges,
+// which are copied away first if they are part of `out` itself.
+template <typename T>
+void py_vector_set_operation(int operation, const T * left, size_t lsize,
+                             const T * right, size_t rsize, vector<T> * out) {
+    if( py_vector_contains_range(out, left) || py_vector_contains_range(out, right) ) {
+        vector<T> result;
+        py_vector_set_operation(operation, left, lsize, right, rsize, &result);
+        py_vector_take_storage(out, result);
+        return;
+    }
+
+    const T * lend = left + lsize, * rend = right + rsize;
+    out->clear();
+    py_vector_own(out, lsize + rsize);
+    switch( operation ) {
+    case PY_VECTOR_UNION:
+        out->reserve(lsize + rsize);
+        set_union(left, lend, right, rend, back_inserter(*out));
+        break;
+    case PY_VECTOR_INTERSECTION:
+        out->reserve(min(lsize, rsize));
+        set_intersection(left, lend, right, rend, back_inserter(*out));
+        break;
+    case PY_VECTOR_DIFFERENCE:
+        out->reserve(lsize);
+        set_difference(left, lend, right, rend, back_inserter(*out));
+        break;
+    case PY_VECTOR_SYMMETRIC_DIFFERENCE:
+        out->reserve(lsize + rsize);
+        set_symmetric_difference(left, lend, right, rend, back_inserter(*out));
+        break;
+    case PY_VECTOR_MERGE:
+        out->reserve(lsize + rsize);
+        merge(left, lend, right, rend, back_inserter(*out));
+        break;
+    }
+}
+
+template <typename T>
+int py_vector_includes(const T * left, size_t lsize, const T * right, size_t rsize) {
+    return includes(left, left + lsize, right, right + rsize);
+}
+
+// Replace `out` with the stable merge of `count` sorted ranges, which are
+// concatenated and then merged by pairs.
+template <typename T>
+void py_vector_merge_many(const T * const * ranges, const size_t * sizes, size_t count, vector<T> * out) {
+    vector<size_t> offsets(count + 1, 0);
+    partial_sum(sizes, sizes + count, offsets.begin() + 1);
+
+    vector<T> merged;
+    merged.reserve(offsets[count]);
+    for( size_t range = 0; range < count; ++range )
+        merged.insert(merged.end(), ranges[range], ranges[range] + sizes[range]);
+
+    py_vector_merge_runs(merged.data(), count, [&](size_t range) { return offsets[range]; },
+                         less<T>(), py_vector_chunks(merged.size()) > 1);
+    py_vector_take_storage(out, merged);
+}
+
+template <typename T>
+void py_vector_extend(vector<T> * pvector, const T * values, size_t size) {
+    py_vector_own(pvector, pvector->size() + size);
+    // A range taken from the vector itself would be invalidated by the
+    // reallocation, so it has to be copied away first.
+    if( py_vector_contains_range(pvector, values) ) {
+        vector<T> copy(values, values + size);
+        pvector->insert(pvector->end(), copy.begin(), copy.end());
+    }
+    else
+        // a pointer range is random access, so this reserves only once
+        pvector->insert(pvector->end(), values, values + size);
+}
+
+template <typename T>
+void py_vector_replace(vector<T> * pvector, size_t begin, size_t end, const T * values, size_t size) {
+    if( py_vector_contains_range(pvector, values) ) {
+        vector<T> copy(values, values + size);
+        return py_vector_replace(pvector, begin, end, copy.data(), size);
+    }
+
+    // overwrite the common part and then erase or insert only the difference
+    size_t common = min(end - begin, size);
+    py_vector_own(pvector, pvector->size() - (end - begin) + size);
+    copy(values, values + common, pvector->begin() + begin);
+
+    if( common < end - begin )
+        pvector->erase(pvector->begin() + begin + common, pvector->begin() + end);
+    else
+        pvector->insert(pvector->begin() + begin + common, values + common, values + size);
+}
+
+template <typename T>
+void py_vector_assign_strided(vector<T> * pvector, size_t start, ptrdiff_t step, const T * values, size_t size) {
+    if( py_vector_contains_range(pvector, values) ) {
+        vector<T> copy(values, values + size);
+        return py_vector_assign_strided(pvector, start, step, copy.data(), size);
+    }
+
+    T * out = pvector->data() + start;
+    for( size_t index = 0; index < size; ++index, out += step )
+        *out = values[index];
+}
+
+template <typename T>
+void py_vector_copy_range(vector<T> * pvector, ptrdiff_t start, ptrdiff_t stop, ptrdiff_t step, T * out) {
+    // indexes are expected to be already clipped by python's slice.indices
+    const T * values = pvector->data();
+
+    if( step == 1 ) {
+        if( start < stop )
+            copy(values + start, values + stop, out);
+        return;
+    }
+
+    for( ptrdiff_t index = start; step > 0 ? index < stop : index > stop; index += step )
+        *out++ = values[index];
+}
+
+template <typename T>
+vector<T> * py_vector_slice(vector<T> * pvector, ptrdiff_t start, ptrdiff_t stop, ptrdiff_t step) {
+    ptrdiff_t size = 0;
+    if( step > 0 && start < stop )
+        size = (stop - start - 1) / step + 1;
+    else if( step < 0 && stop < start )
+        size = (start - stop - 1) / -step + 1;
+
+    vector<T> * pslice = new vector<T>(size);
+    if( size )
+        py_vector_copy_range(pvector, start, stop, step, pslice->data());
+    return pslice;
+}
+
 template <typename T>
 void py_vector_insert(vector<T> * pvector, size_t index, T value) {
+    py_vector_own(pvector, pvector->size() + 1);
 	pvector->insert(pvector->begin() + index, value);
 }
 
@@ -53,15 +921,22 @@ void py_vector_erase(vector<T> * pvector, size_t begin, size_t end) {
 }
 
 template <typename T>
-int py_vector_find(vector<T> * pvector, T value) {
-    typename vector<T>::iterator it;
+ptrdiff_t py_vector_find(vector<T> * pvector, T value) {
+    const T * values = pvector->data();
+    size_t size = pvector->size();
 
-    it = find(pvector->begin(), pvector->end(), value);
+    // first position found in every range, `size` if not found
+    size_t index = py_vector_parallel_reduce<size_t>(size, [&](size_t begin, size_t end) {
+        size_t found = find(values + begin, values + end, value) - values;
+        return found == end ? size : found;
+    }, [](size_t first, size_t other) {
+        return min(first, other);
+    });
 
-    if( it == pvector->end() )
+    if( index == size )
         return -1;
     else
-        return it - pvector->begin();  // index
+        return index;
 }
 
 template <typename T>
@@ -73,12 +948,417 @@ T py_vector_pop_back(vector<T> * pvector) {
 
 template <typename T>
 size_t py_vector_count(vector<T> * pvector, T value) {
-    return count(pvector->begin(), pvector->end(), value);
+    const T * values = pvector->data();
+    return py_vector_parallel_reduce<size_t>(pvector->size(), [&](size_t begin, size_t end) {
+        return (size_t)count(values + begin, values + end, value);
+    }, plus<size_t>());
+}
+
+template <typename T>
+int py_vector_is_sorted(vector<T> * pvector) {
+    return is_sorted(pvector->begin(), pvector->end());
 }
 
+// Binary searches over [lo, hi), which must be sorted, returning positions
+// in the whole vector like python's `bisect` module.
 template <typename T>
-void py_vector_sort(vector<T> * pvector) {
-    return stable_sort(pvector->begin(), pvector->end());
+size_t py_vector_lower_bound(vector<T> * pvector, size_t lo, size_t hi, T value) {
+    const T * values = pvector->data();
+    return lower_bound(values + lo, values + hi, value) - values;
+}
+
+template <typename T>
+size_t py_vector_upper_bound(vector<T> * pvector, size_t lo, size_t hi, T value) {
+    const T * values = pvector->data();
+    return upper_bound(values + lo, values + hi, value) - values;
+}
+
+// Exponential search of the first position in [first, last) which is not
+// before `value`, the lower bound, or the upper bound if `right` is set. It
+// takes O(log d) for a distance d from `first`, so a walk over ascending
+// values costs no more than a merge.
+template <typename T>
+const T * py_vector_gallop(const T * first, const T * last, T value, bool right) {
+    ptrdiff_t step = 1;
+    while( step <= last - first && (right ? !(value < first[step - 1]) : first[step - 1] < value) ) {
+        first += step;
+        step *= 2;
+    }
+
+    last = min(first + step, last);
+    return right ? upper_bound(first, last, value) : lower_bound(first, last, value);
+}
+
+// Insertion positions in the sorted vector for a batch of `values` into
+// `out`. Ascending batches are searched in a single merge-style walk.
+template <typename T>
+void py_vector_searchsorted(vector<T> * pvector, const T * values, size_t size, int right, long * out) {
+    const T * begin = pvector->data(), * end = begin + pvector->size();
+
+    if( is_sorted(values, values + size) ) {
+        const T * position = begin;
+        for( size_t index = 0; index < size; ++index ) {
+            position = py_vector_gallop(position, end, values[index], right);
+            out[index] = position - begin;
+        }
+        return;
+    }
+
+    for( size_t index = 0; index < size; ++index )
+        out[index] = (right ? upper_bound(begin, end, values[index])
+                            : lower_bound(begin, end, values[index])) - begin;
+}
+
+// `py_vector_find` and `py_vector_count` for sorted vectors
+template <typename T>
+ptrdiff_t py_vector_sorted_find(vector<T> * pvector, T value) {
+    typename vector<T>::iterator it;
+
+    it = lower_bound(pvector->begin(), pvector->end(), value);
+
+    if( it == pvector->end() || value < *it )
+        return -1;
+    else
+        return it - pvector->begin();  // index
+}
+
+template <typename T>
+size_t py_vector_sorted_count(vector<T> * pvector, T value) {
+    pair<typename vector<T>::iterator, typename vector<T>::iterator> range;
+
+    range = equal_range(pvector->begin(), pvector->end(), value);
+
+    return range.second - range.first;
+}
+
+// Sort [first, first + size), with `std::sort` unless it has to be stable
+// or it is worth sorting in parallel
+template <typename T, typename Compare>
+void py_vector_sort_range(T * first, size_t size, Compare compare, bool stable) {
+    if( stable || py_vector_chunks(size) > 1 )
+        py_vector_parallel_sort(first, size, compare);
+    else
+        sort(first, first + size, compare);
+}
+
+// Sorting algorithms
+enum {
+    PY_VECTOR_AUTO = 0,
+    PY_VECTOR_INTROSORT,
+    PY_VECTOR_RADIX,
+    PY_VECTOR_COUNTING
+};
+
+// Smallest vector sorted by radix sort in automatic mode
+const size_t PY_VECTOR_RADIX_THRESHOLD = 1 << 12;
+
+// Elements sampled to estimate the range of the values in automatic mode
+const size_t PY_VECTOR_SORT_SAMPLES = 256;
+
+// LSD radix sort by bytes, moving the elements between the vector and a
+// single scratch buffer and skipping the bytes which are the same for all
+template <typename T>
+void py_vector_radix_sort(T * first, size_t size) {
+    typedef typename make_unsigned<T>::type U;
+    const U flip = is_signed<T>::value ? U(1) << (sizeof(T) * 8 - 1) : 0;
+
+    vector<array<size_t, 256> > counts(sizeof(T));
+    for( size_t digit = 0; digit < sizeof(T); ++digit )
+        counts[digit].fill(0);
+    for( size_t index = 0; index < size; ++index ) {
+        U key = U(first[index]) ^ flip;
+        for( size_t digit = 0; digit < sizeof(T); ++digit )
+            ++counts[digit][(key >> (8 * digit)) & 0xff];
+    }
+
+    vector<T> scratch;
+    T * source = first, * target = NULL;
+    for( size_t digit = 0; digit < sizeof(T); ++digit ) {
+        array<size_t, 256> & offsets = counts[digit];
+        if( find(offsets.begin(), offsets.end(), size) != offsets.end() )
+            continue;
+
+        if( !target ) {
+            scratch.resize(size);
+            target = scratch.data();
+        }
+        size_t offset = 0;
+        for( size_t bucket = 0; bucket < 256; ++bucket ) {
+            size_t count = offsets[bucket];
+            offsets[bucket] = offset;
+            offset += count;
+        }
+        for( size_t index = 0; index < size; ++index ) {
+            U key = U(source[index]) ^ flip;
+            target[offsets[(key >> (8 * digit)) & 0xff]++] = source[index];
+        }
+        swap(source, target);
+    }
+
+    if( source != first )
+        copy(source, source + size, first);
+}
+
+// Counting sort, which is not done returning false if the range of the
+// values is too wide to be counted in linear space
+template <typename T>
+bool py_vector_counting_sort(T * first, size_t size) {
+    typedef typename make_unsigned<T>::type U;
+    if( !size )
+        return true;
+
+    pair<T *, T *> bounds = minmax_element(first, first + size);
+    U lowest = U(*bounds.first);
+    uint64_t range = uint64_t(U(*bounds.second) - lowest) + 1;
+    if( range == 0 || range > max<uint64_t>(2 * size, 1 << 16) )
+        return false;
+
+    vector<size_t> counts(range, 0);
+    for( size_t index = 0; index < size; ++index )
+        ++counts[U(first[index]) - lowest];
+    for( size_t value = 0; value < range; ++value )
+        first = fill_n(first, counts[value], T(U(lowest + value)));
+    return true;
+}
+
+template <typename T>
+bool py_vector_integer_sort(T * first, size_t size, bool counting, true_type) {
+    if( !counting || !py_vector_counting_sort(first, size) )
+        py_vector_radix_sort(first, size);
+    return true;
+}
+
+template <typename T>
+bool py_vector_integer_sort(T *, size_t, bool, false_type) {
+    return false;
+}
+
+// Choose an algorithm for integers by the size and the range of a sample:
+// counting sort for values in a range narrower than the size, radix sort for
+// large vectors and `std::sort` for small ones
+template <typename T>
+int py_vector_sort_algorithm(const T * first, size_t size, true_type) {
+    if( size < PY_VECTOR_RADIX_THRESHOLD )
+        return PY_VECTOR_INTROSORT;
+
+    typedef typename make_unsigned<T>::type U;
+    T lowest = first[0], highest = first[0];
+    for( size_t sample = 0; sample < PY_VECTOR_SORT_SAMPLES; ++sample ) {
+        T value = first[sample * (size / PY_VECTOR_SORT_SAMPLES)];
+        lowest = min(lowest, value);
+        highest = max(highest, value);
+    }
+    return uint64_t(U(highest) - U(lowest)) < size / 2 ? PY_VECTOR_COUNTING : PY_VECTOR_RADIX;
+}
+
+template <typename T>
+int py_vector_sort_algorithm(const T *, size_t, false_type) {
+    return PY_VECTOR_INTROSORT;
+}
+
+// Sort with `algorithm`, where radix and counting sorts are only available
+// for integers
+template <typename T>
+int py_vector_sort(vector<T> * pvector, int reverse, int stable, int algorithm) {
+    T * first = pvector->data();
+    size_t size = pvector->size();
+    if( algorithm == PY_VECTOR_AUTO )
+        algorithm = py_vector_sort_algorithm(first, size, is_integral<T>());
+
+    if( algorithm == PY_VECTOR_INTROSORT ) {
+        if( reverse )
+            py_vector_sort_range(first, size, greater<T>(), stable);
+        else
+            py_vector_sort_range(first, size, less<T>(), stable);
+        return PY_VECTOR_OK;
+    }
+
+    if( !py_vector_integer_sort(first, size, algorithm == PY_VECTOR_COUNTING, is_integral<T>()) )
+        return PY_VECTOR_UNSUPPORTED;
+    // equal integers cannot be told apart, so this keeps it stable
+    if( reverse )
+        std::reverse(first, first + size);
+    return PY_VECTOR_OK;
+}
+
+// Sort the `k` smallest elements into the first positions
+template <typename T>
+void py_vector_partial_sort(vector<T> * pvector, size_t k) {
+    partial_sort(pvector->begin(), pvector->begin() + k, pvector->end());
+}
+
+// Put the element which would be at `n` after sorting in its place, with
+// no larger ones before it and no smaller ones after it
+template <typename T>
+void py_vector_nth_element(vector<T> * pvector, size_t n) {
+    nth_element(pvector->begin(), pvector->begin() + n, pvector->end());
+}
+
+// Write the positions which would sort the vector into `out`
+template <typename T>
+void py_vector_argsort(vector<T> * pvector, int reverse, int stable, long * out) {
+    const T * values = pvector->data();
+    size_t size = pvector->size();
+    iota(out, out + size, 0L);
+
+    if( reverse )
+        py_vector_sort_range(out, size, [values](long a, long b) { return values[a] > values[b]; }, stable);
+    else
+        py_vector_sort_range(out, size, [values](long a, long b) { return values[a] < values[b]; }, stable);
+}
+
+// Write the `k` largest or smallest elements, the first one among equal
+// ones first, and their positions into `values` and `positions`. Every chunk
+// keeps its best `k` in a heap, which are then pushed into the first one.
+template <typename T>
+void py_vector_topk(vector<T> * pvector, size_t k, int largest, T * values, long * positions) {
+    typedef pair<T, size_t> entry;
+    const T * data = pvector->data();
+    k = min(k, pvector->size());
+    if( !k )
+        return;
+
+    // the worst entry is kept at the front of the heap
+    auto better = [largest](const entry & a, const entry & b) {
+        if( a.first != b.first )
+            return largest ? a.first > b.first : a.first < b.first;
+        return a.second < b.second;
+    };
+    auto push = [&](vector<entry> & heap, const entry & candidate) {
+        if( heap.size() < k ) {
+            heap.push_back(candidate);
+            push_heap(heap.begin(), heap.end(), better);
+        } else if( better(candidate, heap.front()) ) {
+            pop_heap(heap.begin(), heap.end(), better);
+            heap.back() = candidate;
+            push_heap(heap.begin(), heap.end(), better);
+        }
+    };
+
+    vector<entry> best = py_vector_parallel_reduce<vector<entry> >(pvector->size(),
+            [&](size_t begin, size_t end) {
+        vector<entry> heap;
+        heap.reserve(min(k, end - begin));
+        for( size_t index = begin; index < end; ++index )
+            push(heap, entry(data[index], index));
+        return heap;
+    }, [&](vector<entry> heap, const vector<entry> & other) {
+        for( typename vector<entry>::const_iterator it = other.begin(); it != other.end(); ++it )
+            push(heap, *it);
+        return heap;
+    });
+
+    sort_heap(best.begin(), best.end(), better);
+    for( size_t index = 0; index < k; ++index ) {
+        values[index] = best[index].first;
+        positions[index] = best[index].second;
+    }
+}
+
+// Sorted copy of the vector, which is just copied if already sorted
+template <typename T>
+vector<T> py_vector_sorted_copy(vector<T> * pvector) {
+    vector<T> values(*pvector);
+    if( !is_sorted(values.begin(), values.end()) )
+        py_vector_parallel_sort(values.data(), values.size(), less<T>());
+    return values;
+}
+
+// New vector with the distinct elements, sorted or in order of appearance
+template <typename T>
+vector<T> * py_vector_unique(vector<T> * pvector, int keep_order) {
+    if( keep_order ) {
+        vector<T> * punique = new vector<T>();
+        unordered_set<T> seen;
+        for( typename vector<T>::const_iterator it = pvector->begin(); it != pvector->end(); ++it )
+            if( seen.insert(*it).second )
+                punique->push_back(*it);
+        return punique;
+    }
+
+    vector<T> * punique = new vector<T>(py_vector_sorted_copy(pvector));
+    punique->erase(unique(punique->begin(), punique->end()), punique->end());
+    return punique;
+}
+
+// Replace `values` and `counts` with the distinct elements, sorted, and
+// the number of times each one appears
+template <typename T>
+void py_vector_value_counts(vector<T> * pvector, vector<T> * values, vector<long> * counts) {
+    vector<T> sorted = py_vector_sorted_copy(pvector), distinct;
+    vector<long> repeats;
+
+    for( typename vector<T>::const_iterator it = sorted.begin(); it != sorted.end(); ) {
+        typename vector<T>::const_iterator next = upper_bound(it, sorted.cend(), *it);
+        distinct.push_back(*it);
+        repeats.push_back(next - it);
+        it = next;
+    }
+    py_vector_take_storage(values, distinct);
+    py_vector_take_storage(counts, repeats);
+}
+
+// Replace `counts` with the number of times each integer in [0, max] appears,
+// with at least `minlength` of them. Negative values and values with no room
+// for their count in a size_t are out of range.
+template <typename T>
+int py_vector_bincount(vector<T> * pvector, size_t minlength, vector<long> * counts) {
+    size_t bins = 0;
+    if( !pvector->empty() ) {
+        T lowest = *py_vector_min_element(pvector), highest = *py_vector_max_element(pvector);
+        if( lowest < 0 || static_cast<unsigned long long>(highest) >= SIZE_MAX )
+            return PY_VECTOR_OUT_OF_RANGE;
+        bins = static_cast<size_t>(highest) + 1;
+    }
+
+    try {
+        vector<long> bincounts(max(bins, minlength), 0);
+        for( typename vector<T>::const_iterator it = pvector->begin(); it != pvector->end(); ++it )
+            ++bincounts[static_cast<size_t>(*it)];
+        py_vector_take_storage(counts, bincounts);
+    } catch( const exception & ) {  // bad_alloc or length_error
+        return PY_VECTOR_NO_MEMORY;
+    }
+    return PY_VECTOR_OK;
+}
+
+// Count the elements into the `bins` between `bins + 1` increasing `edges`,
+// where the last bin includes its right edge and values out of all of them
+// are not counted. Bins are computed straight from the value if `uniform`.
+template <typename T>
+void py_vector_histogram(vector<T> * pvector, const double * edges, size_t bins, int uniform, long * counts) {
+    const T * values = pvector->data();
+    double first = edges[0], last = edges[bins];
+    double scale = bins / (last - first);
+
+    vector<long> total = py_vector_parallel_reduce<vector<long> >(pvector->size(),
+            [&](size_t begin, size_t end) {
+        vector<long> partial(bins, 0);
+        for( size_t index = begin; index < end; ++index ) {
+            double value = values[index];
+            if( !(value >= first && value <= last) )
+                continue;
+
+            size_t bin;
+            if( uniform ) {
+                bin = min(static_cast<size_t>((value - first) * scale), bins - 1);
+                // rounding can put values next to an edge in a neighbour bin
+                if( value < edges[bin] )
+                    --bin;
+                else if( bin + 1 < bins && value >= edges[bin + 1] )
+                    ++bin;
+            } else {
+                bin = min(static_cast<size_t>(upper_bound(edges, edges + bins + 1, value) - edges), bins) - 1;
+            }
+            ++partial[bin];
+        }
+        return partial;
+    }, [bins](vector<long> result, const vector<long> & partial) {
+        for( size_t bin = 0; bin < bins; ++bin )
+            result[bin] += partial[bin];
+        return result;
+    });
+    copy(total.begin(), total.end(), counts);
 }
 
 template <typename T>
@@ -0,0 +1,256 @@
+#ifndef __PY_VECTOR_DEFINE__
+#define __PY_VECTOR_DEFINE__
+
+#include "vector_base.h"
+
+// Instantiate the C interface for `vector<T>` as `py_vector_<name>_*`
+// functions, which `pystl.vector.vector_type` wraps on the python side.
+#define PY_VECTOR_DEFINE(name, T) \
+extern "C" { \
+ \
+	vector<T> * py_vector_##name##_new() { \
+		return py_vector_new<T>(); \
+	} \
+ \
+	void py_vector_##name##_delete(vector<T> * pvector) { \
+		py_vector_delete(pvector); \
+	} \
+ \
+	size_t py_vector_##name##_size(vector<T> * pvector) { \
+		return py_vector_size(pvector); \
+	} \
+ \
+	size_t py_vector_##name##_capacity(vector<T> * pvector) { \
+		return py_vector_capacity(pvector); \
+	} \
+ \
+	int py_vector_##name##_reserve(vector<T> * pvector, size_t capacity) { \
+		return py_vector_reserve(pvector, capacity); \
+	} \
+ \
+	void py_vector_##name##_shrink_to_fit(vector<T> * pvector) { \
+		py_vector_shrink_to_fit(pvector); \
+	} \
+ \
+	int py_vector_##name##_resize(vector<T> * pvector, size_t size, T fill) { \
+		return py_vector_resize(pvector, size, fill); \
+	} \
+ \
+	T py_vector_##name##_at(vector<T> * pvector, size_t index) { \
+		return py_vector_at(pvector, index); \
+	} \
+ \
+	void py_vector_##name##_set(vector<T> * pvector, size_t index, T value) { \
+		py_vector_set(pvector, index, value); \
+	} \
+ \
+	void py_vector_##name##_push_back(vector<T> * pvector, T value) { \
+		py_vector_push_back(pvector, value); \
+	} \
+ \
+	int py_vector_##name##_checked_at(vector<T> * pvector, ptrdiff_t index, T * value) { \
+		return py_vector_checked_at(pvector, index, value); \
+	} \
+ \
+	int py_vector_##name##_checked_set(vector<T> * pvector, ptrdiff_t index, T value) { \
+		return py_vector_checked_set(pvector, index, value); \
+	} \
+ \
+	int py_vector_##name##_checked_insert(vector<T> * pvector, ptrdiff_t index, T value) { \
+		return py_vector_checked_insert(pvector, index, value); \
+	} \
+ \
+	int py_vector_##name##_checked_erase(vector<T> * pvector, ptrdiff_t index) { \
+		return py_vector_checked_erase(pvector, index); \
+	} \
+ \
+	int py_vector_##name##_checked_pop(vector<T> * pvector, ptrdiff_t index, T * value) { \
+		return py_vector_checked_pop(pvector, index, value); \
+	} \
+ \
+	int py_vector_##name##_operate(int operation, int operands, const T * left, const T * right, T * out, size_t size) { \
+		return py_vector_operate(operation, operands, left, right, out, size); \
+	} \
+ \
+	void py_vector_##name##_compare(int comparison, int operands, const T * left, const T * right, uint8_t * out, size_t size) { \
+		py_vector_compare(comparison, operands, left, right, out, size); \
+	} \
+ \
+	vector<T> * py_vector_##name##_filter(vector<T> * pvector, const uint8_t * mask) { \
+		return py_vector_filter(pvector, mask); \
+	} \
+ \
+	int py_vector_##name##_take(vector<T> * pvector, const long * indices, size_t count, T * out) { \
+		return py_vector_take(pvector, indices, count, out); \
+	} \
+ \
+	int py_vector_##name##_put(vector<T> * pvector, const long * indices, size_t count, const T * values, size_t size) { \
+		return py_vector_put(pvector, indices, count, values, size); \
+	} \
+ \
+	void py_vector_##name##_set_operation(int operation, const T * left, size_t lsize, const T * right, size_t rsize, vector<T> * out) { \
+		py_vector_set_operation(operation, left, lsize, right, rsize, out); \
+	} \
+ \
+	int py_vector_##name##_includes(const T * left, size_t lsize, const T * right, size_t rsize) { \
+		return py_vector_includes(left, lsize, right, rsize); \
+	} \
+ \
+	void py_vector_##name##_merge_many(const T * const * ranges, const size_t * sizes, size_t count, vector<T> * out) { \
+		py_vector_merge_many(ranges, sizes, count, out); \
+	} \
+ \
+	vector<T> * py_vector_##name##_unique(vector<T> * pvector, int keep_order) { \
+		return py_vector_unique(pvector, keep_order); \
+	} \
+ \
+	void py_vector_##name##_value_counts(vector<T> * pvector, vector<T> * values, vector<long> * counts) { \
+		py_vector_value_counts(pvector, values, counts); \
+	} \
+ \
+	int py_vector_##name##_bincount(vector<T> * pvector, size_t minlength, vector<long> * counts) { \
+		return py_vector_bincount(pvector, minlength, counts); \
+	} \
+ \
+	void py_vector_##name##_histogram(vector<T> * pvector, const double * edges, size_t bins, int uniform, long * counts) { \
+		py_vector_histogram(pvector, edges, bins, uniform, counts); \
+	} \
+ \
+	int py_vector_##name##_adopt(vector<T> * pvector, T * data, size_t size, size_t capacity) { \
+		return py_vector_adopt(pvector, data, size, capacity); \
+	} \
+ \
+	void py_vector_##name##_release(vector<T> * pvector) { \
+		py_vector_release(pvector); \
+	} \
+ \
+	int py_vector_##name##_evaluate(const int * program, size_t length, const T * const * vectors, const T * scalars, size_t offset, size_t size, T * out) { \
+		return py_vector_evaluate(program, length, vectors, scalars, offset, size, out); \
+	} \
+ \
+	int py_vector_##name##_sum(vector<T> * pvector, int wide, int64_t * high, uint64_t * low, double * real) { \
+		return py_vector_sum(pvector, wide, high, low, real); \
+	} \
+ \
+	int py_vector_##name##_min(vector<T> * pvector, T * value) { \
+		return py_vector_min(pvector, value); \
+	} \
+ \
+	int py_vector_##name##_max(vector<T> * pvector, T * value) { \
+		return py_vector_max(pvector, value); \
+	} \
+ \
+	int py_vector_##name##_minmax(vector<T> * pvector, T * minimum, T * maximum) { \
+		return py_vector_minmax(pvector, minimum, maximum); \
+	} \
+ \
+	int py_vector_##name##_argmin(vector<T> * pvector, size_t * index) { \
+		return py_vector_argmin(pvector, index); \
+	} \
+ \
+	int py_vector_##name##_argmax(vector<T> * pvector, size_t * index) { \
+		return py_vector_argmax(pvector, index); \
+	} \
+ \
+	T * py_vector_##name##_data(vector<T> * pvector) { \
+		return py_vector_data(pvector); \
+	} \
+ \
+	void py_vector_##name##_extend(vector<T> * pvector, const T * values, size_t size) { \
+		py_vector_extend(pvector, values, size); \
+	} \
+ \
+	void py_vector_##name##_replace(vector<T> * pvector, size_t begin, size_t end, const T * values, size_t size) { \
+		py_vector_replace(pvector, begin, end, values, size); \
+	} \
+ \
+	void py_vector_##name##_assign_strided(vector<T> * pvector, size_t start, ptrdiff_t step, const T * values, size_t size) { \
+		py_vector_assign_strided(pvector, start, step, values, size); \
+	} \
+ \
+	void py_vector_##name##_copy_range(vector<T> * pvector, ptrdiff_t start, ptrdiff_t stop, ptrdiff_t step, T * out) { \
+		py_vector_copy_range(pvector, start, stop, step, out); \
+	} \
+ \
+	vector<T> * py_vector_##name##_slice(vector<T> * pvector, ptrdiff_t start, ptrdiff_t stop, ptrdiff_t step) { \
+		return py_vector_slice(pvector, start, stop, step); \
+	} \
+ \
+	void py_vector_##name##_insert(vector<T> * pvector, size_t index, T value) { \
+		py_vector_insert(pvector, index, value); \
+	} \
+ \
+	void py_vector_##name##_erase(vector<T> * pvector, size_t index) { \
+		py_vector_erase(pvector, index); \
+	} \
+ \
+	void py_vector_##name##_erase_slice(vector<T> * pvector, size_t begin, size_t end) { \
+		py_vector_erase(pvector, begin, end); \
+	} \
+ \
+	ptrdiff_t py_vector_##name##_find(vector<T> * pvector, T value) { \
+		return py_vector_find(pvector, value); \
+	} \
+ \
+	T py_vector_##name##_pop_back(vector<T> * pvector) { \
+		return py_vector_pop_back(pvector); \
+	} \
+ \
+	size_t py_vector_##name##_count(vector<T> * pvector, T value) { \
+		return py_vector_count(pvector, value); \
+	} \
+ \
+	int py_vector_##name##_is_sorted(vector<T> * pvector) { \
+		return py_vector_is_sorted(pvector); \
+	} \
+ \
+	size_t py_vector_##name##_lower_bound(vector<T> * pvector, size_t lo, size_t hi, T value) { \
+		return py_vector_lower_bound(pvector, lo, hi, value); \
+	} \
+ \
+	size_t py_vector_##name##_upper_bound(vector<T> * pvector, size_t lo, size_t hi, T value) { \
+		return py_vector_upper_bound(pvector, lo, hi, value); \
+	} \
+ \
+	void py_vector_##name##_searchsorted(vector<T> * pvector, const T * values, size_t size, int right, long * out) { \
+		py_vector_searchsorted(pvector, values, size, right, out); \
+	} \
+ \
+	ptrdiff_t py_vector_##name##_sorted_find(vector<T> * pvector, T value) { \
+		return py_vector_sorted_find(pvector, value); \
+	} \
+ \
+	size_t py_vector_##name##_sorted_count(vector<T> * pvector, T value) { \
+		return py_vector_sorted_count(pvector, value); \
+	} \
+ \
+	int py_vector_##name##_sort(vector<T> * pvector, int reverse, int stable, int algorithm) { \
+		return py_vector_sort(pvector, reverse, stable, algorithm); \
+	} \
+ \
+	void py_vector_##name##_partial_sort(vector<T> * pvector, size_t k) { \
+		py_vector_partial_sort(pvector, k); \
+	} \
+ \
+	void py_vector_##name##_nth_element(vector<T> * pvector, size_t n) { \
+		py_vector_nth_element(pvector, n); \
+	} \
+ \
+	void py_vector_##name##_argsort(vector<T> * pvector, int reverse, int stable, long * out) { \
+		py_vector_argsort(pvector, reverse, stable, out); \
+	} \
+ \
+	void py_vector_##name##_topk(vector<T> * pvector, size_t k, int largest, T * values, long * positions) { \
+		py_vector_topk(pvector, k, largest, values, positions); \
+	} \
+ \
+	void py_vector_##name##_reverse(vector<T> * pvector) { \
+		py_vector_reverse(pvector); \
+	} \
+ \
+	int py_vector_##name##_equal(vector<T> * pvector, vector<T> * pother) { \
+		return py_vector_equal(pvector, pother); \
+	} \
+}
+
+#endif
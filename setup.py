@@ -1,6 +1,31 @@
 # -*- coding: utf-8 -*-
 
+from distutils.errors import CCompilerError, DistutilsExecError, \
+    DistutilsPlatformError
 from setuptools import setup, Extension
+from setuptools.command.build_ext import build_ext
+
+
+class optional_build_ext(build_ext):
+    """Build extensions, letting `pystl._speedups` fail
+
+    It is just a faster backend, so pystl keeps working through ctypes
+    without it. See `pystl.backend`.
+    """
+    optional = ('pystl._speedups',)
+
+    def build_extension(self, ext):
+        try:
+            build_ext.build_extension(self, ext)
+        except (CCompilerError, DistutilsExecError, DistutilsPlatformError):
+            if ext.name not in self.optional:
+                raise
+            self.warn('could not build {}, using ctypes only'.format(ext.name))
+
+
+# the C++ code is all in headers, so changes to them must rebuild both
+HEADERS = ['pystl/vector.h', 'pystl/vector_base.h', 'pystl/vector_define.h',
+           'pystl/parallel.h']
 
 
 setup(
@@ -17,9 +42,22 @@ setup(
             "pystl._pystl",
             sources=['pystl/vector.cpp'],
             include_dirs=['pystl'],
+            depends=HEADERS,
+            # parallel algorithms, see pystl.engine
+            extra_compile_args=['-pthread'],
+            extra_link_args=['-pthread'],
+            language="c++"
+        ),
+        # per element calls without ctypes overhead, see pystl.backend
+        Extension(
+            "pystl._speedups",
+            sources=['pystl/speedups.cpp'],
+            include_dirs=['pystl'],
+            depends=HEADERS,
             language="c++"
         )
     ],
+    cmdclass={'build_ext': optional_build_ext},
     platforms=['any'],
     classifiers=[
         "Operating System :: OS Independent",
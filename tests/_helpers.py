@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
 
+import os
+import shutil
+import tempfile
 from contextlib import contextmanager
 
 
@@ -21,6 +24,20 @@ class Spy(object):
         return bool(self.number_of_calls)
 
 
+class CheckedSpy(Spy):
+    """Spy on a checked accessor, reporting `status` to its `errcheck`"""
+    def __init__(self, returns=None, status=0, errcheck=None):
+        super(CheckedSpy, self).__init__(returns)
+        self.status = status
+        self.errcheck = errcheck
+
+    def __call__(self, *args, **kwargs):
+        super(CheckedSpy, self).__call__(*args, **kwargs)
+        if self.errcheck is not None:
+            self.errcheck(self.status, self, args)
+        return self.returns
+
+
 @contextmanager
 def raw_vector(v):
     cv = v.vector_new()
@@ -38,6 +55,15 @@ def populated_raw_vector(v, collection):
         yield cv
 
 
+@contextmanager
+def temporary_path():
+    directory = tempfile.mkdtemp()
+    try:
+        yield os.path.join(directory, 'vector')
+    finally:
+        shutil.rmtree(directory)
+
+
 def patch(obj, **kwargs):
     for name, attr in kwargs.items():
         setattr(obj, name, attr)
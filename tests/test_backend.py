@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+import os
+from ctypes import c_long
+
+from nose.plugins.skip import SkipTest
+from nose.tools import assert_raises
+
+from pystl import backend
+from pystl.backend import (CtypesBackend, SpeedupsBackend, FUNCTIONS,
+                           CHECKED_FUNCTIONS, REDUCTIONS, load_backend)
+
+
+def load_speedups():
+    try:
+        return SpeedupsBackend()
+    except ImportError:
+        raise SkipTest('pystl._speedups is not built')
+
+
+class TestLoadBackend(object):
+    def teardown(self):
+        os.environ.pop('PYSTL_BACKEND', None)
+
+    def test_it_should_load_the_backend_by_name(self):
+        assert isinstance(load_backend('ctypes'), CtypesBackend)
+
+    def test_it_should_load_the_backend_named_in_the_environment(self):
+        os.environ['PYSTL_BACKEND'] = 'ctypes'
+
+        assert type(load_backend()) is CtypesBackend
+
+    def test_it_should_raise_value_error_with_unknown_backends(self):
+        with assert_raises(ValueError):
+            load_backend('unknown')
+
+    def test_it_should_load_the_fastest_available_backend_by_default(self):
+        try:
+            SpeedupsBackend()
+        except ImportError:
+            expected = CtypesBackend
+        else:
+            expected = SpeedupsBackend
+
+        assert type(load_backend()) is expected
+
+    def test_it_should_set_the_default_backend(self):
+        assert backend.backend.name in dict(backend.BACKENDS)
+
+
+class TestCtypesBackend(object):
+    def test_it_should_bind_all_the_functions(self):
+        functions = CtypesBackend().bind('long', c_long)
+
+        names = [name for name, _, _ in FUNCTIONS] + \
+            [name for name, _ in CHECKED_FUNCTIONS + REDUCTIONS]
+        assert sorted(functions) == sorted('vector_' + name for name in names)
+
+    def test_it_should_raise_index_error_from_checked_functions(self):
+        functions = CtypesBackend().bind('long', c_long)
+        vector = functions['vector_new']()
+
+        try:
+            with assert_raises(IndexError):
+                functions['vector_checked_at'](vector, 0)
+        finally:
+            functions['vector_delete'](vector)
+
+
+    def test_it_should_raise_type_error_for_arguments_of_other_types(self):
+        functions = CtypesBackend().bind('long', c_long)
+        vector = functions['vector_new']()
+
+        try:
+            with assert_raises(TypeError):
+                functions['vector_push_back'](vector, u'a')
+            with assert_raises(TypeError):
+                functions['vector_checked_at'](vector, u'a')
+        finally:
+            functions['vector_delete'](vector)
+
+    def test_it_should_raise_index_error_for_indexes_beyond_ssize_t(self):
+        functions = CtypesBackend().bind('long', c_long)
+        vector = functions['vector_new']()
+
+        try:
+            functions['vector_push_back'](vector, 5)
+            for index in (2 ** 63, 2 ** 64, -2 ** 63 - 1):
+                with assert_raises(IndexError):
+                    functions['vector_checked_at'](vector, index)
+                with assert_raises(IndexError):
+                    functions['vector_checked_insert'](vector, index, 1)
+            assert functions['vector_size'](vector) == 1
+        finally:
+            functions['vector_delete'](vector)
+
+    def test_it_should_raise_value_error_from_reductions_of_nothing(self):
+        functions = CtypesBackend().bind('long', c_long)
+        vector = functions['vector_new']()
+
+        try:
+            with assert_raises(ValueError):
+                functions['vector_min'](vector)
+        finally:
+            functions['vector_delete'](vector)
+
+
+class TestSpeedupsBackend(object):
+    def test_it_should_bind_all_the_functions(self):
+        functions = load_speedups().bind('long', c_long)
+
+        assert sorted(functions) == sorted(CtypesBackend().bind('long', c_long))
+
+    def test_it_should_replace_the_per_element_functions(self):
+        speedups = load_speedups()
+
+        functions = speedups.bind('long', c_long)
+
+        assert functions['vector_checked_at'] is speedups.module.long_checked_at
+        assert functions['vector_push_back'] is speedups.module.long_push_back
+
+    def test_it_should_keep_ctypes_for_the_bulk_functions(self):
+        functions = load_speedups().bind('long', c_long)
+
+        assert functions['vector_extend'].args == \
+            CtypesBackend().bind('long', c_long)['vector_extend'].args
+
+    def test_it_should_follow_the_ctypes_conventions(self):
+        functions = load_speedups().bind('long', c_long)
+        vector = functions['vector_new']()
+
+        try:
+            functions['vector_push_back'](vector, 5)
+            functions['vector_push_back'](vector, 2 ** 64 + 6)  # wraps around
+
+            assert functions['vector_size'](vector) == 2
+            assert functions['vector_checked_at'](vector, -1) == 6
+            assert functions['vector_checked_pop'](vector, 0) == 5
+            assert functions['vector_find'](vector, 7) == -1
+            with assert_raises(IndexError):
+                functions['vector_checked_set'](vector, 1, 0)
+            with assert_raises(TypeError):
+                functions['vector_push_back'](vector, 1.5)
+        finally:
+            functions['vector_delete'](vector)
+
+    def test_it_should_raise_index_error_when_popping_empty_vectors(self):
+        functions = load_speedups().bind('long', c_long)
+        vector = functions['vector_new']()
+
+        try:
+            with assert_raises(IndexError):
+                functions['vector_checked_pop'](vector, -1)
+        finally:
+            functions['vector_delete'](vector)
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+from nose.tools import assert_raises
+
+from pystl import engine, VectorLong
+
+
+class TestThreads(object):
+    def test_it_should_use_at_least_one_thread(self):
+        assert engine.get_threads() >= 1
+
+    def test_it_should_set_the_number_of_threads(self):
+        with engine.settings(threads=3):
+            assert engine.get_threads() == 3
+
+    def test_it_should_raise_value_error_with_no_threads(self):
+        with assert_raises(ValueError):
+            engine.set_threads(0)
+
+
+class TestThreshold(object):
+    def test_it_should_set_the_threshold(self):
+        with engine.settings(threshold=10):
+            assert engine.get_threshold() == 10
+
+    def test_it_should_raise_value_error_with_negative_thresholds(self):
+        with assert_raises(ValueError):
+            engine.set_threshold(-1)
+
+
+class TestSettings(object):
+    def test_it_should_restore_the_previous_settings(self):
+        threads, threshold = engine.get_threads(), engine.get_threshold()
+
+        with engine.settings(threads=threads + 1, threshold=threshold + 1):
+            pass
+
+        assert engine.get_threads() == threads
+        assert engine.get_threshold() == threshold
+
+    def test_it_should_restore_one_thread_per_cpu(self):
+        with engine.settings(threads=1):
+            engine.set_threads(None)
+            with engine.settings(threads=2):
+                pass
+
+            assert engine.lib.py_vector_parallel_get_threads_setting() == 0
+
+
+class TestConcurrency(object):
+    def test_it_should_run_from_many_python_threads_at_once(self):
+        vectors = [VectorLong(range(5000, 0, -1)) for _ in range(8)]
+
+        with engine.settings(threads=4, threshold=1):
+            threads = [threading.Thread(target=vector.sort) for vector in vectors]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        for vector in vectors:
+            assert vector.is_sorted()
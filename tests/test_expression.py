@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+import random
+
+from nose.tools import assert_raises
+
+from pystl import engine, VectorInt8, VectorLong, VectorDouble
+from pystl.expression import Expression
+from pystl.vector import VectorIterator
+
+
+class TestBuild(object):
+    def test_it_should_not_compute_anything_until_evaluated(self):
+        v = VectorLong([1, 2])
+
+        expression = v.lazy() * 3 + v
+
+        assert isinstance(expression, Expression)
+        assert len(expression) == 2
+
+    def test_it_should_take_vectors_and_scalars_on_both_sides(self):
+        v = VectorLong([1, 2])
+
+        assert isinstance(v + v.lazy(), Expression)
+        assert isinstance(1 - v.lazy(), Expression)
+
+    def test_it_should_raise_value_error_with_different_sizes(self):
+        with assert_raises(ValueError):
+            VectorLong([1, 2]).lazy() + VectorLong([1])
+
+    def test_it_should_raise_type_error_with_other_operands(self):
+        v = VectorLong([1, 2])
+
+        for other in (1.5, [1, 2], VectorInt8([1, 2]), u'a'):
+            with assert_raises(TypeError):
+                v.lazy() + other
+
+    def test_it_should_raise_type_error_with_bitwise_floating_operations(self):
+        with assert_raises(TypeError):
+            VectorDouble([1.0]).lazy() & 1
+
+    def test_it_should_represent_the_operations(self):
+        expression = (2 - VectorLong([1]).lazy()) * 3
+
+        assert repr(expression) == u'VectorLong.lazy(((2 - [1]) * 3))'
+
+
+class TestEvaluate(object):
+    def test_it_should_evaluate_like_the_eager_operators(self):
+        a = VectorLong(random.randint(-100, 100) for _ in range(5000))
+        b = VectorLong(random.randint(1, 100) for _ in range(5000))
+
+        expression = ((a.lazy() * 3 + b) % 7 - a // b) << 2 ^ b
+
+        assert expression.evaluate() == ((a * 3 + b) % 7 - a // b) << 2 ^ b
+
+    def test_it_should_evaluate_in_parallel(self):
+        a = VectorLong(range(5000))
+
+        with engine.settings(threads=4, threshold=1):
+            result = (a.lazy() + a * 2).evaluate()
+
+        assert list(result) == [3 * value for value in range(5000)]
+
+    def test_it_should_return_a_new_vector(self):
+        v = VectorLong([1, 2])
+
+        result = (v.lazy() + 1).evaluate()
+
+        assert type(result) is VectorLong and result is not v
+        assert list(result) == [2, 3]
+
+    def test_it_should_evaluate_a_bare_vector_into_a_copy(self):
+        v = VectorLong([1, 2])
+
+        assert list(v.lazy().evaluate()) == [1, 2]
+
+    def test_it_should_evaluate_into_one_of_its_vectors(self):
+        v = VectorLong([1, 2])
+
+        assert (v.lazy() * v + 1).evaluate(out=v) is v
+        assert list(v) == [2, 5]
+
+    def test_it_should_raise_zero_division_error(self):
+        with assert_raises(ZeroDivisionError):
+            (VectorLong([1]).lazy() // 0).evaluate()
+
+    def test_it_should_raise_value_error_if_a_vector_changed_size(self):
+        v = VectorLong([1, 2])
+        expression = v.lazy() + 1
+
+        v.append(3)
+
+        with assert_raises(ValueError):
+            expression.evaluate()
+
+    def test_it_should_operate_like_python_floats(self):
+        v = VectorDouble([7.5, -7.5])
+
+        assert list((v.lazy() % 2 + 0.5).evaluate()) == [2.0, 1.0]
+
+
+class TestIter(object):
+    def test_it_should_iterate_over_the_results_by_chunks(self):
+        v = VectorLong(range(10))
+        chunk_size, VectorIterator.chunk_size = VectorIterator.chunk_size, 3
+
+        try:
+            assert list(v.lazy() * 2) == [2 * value for value in range(10)]
+        finally:
+            VectorIterator.chunk_size = chunk_size
+
+
+class TestReductions(object):
+    def test_it_should_reduce_the_results(self):
+        v = VectorLong([3, -1, 2])
+        expression = v.lazy() * 2
+
+        assert expression.sum() == 8
+        assert expression.minmax() == (-2, 6)
+        assert expression.argmax() == 0
+        assert expression.mean() == 8 / 3.0
+
+    def test_it_should_reduce_block_by_block_like_the_evaluated_vector(self):
+        v = VectorLong(random.randint(-100, 100) for _ in range(1000))
+        expression = v.lazy() * 3 - 1
+        evaluated = expression.evaluate()
+        block_size, Expression.block_size = Expression.block_size, 64
+
+        try:
+            assert expression.sum() == evaluated.sum()
+            assert expression.mean() == evaluated.mean()
+            assert (expression.min(), expression.max()) == evaluated.minmax()
+            assert expression.minmax() == evaluated.minmax()
+            assert expression.argmin() == evaluated.argmin()
+            assert expression.argmax() == evaluated.argmax()
+        finally:
+            Expression.block_size = block_size
+
+    def test_it_should_find_the_first_position_on_ties(self):
+        v = VectorLong([1, 5, 0, 5, 0])
+        block_size, Expression.block_size = Expression.block_size, 2
+
+        try:
+            assert (v.lazy() + 0).argmin() == 2
+            assert (v.lazy() + 0).argmax() == 1
+        finally:
+            Expression.block_size = block_size
+
+    def test_it_should_wrap_around_sums_like_c(self):
+        v = VectorInt8([100, 100, 100])
+
+        assert (v.lazy() + 0).sum() == VectorInt8([100, 100, 100]).sum()
+        assert (v.lazy() + 0).sum(wide=True) == 300
+
+    def test_it_should_raise_value_error_reducing_empty_expressions(self):
+        expression = VectorLong().lazy() + 1
+
+        assert expression.sum() == 0
+        for reduction in (expression.min, expression.argmax, expression.mean):
+            with assert_raises(ValueError):
+                reduction()
@@ -1,11 +1,19 @@
 # -*- coding: utf-8 -*-
 
+import bisect
+import operator as op
+import pickle
+import random
+from array import array
 from collections import Iterable
+from ctypes import sizeof, c_int, c_long
 
+from nose.plugins.skip import SkipTest
 from nose.tools import assert_raises
 
-from pystl import vector
-from ._helpers import populated_raw_vector
+from pystl import backend, engine, vector
+from pystl.backend import CtypesBackend
+from ._helpers import populated_raw_vector, temporary_path
 
 
 class _TestConstructor(object):
@@ -70,6 +78,14 @@ class _TestGetItem(object):
         assert v[-1] == 2
 
 
+    def test_it_should_raise_index_error_if_index_is_out_of_range(self):
+        v = self.make_vector([1, 2])
+
+        for index in [2, -3, 1000]:
+            with assert_raises(IndexError):
+                v[index]
+
+
 class _TestGetItemSlice(object):
     def test_it_should_return_an_empty_list_when_slicing(self):
         v = self.make_vector()
@@ -116,6 +132,27 @@ class _TestGetItemSlice(object):
 
         assert v[0:5000:10] == [0, 10]
 
+    def test_it_should_behave_like_list_slicing(self):
+        l = range(20)
+        v = self.make_vector(l)
+
+        for sliced in [slice(None, None, -3), slice(-3, 2, -2), slice(3, -3, 4),
+                       slice(-100, 100, 7), slice(5, 5), slice(2, 10, 100)]:
+            assert v[sliced] == l[sliced]
+
+    def test_it_should_return_a_vector_of_the_same_type_if_asked_to(self):
+        v = self.make_vector(range(10))
+
+        sliced = v.getslice(slice(8, None, -2), as_vector=True)
+
+        assert type(sliced) is type(v)
+        assert list(sliced) == [8, 6, 4, 2, 0]
+
+    def test_it_should_return_an_empty_vector_if_nothing_is_selected(self):
+        v = self.make_vector(range(10))
+
+        assert list(v.getslice(slice(5, 2), as_vector=True)) == []
+
 
 class _TestSetItem(object):
     def test_set_non_existing_position_should_raise_index_error(self):
@@ -124,6 +161,19 @@ class _TestSetItem(object):
         with assert_raises(IndexError):
             assert v[0]
 
+    def test_set_negative_position_should_change_from_the_back(self):
+        v = self.make_vector(range(10))
+
+        v[-2] = 500
+
+        assert v[8] == 500
+
+    def test_set_out_of_range_negative_position_should_raise_index_error(self):
+        v = self.make_vector(range(10))
+
+        with assert_raises(IndexError):
+            v[-11] = 1
+
     def test_set_existing_position_should_change_its_value(self):
         v = self.make_vector(range(10))
 
@@ -132,6 +182,60 @@ class _TestSetItem(object):
         assert v[5] == 500
 
 
+class _TestSetItemSlice(object):
+    def test_it_should_behave_like_list_slice_assignment(self):
+        for sliced, values in [(slice(2, 5), [10, 11, 12]),
+                               (slice(2, 5), [10]),
+                               (slice(2, 5), [10, 11, 12, 13, 14, 15]),
+                               (slice(5, 2), [10, 11]),
+                               (slice(None), []),
+                               (slice(-3, None), [1, 2, 3, 4]),
+                               (slice(100, 200), [1, 2]),
+                               (slice(None, None, 2), range(5)),
+                               (slice(None, None, -3), range(4))]:
+            l = range(10)
+            v = self.make_vector(l)
+
+            l[sliced] = values
+            v[sliced] = values
+
+            assert list(v) == l
+
+    def test_it_should_assign_from_another_vector(self):
+        v = self.make_vector(range(5))
+
+        v[1:3] = self.make_vector([7, 8, 9])
+
+        assert list(v) == [0, 7, 8, 9, 3, 4]
+
+    def test_it_should_assign_from_itself(self):
+        v, l = self.make_vector(range(5)), range(5)
+
+        v[1:2] = v
+        l[1:2] = l[:]
+
+        assert list(v) == l
+
+    def test_it_should_assign_itself_reversed(self):
+        v = self.make_vector(range(5))
+
+        v[::-1] = v
+
+        assert list(v) == [4, 3, 2, 1, 0]
+
+    def test_it_should_raise_value_error_on_extended_slice_size_mismatch(self):
+        v = self.make_vector(range(10))
+
+        with assert_raises(ValueError):
+            v[::2] = [1, 2]
+
+    def test_it_should_raise_type_error_when_assigning_a_non_iterable(self):
+        v = self.make_vector(range(10))
+
+        with assert_raises(TypeError):
+            v[1:2] = 5
+
+
 class _TestIter(object):
     def test_it_should_be_iterable(self):
         v = self.make_vector()
@@ -160,6 +264,18 @@ class _TestIter(object):
 
         assert list(iterable) == range(10)
 
+    def test_it_should_iterate_over_several_chunks(self):
+        v = self.make_vector(range(10000))
+
+        assert list(v) == range(10000)
+
+    def test_it_should_raise_runtime_error_if_size_changes(self):
+        v = self.make_vector(range(10000))
+
+        with assert_raises(RuntimeError):
+            for value in v:
+                v.append(value)
+
 
 class _TestDelItem(object):
     def test_it_should_raise_index_error_with_non_existing_index(self):
@@ -273,6 +389,192 @@ class _TestExtend(object):
         assert v[5:8] == [5, 6, 7]
         assert len(v) == 8
 
+    def test_it_should_extend_from_another_vector(self):
+        v = self.make_vector(range(5))
+
+        v.extend(self.make_vector(range(5, 10)))
+
+        assert list(v) == range(10)
+
+    def test_it_should_extend_from_itself(self):
+        v = self.make_vector(range(5))
+
+        v.extend(v)
+
+        assert list(v) == range(5) * 2
+
+    def test_it_should_extend_from_an_array_of_the_same_type(self):
+        v = self.make_vector(range(5))
+
+        v.extend(array(v.value_type._type_, range(5, 10)))
+
+        assert list(v) == range(10)
+
+    def test_it_should_extend_from_an_array_of_other_type(self):
+        v = self.make_vector(range(5))
+
+        v.extend(array('h', range(5, 10)))
+
+        assert list(v) == range(10)
+
+    def test_it_should_extend_from_raw_bytes(self):
+        v = self.make_vector()
+        values = array(v.value_type._type_, [1, -2, 3])
+
+        v.extend(values.tostring())
+
+        assert list(v) == [1, -2, 3]
+
+    def test_it_should_extend_from_a_memoryview(self):
+        v = self.make_vector()
+
+        v.extend(memoryview(bytearray(array(v.value_type._type_, [1, 2]).tostring())))
+
+        assert list(v) == [1, 2]
+
+
+class _TestCapacity(object):
+    def test_it_should_reserve_capacity_at_construction(self):
+        v = self.make_vector(capacity=1000)
+
+        assert len(v) == 0
+        assert v.capacity() >= 1000
+
+    def test_it_should_not_reallocate_within_the_reserved_capacity(self):
+        v = self.make_vector()
+        v.reserve(1000)
+        data = v.vector_data(v.vector)
+
+        v.extend(range(1000))
+
+        assert v.vector_data(v.vector) == data
+
+    def test_it_should_shrink_the_capacity_to_the_size(self):
+        v = self.make_vector(range(1000))
+        del v[10:]
+
+        v.shrink_to_fit()
+
+        assert v.capacity() == 10
+        assert list(v) == range(10)
+
+    def test_it_should_raise_memory_error_when_reserving_too_much(self):
+        v = self.make_vector()
+
+        with assert_raises(MemoryError):
+            v.reserve(2 ** 62)
+
+
+class _TestResize(object):
+    def test_it_should_grow_filling_with_zeros(self):
+        v = self.make_vector([1, 2])
+
+        v.resize(4)
+
+        assert list(v) == [1, 2, 0, 0]
+
+    def test_it_should_grow_filling_with_the_given_value(self):
+        v = self.make_vector([1, 2])
+
+        v.resize(4, fill=7)
+
+        assert list(v) == [1, 2, 7, 7]
+
+    def test_it_should_shrink_dropping_the_last_elements(self):
+        v = self.make_vector(range(10))
+
+        v.resize(3)
+
+        assert list(v) == [0, 1, 2]
+
+
+class _TestView(object):
+    def test_it_should_view_all_the_elements(self):
+        v = self.make_vector(range(10))
+
+        view = v.view()
+
+        assert len(view) == 10
+        assert view.itemsize == sizeof(v.value_type)
+
+    def test_it_should_view_an_empty_vector(self):
+        v = self.make_vector()
+
+        assert len(v.view()) == 0
+
+    def test_it_should_share_the_vector_memory(self):
+        v = self.make_vector(range(10))
+        view = v.view()
+
+        v[5] = 500
+
+        assert array(v.value_type._type_, view.tobytes())[5] == 500
+
+    def test_it_should_write_into_the_vector(self):
+        v = self.make_vector([0, 0])
+
+        v.view()[:] = self.make_vector([1, 2]).view()
+
+        assert list(v) == [1, 2]
+
+    def test_it_should_keep_the_vector_alive(self):
+        view = self.make_vector(range(10)).view()
+
+        assert array(self.make_vector().value_type._type_, view.tobytes()) \
+            == array('l', range(10))
+
+
+class _TestToBytes(object):
+    def test_it_should_return_the_raw_elements(self):
+        v = self.make_vector([1, -2, 3])
+
+        assert v.tobytes() == array(v.value_type._type_, [1, -2, 3]).tostring()
+
+    def test_it_should_return_empty_bytes_if_empty(self):
+        v = self.make_vector()
+
+        assert v.tobytes() == b''
+
+
+class _TestArrayInterface(object):
+    def test_it_should_describe_the_vector_shape(self):
+        v = self.make_vector(range(10))
+
+        assert v.__array_interface__['shape'] == (10,)
+
+    def test_it_should_describe_the_element_type(self):
+        v = self.make_vector()
+
+        typestr = v.__array_interface__['typestr']
+
+        assert typestr[1:] == 'i{}'.format(sizeof(v.value_type))
+
+    def test_it_should_point_to_the_vector_storage(self):
+        v = self.make_vector(range(10))
+
+        assert v.__array_interface__['data'] == (v.vector_data(v.vector), False)
+
+    def test_it_should_share_memory_with_numpy_arrays(self):
+        try:
+            import numpy
+        except ImportError:
+            raise SkipTest('numpy is not installed')
+        v = self.make_vector(range(10))
+
+        a = numpy.asarray(v)
+        a[0] = 100
+
+        assert a.tolist() == list(v)
+        assert v[0] == 100
+
+    def test_it_should_convert_empty_vectors_to_numpy_arrays(self):
+        try:
+            import numpy
+        except ImportError:
+            raise SkipTest('numpy is not installed')
+
+        assert numpy.asarray(self.make_vector()).tolist() == []
+
 
 class _TestIndex(object):
     def test_it_should_return_the_position_of_a_value(self):
@@ -381,6 +683,554 @@ class _TestSort(object):
 
         assert list(v) == [0, 1, 2, 3, 4, 5]
 
+    def test_it_should_sort_with_every_algorithm(self):
+        wide = [random.randint(-10 ** 9, 10 ** 9) for _ in range(5000)]
+        narrow = [random.randint(-50, 50) for _ in range(5000)]
+
+        for l in (wide, narrow, narrow[:10]):
+            for algorithm in ('auto', 'introsort', 'radix', 'counting'):
+                v = self.make_vector(l)
+                v.sort(algorithm=algorithm)
+                assert list(v) == sorted(l), algorithm
+
+                v.sort(reverse=True, algorithm=algorithm)
+                assert list(v) == sorted(l, reverse=True), algorithm
+
+    def test_it_should_raise_value_error_for_unknown_algorithms(self):
+        with assert_raises(ValueError):
+            self.make_vector([1]).sort(algorithm='bogo')
+
+    def test_it_should_sort_the_vector_descendent(self):
+        l = [random.randint(-100, 100) for _ in range(100)]
+        v, w = self.make_vector(l), self.make_vector(l)
+
+        v.sort(reverse=True)
+        w.sort(reverse=True, stable=True)
+
+        assert list(v) == list(w) == sorted(l, reverse=True)
+
+    def test_it_should_sort_the_first_elements(self):
+        l = [random.randint(-100, 100) for _ in range(100)]
+        v = self.make_vector(l)
+
+        v.partial_sort(10)
+
+        assert list(v)[:10] == sorted(l)[:10]
+        assert sorted(v) == sorted(l)
+
+    def test_it_should_put_the_nth_element_in_place(self):
+        l = [random.randint(-100, 100) for _ in range(100)]
+        v = self.make_vector(l)
+
+        assert v.nth_element(30) == sorted(l)[30]
+        assert max(v[:30]) <= v[30] <= min(v[31:])
+        assert v.nth_element(-1) == max(l)
+
+    def test_it_should_get_the_positions_which_sort_it(self):
+        l = [random.randint(-10, 10) for _ in range(100)]
+        v = self.make_vector(l)
+
+        positions = v.argsort(stable=True)
+
+        assert type(positions) is vector.VectorLong
+        assert list(positions) == sorted(range(100), key=l.__getitem__)
+        assert list(v.take(v.argsort())) == sorted(l)
+        assert list(v.argsort(reverse=True, stable=True)) == \
+            sorted(range(100), key=lambda index: -l[index])
+
+    def test_it_should_get_the_top_k_elements(self):
+        l = [random.randint(-10, 10) for _ in range(100)]
+        v = self.make_vector(l)
+        ranked = sorted(enumerate(l), key=lambda item: (-item[1], item[0]))
+
+        values, positions = v.topk(10)
+
+        assert list(values) == [value for _, value in ranked[:10]]
+        assert list(positions) == [index for index, _ in ranked[:10]]
+        assert list(v.topk(3, largest=False)[0]) == sorted(l)[:3]
+        assert list(v.topk(0)[0]) == []
+        assert list(v.topk(200)[0]) == sorted(l, reverse=True)
+
+    def test_it_should_get_the_top_k_elements_in_parallel(self):
+        l = [random.randint(-100, 100) for _ in range(1000)]
+        v = self.make_vector(l)
+
+        expected = v.topk(50)
+        with engine.settings(threads=4, threshold=0):
+            values, positions = v.topk(50)
+            assert list(v.argsort(stable=True)) == sorted(range(1000), key=l.__getitem__)
+
+        assert list(values) == list(expected[0])
+        assert list(positions) == list(expected[1])
+
+
+class _TestSorted(object):
+    def test_it_should_bisect_like_the_bisect_module(self):
+        values = [0, 1, 1, 1, 3, 5]
+        v = self.make_vector(values)
+
+        for value in range(-1, 7):
+            assert v.bisect_left(value) == bisect.bisect_left(values, value)
+            assert v.bisect_right(value) == bisect.bisect_right(values, value)
+            assert v.bisect_left(value, 2, 4) == \
+                bisect.bisect_left(values, value, 2, 4)
+            assert v.bisect_left(value, 3, 1) == bisect.bisect_left(values, value, 3, 1)
+            assert v.bisect_right(value, 8) == bisect.bisect_right(values, value, 8)
+
+    def test_it_should_insert_keeping_the_order(self):
+        v = self.make_vector(track_sorted=True)
+
+        for value in [3, 1, 2, 1]:
+            v.insort(value)
+
+        assert list(v) == [1, 1, 2, 3]
+        assert v.is_sorted()
+
+    def test_it_should_search_sorted_vectors(self):
+        v = self.make_vector([5, 1, 3, 3, 0], track_sorted=True)
+
+        v.sort()
+
+        assert v.sorted
+        assert 3 in v and 2 not in v and 6 not in v
+        assert v.index(3) == 2
+        assert v.count(3) == 2 and v.count(4) == 0
+        with assert_raises(ValueError):
+            v.index(4)
+
+    def test_it_should_stay_sorted_when_removing(self):
+        v = self.make_vector([5, 1, 3, 3, 0], track_sorted=True)
+        v.sort()
+
+        v.remove(3)
+        v.pop(0)
+        del v[0]
+
+        assert v.sorted
+        assert list(v) == [3, 5]
+        assert v.index(5) == 1
+
+    def test_it_should_search_linearly_after_breaking_the_order(self):
+        v = self.make_vector([1, 2, 3], track_sorted=True)
+        v.sort()
+
+        v.append(0)
+
+        assert not v.sorted and not v.is_sorted()
+        assert 0 in v
+        assert v.index(0) == 3
+
+
+class _TestSetAlgebra(object):
+    def test_it_should_combine_sorted_vectors_like_multisets(self):
+        left, right = [1, 2, 2, 4, 7], [2, 3, 4, 4]
+        v, w = self.make_vector(left), self.make_vector(right)
+
+        assert list(v.union(w)) == [1, 2, 2, 3, 4, 4, 7]
+        assert list(v.intersection(w)) == [2, 4]
+        assert list(v.difference(w)) == [1, 2, 7]
+        assert list(v.symmetric_difference(w)) == [1, 2, 3, 4, 7]
+        assert list(v.merge(w)) == sorted(left + right)
+
+    def test_it_should_accept_other_collections(self):
+        v = self.make_vector([1, 3])
+
+        assert list(v.union([2])) == [1, 2, 3]
+        assert list(v.intersection(array('l', [3]))) == [3]
+
+    def test_it_should_write_into_one_of_the_operands(self):
+        v, w = self.make_vector([1, 3]), self.make_vector([2, 3])
+
+        assert v.union(w, out=v) is v
+        w.merge(w, out=w)
+
+        assert list(v) == [1, 2, 3]
+        assert list(w) == [2, 2, 3, 3]
+
+    def test_it_should_know_whether_it_includes_another(self):
+        v = self.make_vector([1, 2, 2, 5])
+
+        assert v.includes(self.make_vector([2, 2, 5]))
+        assert v.includes([])
+        assert not v.includes([2, 2, 2])
+        assert not v.includes([3])
+
+    def test_it_should_merge_many_sorted_vectors(self):
+        runs = [sorted(random.randint(-50, 50) for _ in range(random.randint(0, 30)))
+                for _ in range(9)]
+        vector_type = type(self.make_vector())
+
+        assert list(vector_type.merge_many(runs)) == sorted(sum(runs, []))
+        with engine.settings(threads=4, threshold=0):
+            assert list(vector_type.merge_many(runs)) == sorted(sum(runs, []))
+        assert list(vector_type.merge_many([])) == []
+
+    def test_it_should_mark_the_result_as_sorted_if_tracked(self):
+        v = self.make_vector([1, 2])
+        out = type(v)(track_sorted=True)
+
+        v.union([3], out=out)
+
+        assert out.sorted
+
+
+class _TestCounting(object):
+    def test_it_should_get_the_unique_elements_sorted(self):
+        v = self.make_vector([3, 1, 3, 2, 1])
+
+        assert list(v.unique()) == [1, 2, 3]
+        assert list(self.make_vector().unique()) == []
+
+    def test_it_should_get_the_unique_elements_in_order(self):
+        l = [random.randint(-20, 20) for _ in range(200)]
+        v = self.make_vector(l)
+
+        expected = []
+        for value in l:
+            if value not in expected:
+                expected.append(value)
+
+        assert list(v.unique(keep_order=True)) == expected
+
+    def test_it_should_count_the_values(self):
+        l = [random.randint(-20, 20) for _ in range(200)]
+        v = self.make_vector(l)
+
+        values, counts = v.value_counts()
+
+        assert list(values) == sorted(set(l))
+        assert list(counts) == [l.count(value) for value in values]
+        assert type(counts) is vector.VectorLong
+
+    def test_it_should_count_integers_into_bins(self):
+        v = self.make_vector([1, 3, 1, 0])
+
+        assert list(v.bincount()) == [1, 2, 0, 1]
+        assert list(v.bincount(minlength=6)) == [1, 2, 0, 1, 0, 0]
+        assert list(self.make_vector().bincount()) == []
+
+    def test_it_should_raise_value_error_counting_negative_values(self):
+        with assert_raises(ValueError):
+            self.make_vector([1, -1]).bincount()
+
+    def test_it_should_raise_memory_error_counting_too_many_bins(self):
+        with assert_raises(MemoryError):
+            self.make_vector([10 ** 13]).bincount()
+
+    def test_it_should_make_histograms_of_the_same_width(self):
+        v = self.make_vector([1, 2, 2, 3, 7])
+
+        counts, edges = v.histogram(3)
+
+        assert list(edges) == [1.0, 3.0, 5.0, 7.0]
+        assert list(counts) == [3, 1, 1]
+
+    def test_it_should_make_histograms_with_a_range(self):
+        v = self.make_vector([1, 2, 2, 3, 7])
+
+        counts, edges = v.histogram(2, range=(2, 4))
+
+        assert list(edges) == [2.0, 3.0, 4.0]
+        assert list(counts) == [2, 1]
+
+    def test_it_should_make_histograms_with_given_edges(self):
+        v = self.make_vector(range(10))
+
+        counts, edges = v.histogram([0, 1, 5, 9])
+
+        assert list(counts) == [1, 4, 5]
+        with assert_raises(ValueError):
+            v.histogram([3, 1])
+
+    def test_it_should_make_histograms_in_parallel(self):
+        v = self.make_vector(random.randint(-1000, 1000) for _ in range(1000))
+
+        counts, edges = v.histogram(7)
+        with engine.settings(threads=4, threshold=0):
+            assert list(v.histogram(7)[0]) == list(counts)
+            assert list(v.histogram(list(edges))[0]) == list(counts)
+        assert sum(counts) == len(v)
+
+
+class _TestSearchSorted(object):
+    def test_it_should_find_positions_like_bisect(self):
+        values = sorted(random.randint(0, 50) for _ in range(100))
+        queries = [random.randint(-5, 55) for _ in range(200)]
+        v = self.make_vector(values)
+
+        for side, search in [('left', bisect.bisect_left),
+                             ('right', bisect.bisect_right)]:
+            expected = [search(values, query) for query in queries]
+            assert list(v.searchsorted(queries, side)) == expected
+            assert list(v.searchsorted(sorted(queries), side)) == sorted(expected)
+
+    def test_it_should_return_a_long_vector(self):
+        v = self.make_vector([1, 3, 5])
+
+        positions = v.searchsorted(self.make_vector([5, 0]))
+
+        assert isinstance(positions, vector.VectorLong)
+        assert list(positions) == [2, 0]
+
+    def test_it_should_write_into_a_given_vector(self):
+        v = self.make_vector([1, 3, 5])
+        out = vector.VectorLong([9] * 5)
+
+        assert v.searchsorted([2, 6], out=out) is out
+        assert list(out) == [1, 3]
+
+    def test_it_should_write_into_a_given_buffer(self):
+        v = self.make_vector([1, 3, 5])
+        out = array('l', [0, 0])
+
+        v.searchsorted([3, 4], side='right', out=out)
+
+        assert list(out) == [2, 2]
+
+    def test_it_should_raise_value_error_if_the_buffer_is_too_small(self):
+        v = self.make_vector([1, 3, 5])
+
+        with assert_raises(ValueError):
+            v.searchsorted([3, 4], out=array('l', [0]))
+
+    def test_it_should_raise_type_error_with_other_output_types(self):
+        v = self.make_vector([1, 3, 5])
+
+        with assert_raises(TypeError):
+            v.searchsorted([3], out=vector.VectorInt8())
+
+    def test_it_should_raise_value_error_with_unknown_sides(self):
+        with assert_raises(ValueError):
+            self.make_vector().searchsorted([1], side='middle')
+
+
+class _TestReductions(object):
+    def test_it_should_reduce_like_python(self):
+        values = [random.randint(-100, 100) for _ in range(1000)]
+        v = self.make_vector(values)
+
+        assert v.sum() == sum(values)
+        assert v.min() == min(values)
+        assert v.max() == max(values)
+        assert v.minmax() == (min(values), max(values))
+        assert v.argmin() == values.index(min(values))
+        assert v.argmax() == values.index(max(values))
+        assert v.mean() == sum(values) / float(len(values))
+
+    def test_it_should_return_python_scalars(self):
+        v = self.make_vector([1, 2])
+
+        assert type(v.sum()) is int
+        assert type(v.min()) is int
+        assert type(v.argmax()) is int
+
+    def test_it_should_sum_nothing_to_zero(self):
+        assert self.make_vector().sum() == 0
+
+    def test_it_should_raise_value_error_when_reducing_nothing(self):
+        v = self.make_vector()
+
+        for reduction in (v.min, v.max, v.minmax, v.argmin, v.argmax, v.mean):
+            with assert_raises(ValueError):
+                reduction()
+
+
+class _TestParallel(object):
+    def test_it_should_get_the_same_results_in_parallel(self):
+        values = [random.randint(-50, 50) for _ in range(1001)]
+        v, w = self.make_vector(values), self.make_vector(values)
+
+        with engine.settings(threads=4, threshold=1):
+            v.sort()
+            results = (v.sum(), v.minmax(), v.count(7), 7 in v,
+                       w.argmin(), w.argmax(), w.index(values[-1]))
+
+        assert list(v) == sorted(values)
+        assert results == (sum(values), (min(values), max(values)),
+                           values.count(7), 7 in values,
+                           values.index(min(values)), values.index(max(values)),
+                           values.index(values[-1]))
+
+    def test_it_should_sort_stably_in_parallel(self):
+        v = self.make_vector([3, 1, 2] * 5)
+
+        with engine.settings(threads=7, threshold=1):
+            v.sort()
+
+        assert list(v) == [1] * 5 + [2] * 5 + [3] * 5
+
+
+class _TestOperators(object):
+    def test_it_should_operate_like_python_integers(self):
+        left = [random.randint(-100, 100) for _ in range(100)]
+        right = [random.choice([-3, -2, -1, 1, 2, 3]) for _ in range(100)]
+        v, w = self.make_vector(left), self.make_vector(right)
+
+        for operator in (op.add, op.sub, op.mul, op.floordiv, op.mod,
+                         op.and_, op.or_, op.xor):
+            expected = list(map(operator, left, right))
+            assert list(operator(v, w)) == expected, operator
+            assert list(operator(v, 3)) == [operator(a, 3) for a in left]
+            assert list(operator(3, w)) == [operator(3, b) for b in right]
+
+    def test_it_should_shift(self):
+        v = self.make_vector([1, -8, 5])
+
+        assert list(v << 2) == [4, -32, 20]
+        assert list(v >> self.make_vector([0, 1, 2])) == [1, -4, 1]
+        assert list(1 << self.make_vector([0, 3])) == [1, 8]
+
+    def test_it_should_return_a_new_vector(self):
+        v = self.make_vector([1, 2])
+
+        result = v + 1
+
+        assert type(result) is type(v) and result is not v
+        assert list(v) == [1, 2]
+
+    def test_it_should_operate_in_place(self):
+        v = self.make_vector([1, 2])
+        original = v
+
+        v += 3
+        v *= self.make_vector([2, 3])
+        v -= v
+
+        assert v is original
+        assert list(v) == [0, 0]
+
+    def test_it_should_operate_into_a_given_vector(self):
+        v, out = self.make_vector([1, 2]), self.make_vector([9] * 5)
+
+        assert v.operate(backend.ADD, 1, out=out) is out
+        assert list(out) == [2, 3]
+
+    def test_it_should_raise_value_error_with_different_sizes(self):
+        with assert_raises(ValueError):
+            self.make_vector([1, 2]) + self.make_vector([1])
+
+    def test_it_should_raise_zero_division_error(self):
+        v = self.make_vector([4, 2])
+
+        with assert_raises(ZeroDivisionError):
+            v // self.make_vector([1, 0])
+        with assert_raises(ZeroDivisionError):
+            v %= 0
+
+        assert list(v) == [4, 2]
+
+    def test_it_should_raise_value_error_with_negative_shifts(self):
+        with assert_raises(ValueError):
+            self.make_vector([4]) >> -1
+
+    def test_it_should_raise_type_error_with_other_operands(self):
+        v = self.make_vector([1, 2])
+
+        for other in ([1, 2], 1.5, vector.VectorInt8([1, 2]), 'a'):
+            with assert_raises(TypeError):
+                v + other
+
+
+class _TestSelection(object):
+    def test_it_should_compare_elementwise_into_a_mask(self):
+        v, w = self.make_vector([1, 5, 3]), self.make_vector([2, 5, 1])
+
+        assert isinstance(v > 2, vector.Mask)
+        assert list(v > 2) == [0, 1, 1]
+        assert list(v <= w) == [1, 1, 0]
+        assert list(v.eq(w)) == [0, 1, 0]
+        assert list(v.ne(3)) == [1, 1, 0]
+        assert list(v >= 3) == list(~(v < 3))
+
+    def test_it_should_keep_list_equality(self):
+        v = self.make_vector([1, 2])
+
+        assert v == self.make_vector([1, 2])
+        assert not (v != self.make_vector([1, 2]))
+
+    def test_it_should_select_with_a_mask(self):
+        v = self.make_vector(range(10))
+
+        selected = v[(v > 2) & (v < 6)]
+
+        assert type(selected) is type(v)
+        assert list(selected) == [3, 4, 5]
+        assert list(v.filter([True, False] * 5)) == list(range(0, 10, 2))
+
+    def test_it_should_raise_value_error_with_a_mask_of_other_size(self):
+        with assert_raises(ValueError):
+            self.make_vector([1, 2]).filter([True])
+
+    def test_it_should_take_by_indexes(self):
+        v = self.make_vector([10, 20, 30])
+
+        assert list(v[vector.VectorLong([2, -3, 2])]) == [30, 10, 30]
+        assert list(v.take([])) == []
+
+    def test_it_should_raise_index_error_taking_out_of_range(self):
+        v = self.make_vector([10, 20, 30])
+
+        for index in (3, -4):
+            with assert_raises(IndexError):
+                v.take([0, index])
+
+    def test_it_should_raise_index_error_for_indices_beyond_long(self):
+        v = self.make_vector([1, 2])
+
+        for index in (2 ** 64, 2 ** 64 + 1, -2 ** 64):
+            with assert_raises(IndexError):
+                v.take([index])
+            with assert_raises(IndexError):
+                v.put([index], 3)
+        assert list(v) == [1, 2]
+
+    def test_it_should_put_by_indexes(self):
+        v = self.make_vector([0] * 4)
+
+        v.put([1, -1], 7)
+        v.put(vector.VectorLong([0, 0]), [5, 6])
+
+        assert list(v) == [6, 7, 0, 7]
+
+    def test_it_should_not_put_anything_if_any_index_is_out_of_range(self):
+        v = self.make_vector([0] * 4)
+
+        with assert_raises(IndexError):
+            v.put([0, 4], 1)
+
+        assert list(v) == [0] * 4
+
+    def test_it_should_select_in_parallel(self):
+        v = self.make_vector(range(1000))
+
+        with engine.settings(threads=4, threshold=0):
+            assert list(v[v.ge(500)]) == list(range(500, 1000))
+            assert list(v.take(range(999, -1, -1))) == list(range(999, -1, -1))
+            assert list(v[v < 0]) == []
+
+
+class _TestFiles(object):
+    def test_it_should_open_saved_vectors(self):
+        v = self.make_vector(range(100))
+
+        with temporary_path() as path:
+            v.save(path)
+            opened = type(v).open(path)
+
+            assert type(opened) is type(v)
+            assert opened == v
+
+    def test_it_should_open_empty_vectors(self):
+        v = self.make_vector()
+
+        with temporary_path() as path:
+            v.save(path)
+            opened = type(v).open(path, 'r+')
+            opened.append(1)
+            opened.close()
+
+            assert list(type(v).open(path)) == [1]
+
 
 class _TestReverse(object):
     def test_it_should_reverse_the_vector_in_place(self):
@@ -435,14 +1285,306 @@ class _TestNotEqual(object):
         assert not (v != [])
 
 
+class _TestArgumentTypes(object):
+    def test_it_should_raise_type_error_for_values_of_other_types(self):
+        v = self.make_vector([1, 2])
+
+        for operation in (lambda: v.__setitem__(0, u'a'), lambda: v.append(None),
+                          lambda: v.insert(0, u'a'), lambda: v.resize(3, u'a'),
+                          lambda: v.index(u'a'), lambda: v.count(u'a'),
+                          lambda: u'a' in v, lambda: v[u'a']):
+            with assert_raises(TypeError):
+                operation()
+        assert list(v) == [1, 2]
+
+    def test_it_should_raise_index_error_for_indexes_beyond_ssize_t(self):
+        v = self.make_vector([1, 2])
+
+        for index in (2 ** 63, 2 ** 64, 2 ** 64 + 1, -2 ** 64):
+            for operation in (lambda: v[index], lambda: v.__setitem__(index, 3),
+                              lambda: v.__delitem__(index), lambda: v.pop(index),
+                              lambda: v.insert(index, 3)):
+                with assert_raises(IndexError):
+                    operation()
+        assert list(v) == [1, 2]
+
+
 class _Tests(_TestConstructor, _TestLen, _TestGetItem, _TestGetItemSlice,
-             _TestSetItem, _TestIter, _TestDelItem, _TestDelSlice, _TestStr,
-             _TestInsert, _TestAppend, _TestExtend, _TestIndex, _TestPop,
-             _TestRemove, _TestCount, _TestSort, _TestReverse, _TestEqual,
-             _TestNotEqual):
+             _TestSetItem, _TestSetItemSlice, _TestIter, _TestDelItem, _TestDelSlice, _TestStr,
+             _TestInsert, _TestAppend, _TestExtend, _TestCapacity,
+             _TestResize, _TestView, _TestToBytes,
+             _TestArrayInterface, _TestIndex, _TestPop,
+             _TestRemove, _TestCount, _TestSort, _TestSorted,
+             _TestSetAlgebra, _TestCounting, _TestSearchSorted, _TestReductions, _TestParallel,
+             _TestOperators, _TestSelection, _TestFiles, _TestReverse,
+             _TestEqual, _TestNotEqual, _TestArgumentTypes):
     pass
 
 
+class _TestValueType(object):
+    """Tests for any value type, using small positive values"""
+
+    def test_it_should_hold_its_minimum_and_maximum_values(self):
+        v = self.make_vector([self.minimum, self.maximum])
+
+        assert list(v) == [self.minimum, self.maximum]
+
+    def test_it_should_behave_like_a_list(self):
+        v = self.make_vector([3, 1, 2])
+
+        v.append(4)
+        v[0] = 5
+        v.insert(1, 6)
+        v.extend(self.make_vector([7, 8]))
+
+        assert list(v) == [5, 6, 1, 2, 4, 7, 8]
+        assert v.pop() == 8
+        assert v.index(2) == 3
+        assert v.count(6) == 1
+        assert 4 in v
+
+    def test_it_should_sort_and_reverse(self):
+        v = self.make_vector([3, 1, 2])
+
+        v.sort()
+        assert list(v) == [1, 2, 3]
+
+        v.reverse()
+        assert list(v) == [3, 2, 1]
+
+    def test_it_should_reduce(self):
+        v = self.make_vector([self.maximum, self.minimum, self.maximum])
+
+        assert v.minmax() == (self.minimum, self.maximum)
+        assert v.argmin() == 1 and v.argmax() == 0
+        assert v.sum(wide=True) == self.maximum + (self.maximum + self.minimum)
+
+    def test_it_should_slice(self):
+        v = self.make_vector(range(10))
+
+        assert v[1:8:3] == [1, 4, 7]
+        assert list(v.getslice(slice(1, 8, 3), as_vector=True)) == [1, 4, 7]
+
+    def test_it_should_extend_from_an_array_of_the_same_type(self):
+        v = self.make_vector()
+
+        v.extend(array(v.value_type._type_, [self.minimum, self.maximum]))
+
+        assert list(v) == [self.minimum, self.maximum]
+
+    def test_it_should_export_its_element_size(self):
+        v = self.make_vector(range(3))
+
+        assert len(v.tobytes()) == 3 * self.itemsize
+        assert v.__array_interface__['typestr'][1:] == self.typestr
+
+
+    def test_it_should_pickle_its_elements(self):
+        v = self.make_vector([self.minimum, 1, self.maximum])
+
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            unpickled = pickle.loads(pickle.dumps(v, protocol))
+            assert type(unpickled) is type(v), protocol
+            assert list(unpickled) == list(v), protocol
+
+    def test_it_should_pickle_its_elements_out_of_band(self):
+        if pickle.HIGHEST_PROTOCOL < 5:
+            raise SkipTest('pickle protocol 5 is not available')
+        v = self.make_vector([self.minimum, 1, self.maximum])
+        buffers = []
+
+        data = pickle.dumps(v, 5, buffer_callback=buffers.append)
+
+        assert len(buffers) == 1
+        assert bytes(buffers[0]) == v.tobytes()
+        assert list(pickle.loads(data, buffers=buffers)) == list(v)
+
+
+class _TestIntegerValueType(_TestValueType):
+    def test_it_should_wrap_around_sums_like_c(self):
+        v = self.make_vector([self.maximum, 1])
+
+        assert v.sum() == self.minimum
+
+    def test_it_should_wrap_around_operations_like_c(self):
+        v = self.make_vector([self.maximum, self.minimum])
+
+        assert list(v + 1) == [self.minimum, self.minimum + 1]
+        assert list(v - 1) == [self.maximum - 1, self.maximum]
+        assert list(v << (self.itemsize * 8)) == [0, 0]
+
+    def test_it_should_not_overflow_wide_sums(self):
+        v = self.make_vector([self.maximum] * 3)
+
+        assert v.sum(wide=True) == 3 * self.maximum
+        assert v.mean() == float(self.maximum)
+
+    def test_it_should_compare_with_scalars_out_of_range(self):
+        v = self.make_vector([self.minimum, self.maximum])
+
+        assert list(v > self.maximum + 1) == [0, 0]
+        assert list(v < self.maximum + 1) == [1, 1]
+        assert list(v <= self.minimum - 1) == [0, 0]
+        assert list(v >= self.minimum - 1) == [1, 1]
+        assert list(v.eq(self.maximum + 1)) == [0, 0]
+        assert list(v.ne(self.minimum - 1)) == [1, 1]
+        assert list(v.filter(v >= self.maximum + 1)) == []
+
+    def test_it_should_compare_with_floating_point_scalars(self):
+        v = self.make_vector([1, 2, 3])
+
+        assert list(v > 2.5) == [0, 0, 1]
+        assert list(v >= 2.5) == [0, 0, 1]
+        assert list(v < 2.5) == [1, 1, 0]
+        assert list(v <= 2.5) == [1, 1, 0]
+        assert list(v.eq(2.0)) == [0, 1, 0]
+        assert list(v.eq(2.5)) == [0, 0, 0]
+        assert list(v < float('inf')) == [1, 1, 1]
+        assert list(v.ne(float('nan'))) == [1, 1, 1]
+
+    def test_it_should_search_for_scalars_out_of_range_like_bisect(self):
+        l = [self.minimum, 1, 2, self.maximum]
+        v = self.make_vector(l)
+
+        for value in (self.minimum - 1, self.maximum + 1, 1.5):
+            assert v.bisect_left(value) == bisect.bisect_left(l, value)
+            assert v.bisect_right(value) == bisect.bisect_right(l, value)
+        assert list(v.searchsorted([self.minimum - 1, self.maximum + 1, 2])) == [0, 4, 2]
+        assert list(v.searchsorted([self.minimum - 1, self.maximum + 1, 2], side='right')) == [0, 4, 3]
+
+    def test_it_should_search_many_keys_like_bisect(self):
+        l = [self.minimum, 1, 2, 2, self.maximum]
+        v = self.make_vector(l)
+        keys = [self.minimum - 1, 1.5, 2.0, -0.5, self.maximum + 0.5, self.maximum + 1]
+
+        doubles = [key for key in keys if float(key) == key]  # exact as doubles
+
+        for side, search in [('left', bisect.bisect_left), ('right', bisect.bisect_right)]:
+            assert list(v.searchsorted(keys, side)) == [search(l, key) for key in keys]
+            expected = [search(l, key) for key in doubles]
+            assert list(v.searchsorted(array('d', doubles), side)) == expected
+            assert list(v.searchsorted(vector.VectorDouble(doubles), side)) == expected
+
+    def test_it_should_raise_overflow_error_inserting_values_out_of_range(self):
+        v = self.make_vector([self.minimum, self.maximum], track_sorted=True)
+        v.sort()
+
+        for value in (self.minimum - 1, self.maximum + 1):
+            with assert_raises(OverflowError):
+                v.insort(value)
+        assert list(v) == [self.minimum, self.maximum]
+        assert v.is_sorted()
+
+    def test_it_should_not_find_scalars_out_of_range(self):
+        v = self.make_vector([self.minimum, 1, self.maximum], track_sorted=True)
+
+        assert (self.maximum + 1) not in v
+        assert v.count(self.minimum - 1) == 0
+        v.sort()
+        assert (self.maximum + 1) not in v
+        assert (self.minimum - 1) not in v
+        assert 1.0 in v
+
+    def test_it_should_sort_the_whole_range_with_every_algorithm(self):
+        l = [random.randint(self.minimum, self.maximum) for _ in range(300)]
+        l += [self.maximum, self.minimum, 0]
+
+        for algorithm in ('auto', 'introsort', 'radix', 'counting'):
+            v = self.make_vector(l)
+            v.sort(algorithm=algorithm)
+            assert list(v) == sorted(l), algorithm
+
+
+class _TestFloatingValueType(_TestValueType):
+    def test_it_should_hold_fractional_values(self):
+        v = self.make_vector([0.5, -1.25])
+
+        assert list(v) == [0.5, -1.25]
+
+    def test_it_should_sum_fractional_values(self):
+        v = self.make_vector([0.5, -1.25, 0.25])
+
+        assert v.sum() == v.sum(wide=True) == -0.5
+        assert type(v.sum()) is float
+
+    def test_it_should_operate_like_python_floats(self):
+        v = self.make_vector([7.5, -7.5])
+
+        assert list(v // 2) == [7.5 // 2, -7.5 // 2]
+        assert list(v % 2) == [7.5 % 2, -7.5 % 2]
+        assert list(v * 0.5 + v) == [11.25, -11.25]
+
+    def test_it_should_not_have_bitwise_operators(self):
+        with assert_raises(TypeError):
+            self.make_vector([1.0]) & 1
+
+    def test_it_should_sort_fractional_values(self):
+        v = self.make_vector([0.5, -1.25, 0.25])
+
+        v.sort()
+
+        assert list(v) == [-1.25, 0.25, 0.5]
+
+    def test_it_should_not_sort_by_radix(self):
+        for algorithm in ('radix', 'counting'):
+            with assert_raises(TypeError):
+                self.make_vector([0.5, -1.25]).sort(algorithm=algorithm)
+
+
+class TestInt8Vector(_TestIntegerValueType):
+    make_vector = staticmethod(vector.VectorInt8)
+    minimum, maximum, itemsize, typestr = -2 ** 7, 2 ** 7 - 1, 1, 'i1'
+
+
+class TestInt16Vector(_TestIntegerValueType):
+    make_vector = staticmethod(vector.VectorInt16)
+    minimum, maximum, itemsize, typestr = -2 ** 15, 2 ** 15 - 1, 2, 'i2'
+
+
+class TestInt32Vector(_TestIntegerValueType):
+    make_vector = staticmethod(vector.VectorInt32)
+    minimum, maximum, itemsize, typestr = -2 ** 31, 2 ** 31 - 1, 4, 'i4'
+
+
+class TestInt64Vector(_TestIntegerValueType):
+    make_vector = staticmethod(vector.VectorInt64)
+    minimum, maximum, itemsize, typestr = -2 ** 63, 2 ** 63 - 1, 8, 'i8'
+
+
+class TestUInt8Vector(_TestIntegerValueType):
+    make_vector = staticmethod(vector.VectorUInt8)
+    minimum, maximum, itemsize, typestr = 0, 2 ** 8 - 1, 1, 'u1'
+
+
+class TestUInt16Vector(_TestIntegerValueType):
+    make_vector = staticmethod(vector.VectorUInt16)
+    minimum, maximum, itemsize, typestr = 0, 2 ** 16 - 1, 2, 'u2'
+
+
+class TestUInt32Vector(_TestIntegerValueType):
+    make_vector = staticmethod(vector.VectorUInt32)
+    minimum, maximum, itemsize, typestr = 0, 2 ** 32 - 1, 4, 'u4'
+
+
+class TestUInt64Vector(_TestIntegerValueType):
+    make_vector = staticmethod(vector.VectorUInt64)
+    minimum, maximum, itemsize, typestr = 0, 2 ** 64 - 1, 8, 'u8'
+
+    def test_it_should_raise_value_error_counting_values_beyond_sizes(self):
+        with assert_raises(ValueError):
+            self.make_vector([self.maximum]).bincount()
+
+
+class TestFloatVector(_TestFloatingValueType):
+    make_vector = staticmethod(vector.VectorFloat)
+    minimum, maximum, itemsize, typestr = -2.0 ** 127, 2.0 ** 127, 4, 'f4'
+
+
+class TestDoubleVector(_TestFloatingValueType):
+    make_vector = staticmethod(vector.VectorDouble)
+    minimum, maximum, itemsize, typestr = -2.0 ** 1023, 2.0 ** 1023, 8, 'f8'
+
+
 class _TestInt(object):
     def make_vector(self, *args, **kwargs):
         return vector.VectorInt(*args, **kwargs)
@@ -453,9 +1595,31 @@ class _TestLong(object):
         return vector.VectorLong(*args, **kwargs)
 
 
+class _TestCtypesInt(object):
+    vector_type = vector.vector_type('VectorInt', 'int', c_int, CtypesBackend())
+
+    def make_vector(self, *args, **kwargs):
+        return self.vector_type(*args, **kwargs)
+
+
+class _TestCtypesLong(object):
+    vector_type = vector.vector_type('VectorLong', 'long', c_long, CtypesBackend())
+
+    def make_vector(self, *args, **kwargs):
+        return self.vector_type(*args, **kwargs)
+
+
 class TestIntegerVector(_TestInt, _Tests):
     pass
 
 
 class TestLongVector(_TestLong, _Tests):
     pass
+
+
+class TestCtypesIntegerVector(_TestCtypesInt, _Tests):
+    pass
+
+
+class TestCtypesLongVector(_TestCtypesLong, _Tests):
+    pass
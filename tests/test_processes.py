@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+import operator
+import os
+import uuid
+
+from nose.plugins.skip import SkipTest
+
+from pystl import processes, VectorDouble, VectorLong
+from pystl.storage import SHARED_MEMORY_DIRECTORY
+
+
+def halves(chunk):
+    return [value / 2.0 for value in chunk]
+
+
+def doubled(chunk):
+    chunk *= 2
+    return chunk
+
+
+def total(chunk):
+    return sum(chunk)
+
+
+def pid(chunk):
+    return os.getpid()
+
+
+class TestMapChunks(object):
+    def test_it_should_return_the_results_in_the_order_of_the_chunks(self):
+        v = VectorLong(range(100))
+
+        results = processes.map_chunks(list, v, processes=2, chunks=4)
+
+        assert results == [list(range(start, start + 25)) for start in range(0, 100, 25)]
+
+    def test_it_should_run_the_function_in_other_processes(self):
+        results = processes.map_chunks(pid, VectorLong(range(10)), processes=2)
+
+        assert os.getpid() not in results
+
+    def test_it_should_not_make_more_chunks_than_elements(self):
+        assert processes.map_chunks(len, VectorLong([1, 2]), processes=1, chunks=5) == [1, 1]
+
+    def test_it_should_return_no_results_for_empty_vectors(self):
+        assert processes.map_chunks(len, VectorLong(), processes=1) == []
+
+    def test_it_should_run_in_the_given_executor(self):
+        class Executor(object):
+            def map(self, function, tasks):
+                return map(function, tasks)
+
+        results = processes.map_chunks(pid, VectorLong(range(10)), chunks=2,
+                                       executor=Executor())
+
+        assert results == [os.getpid()] * 2
+
+
+class TestTransformChunks(object):
+    def test_it_should_join_the_results_in_a_vector_of_the_same_type(self):
+        v = VectorLong(range(10))
+
+        result = processes.transform_chunks(doubled, v, processes=2)
+
+        assert isinstance(result, VectorLong)
+        assert list(result) == [value * 2 for value in range(10)]
+        assert list(v) == list(range(10))
+
+    def test_it_should_join_the_results_in_the_given_vector_type(self):
+        result = processes.transform_chunks(halves, VectorLong(range(4)), VectorDouble,
+                                            processes=2)
+
+        assert isinstance(result, VectorDouble)
+        assert list(result) == [0.0, 0.5, 1.0, 1.5]
+
+
+class TestReduceChunks(object):
+    def test_it_should_combine_the_results(self):
+        v = VectorLong(range(1000))
+
+        assert processes.reduce_chunks(total, v, operator.add, processes=2,
+                                       chunks=7) == sum(range(1000))
+
+    def test_it_should_start_from_the_initial_value(self):
+        assert processes.reduce_chunks(total, VectorLong(range(10)), operator.add,
+                                       100, processes=2) == 145
+
+    def test_it_should_return_the_initial_value_for_empty_vectors(self):
+        assert processes.reduce_chunks(total, VectorLong(), operator.add, 0,
+                                       processes=1) == 0
+
+
+class TestSharedChunks(object):
+    def setup(self):
+        if not os.path.isdir(SHARED_MEMORY_DIRECTORY):
+            raise SkipTest(u'no POSIX shared memory')
+        self.vector = VectorLong.shared('pystl-test-{}'.format(uuid.uuid4().hex), 100)
+        self.vector.extend(range(10))
+
+    def teardown(self):
+        self.vector.storage.unlink()
+        self.vector.close()
+
+    def test_it_should_change_the_shared_vector_in_place(self):
+        result = processes.transform_chunks(doubled, self.vector, processes=2)
+
+        assert list(result) == [value * 2 for value in range(10)]
+        assert list(self.vector) == list(result)
+
+    def test_it_should_reduce_the_shared_vector(self):
+        assert processes.reduce_chunks(total, self.vector, operator.add,
+                                       processes=2, chunks=3) == 45
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import uuid
+
+from nose.plugins.skip import SkipTest
+from nose.tools import assert_raises
+
+from pystl import storage, VectorInt, VectorLong
+from pystl.storage import HEADER, HEADER_SIZE, MAGIC, SHARED_MEMORY_DIRECTORY, VERSION
+from ._helpers import temporary_path
+
+
+class TestSave(object):
+    def test_it_should_write_the_header_and_the_elements(self):
+        with temporary_path() as path:
+            v = VectorLong([1, 2, 3])
+
+            v.save(path)
+
+            with io.open(path, 'rb') as stream:
+                data = stream.read()
+            magic, version, typestr, count = HEADER.unpack(data[:HEADER.size])
+            assert (magic, version, count) == (MAGIC, VERSION, 3)
+            assert typestr.rstrip(b'\0') == storage._typestr(v.value_type).encode('ascii')
+            assert data[HEADER_SIZE:] == v.tobytes()
+
+
+class TestOpen(object):
+    def test_it_should_map_the_elements_without_copying(self):
+        with temporary_path() as path:
+            VectorLong(range(10)).save(path)
+
+            v = VectorLong.open(path)
+
+            assert list(v) == list(range(10))
+            assert isinstance(v.storage, storage.MappedFile)
+            assert v.vector_data(v.vector) == v.storage.address
+
+    def test_it_should_keep_changes_in_memory_when_read_only(self):
+        with temporary_path() as path:
+            VectorLong([3, 1, 2]).save(path)
+            v = VectorLong.open(path)
+
+            v.sort()
+            v.extend(range(100))
+
+            assert list(v[:3]) == [1, 2, 3]
+            assert list(VectorLong.open(path)) == [3, 1, 2]
+
+    def test_it_should_write_changes_to_the_file_when_writable(self):
+        with temporary_path() as path:
+            VectorLong([3, 1, 2]).save(path)
+            v = VectorLong.open(path, 'r+')
+
+            v.sort()
+            v.flush()
+
+            assert list(VectorLong.open(path)) == [1, 2, 3]
+
+    def test_it_should_grow_the_file_along_the_vector(self):
+        with temporary_path() as path:
+            VectorLong([1]).save(path)
+            v = VectorLong.open(path, 'r+')
+
+            v.reserve(100)
+            v.extend(range(50))
+            assert v.vector_data(v.vector) == v.storage.address
+            v.extend(range(100))  # beyond the file
+            v.close()
+
+            assert list(VectorLong.open(path)) == [1] + list(range(50)) + list(range(100))
+            assert len(v) == 0 and v.storage is None
+
+    def test_it_should_flush_when_collected(self):
+        with temporary_path() as path:
+            VectorLong().save(path)
+            v = VectorLong.open(path, 'r+')
+
+            v.append(7)
+            del v
+
+            assert list(VectorLong.open(path)) == [7]
+
+    def test_it_should_write_results_of_operations_into_it(self):
+        with temporary_path() as path:
+            VectorLong([1, 3]).save(path)
+            v = VectorLong.open(path, 'r+')
+
+            v.union([2, 4], out=v)
+            v.close()
+
+            assert list(VectorLong.open(path)) == [1, 2, 3, 4]
+
+    def test_it_should_raise_type_error_for_other_element_types(self):
+        with temporary_path() as path:
+            VectorLong([1]).save(path)
+
+            with assert_raises(TypeError):
+                VectorInt.open(path)
+
+    def test_it_should_raise_value_error_for_other_files(self):
+        with temporary_path() as path:
+            with io.open(path, 'wb') as stream:
+                stream.write(b'not a vector')
+
+            with assert_raises(ValueError):
+                VectorLong.open(path)
+
+    def test_it_should_raise_value_error_for_unknown_modes(self):
+        with temporary_path() as path:
+            VectorLong([1]).save(path)
+
+            with assert_raises(ValueError):
+                VectorLong.open(path, 'w')
+
+
+class TestShared(object):
+    def setup(self):
+        if not os.path.isdir(SHARED_MEMORY_DIRECTORY):
+            raise SkipTest(u'no POSIX shared memory')
+        self.name = 'pystl-test-{}'.format(uuid.uuid4().hex)
+        self.vectors = []
+
+    def teardown(self):
+        for vector in self.vectors:
+            if vector.storage is not None:
+                vector.close()
+        path = os.path.join(SHARED_MEMORY_DIRECTORY, self.name)
+        if os.path.exists(path):
+            os.unlink(path)
+
+    def shared(self, capacity=None):
+        vector = VectorLong.shared(self.name, capacity)
+        self.vectors.append(vector)
+        return vector
+
+    def test_it_should_create_an_empty_vector_with_the_capacity(self):
+        v = self.shared(100)
+
+        assert len(v) == 0
+        assert v.capacity() == 100
+        assert isinstance(v.storage, storage.SharedMemory)
+
+    def test_it_should_share_the_elements_with_attached_vectors(self):
+        v = self.shared(100)
+        v.extend(range(10))
+        v.flush()
+
+        attached = self.shared()
+        attached[0] = 42
+
+        assert list(attached) == [42] + list(range(1, 10))
+        assert v[0] == 42
+        assert attached.vector_data(attached.vector) == attached.storage.address
+
+    def test_it_should_share_the_elements_with_other_processes(self):
+        v = self.shared(100)
+        v.extend(range(10))
+        v.flush()
+
+        pid = os.fork()
+        if pid == 0:
+            attached = VectorLong.shared(self.name)
+            attached.append(sum(attached))
+            attached.flush()
+            os._exit(0)
+        os.waitpid(pid, 0)
+
+        assert list(self.shared()) == list(range(10)) + [45]
+
+    def test_it_should_refuse_to_reserve_beyond_the_capacity(self):
+        v = self.shared(10)
+
+        with assert_raises(ValueError):
+            v.reserve(11)
+
+    def test_it_should_refuse_to_flush_once_grown_beyond_the_capacity(self):
+        v = self.shared(10)
+
+        v.extend(range(11))
+
+        assert list(v) == list(range(11))
+        with assert_raises(ValueError):
+            v.flush()
+
+    def test_it_should_remove_the_name_when_unlinked(self):
+        v = self.shared(10)
+        v.append(1)
+
+        v.storage.unlink()
+
+        assert list(v) == [1]
+        with assert_raises((IOError, OSError)):
+            self.shared()
+
+    def test_it_should_raise_an_error_if_the_name_exists(self):
+        self.shared(10)
+
+        with assert_raises((IOError, OSError)):
+            self.shared(10)
+
+    def test_it_should_raise_value_error_for_invalid_names(self):
+        with assert_raises(ValueError):
+            VectorLong.shared('a/b')
@@ -1,27 +1,80 @@
 # -*- coding: utf-8 -*-
 
-from ._helpers import Spy, patch
+from array import array
+from ctypes import addressof, c_long, c_double
+
+from ._helpers import CheckedSpy, Spy, patch
 from nose.tools import assert_raises
 
 from pystl import Vector
+from pystl.vector import VectorIterator
+from pystl.backend import (ADD, SUB, FLOORDIV, ZERO_DIVISION, RIGHT_SCALAR,
+                           LEFT_SCALAR, GT, UNION, AUTO, OUT_OF_RANGE, EMPTY,
+                           NO_MEMORY, _check_index)
 
 
 def make_vector(*args, **kwargs):
     patch(
         Vector,
+        value_type=c_long,
         vector_new=Spy(),
         vector_delete=Spy(),
         vector_size=Spy(),
+        vector_capacity=Spy(),
+        vector_reserve=Spy(returns=0),
+        vector_shrink_to_fit=Spy(),
+        vector_resize=Spy(returns=0),
         vector_at=Spy(),
+        vector_checked_at=CheckedSpy(errcheck=_check_index),
+        vector_checked_set=CheckedSpy(errcheck=_check_index),
+        vector_checked_insert=CheckedSpy(errcheck=_check_index),
+        vector_checked_erase=CheckedSpy(errcheck=_check_index),
+        vector_checked_pop=CheckedSpy(errcheck=_check_index),
         vector_set=Spy(),
         vector_push_back=Spy(),
+        vector_data=Spy(),
+        vector_adopt=Spy(returns=0),
+        vector_release=Spy(),
+        vector_extend=Spy(),
+        vector_replace=Spy(),
+        vector_assign_strided=Spy(),
+        vector_copy_range=Spy(),
+        vector_slice=Spy(),
         vector_insert=Spy(),
         vector_erase=Spy(),
         vector_erase_slice=Spy(),
         vector_find=Spy(),
         vector_pop_back=Spy(),
         vector_count=Spy(),
-        vector_sort=Spy(),
+        vector_is_sorted=Spy(),
+        vector_lower_bound=Spy(),
+        vector_upper_bound=Spy(),
+        vector_searchsorted=Spy(),
+        vector_sorted_find=Spy(),
+        vector_sorted_count=Spy(),
+        vector_operate=Spy(returns=0),
+        vector_compare=Spy(),
+        vector_filter=Spy(),
+        vector_take=Spy(returns=0),
+        vector_put=Spy(returns=0),
+        vector_set_operation=Spy(),
+        vector_includes=Spy(returns=1),
+        vector_merge_many=Spy(),
+        vector_unique=Spy(),
+        vector_value_counts=Spy(),
+        vector_bincount=Spy(returns=0),
+        vector_histogram=Spy(),
+        vector_sum=CheckedSpy(returns=(0, 0, 0.0)),
+        vector_min=CheckedSpy(),
+        vector_max=CheckedSpy(),
+        vector_minmax=CheckedSpy(),
+        vector_argmin=CheckedSpy(returns=0),
+        vector_argmax=CheckedSpy(returns=0),
+        vector_sort=Spy(returns=0),
+        vector_partial_sort=Spy(),
+        vector_nth_element=Spy(),
+        vector_argsort=Spy(),
+        vector_topk=Spy(),
         vector_reverse=Spy(),
         vector_equal=Spy()
     )
@@ -45,7 +98,8 @@ class TestConstructor(object):
     def test_it_should_populate_vector_when_a_collection_is_given(self):
         v = make_vector([1, 2, 3])
 
-        assert v.vector_push_back.number_of_calls == 3
+        assert v.vector_extend.number_of_calls == 1
+        assert v.vector_extend.call_args[2] == 3
 
     def test_it_should_not_be_managed_if_ref_is_given(self):
         v = make_vector(ref=1)
@@ -70,6 +124,17 @@ class TestConstructor(object):
         assert v.vector is ref
 
 
+    def test_it_should_reserve_capacity_if_given(self):
+        v = make_vector(capacity=100)
+
+        assert v.vector_reserve.call_args == (v.vector, 100)
+
+    def test_it_should_not_reserve_capacity_if_not_given(self):
+        v = make_vector()
+
+        assert v.vector_reserve.called is False
+
+
 class TestDestructor(object):
     def test_it_should_delete_the_vector_if_managed(self):
         vector_delete = Spy()
@@ -108,43 +173,34 @@ class TestLen(object):
 
 
 class TestGetItem(object):
-    def test_it_should_raise_index_error_if_vector_is_empty(self):
+    def test_it_should_raise_index_error_if_index_is_out_of_range(self):
         v = make_vector()
-        v.vector_size.returns = 0
-
-        with assert_raises(IndexError):
-            v[0]
-
-    def test_it_should_raise_index_error_if_index_bigger_than_vector_size(self):
-        v = make_vector()
-        v.vector_size.returns = 0
+        v.vector_checked_at.status = OUT_OF_RANGE
 
         with assert_raises(IndexError):
             v[1]
 
     def test_it_should_return_the_nth_element(self):
         v = make_vector()
-        v.vector_at.returns = 1
-        v.vector_size.returns = 1
+        v.vector_checked_at.returns = 1
 
         assert v[0] == 1
+        assert v.vector_checked_at.call_args == (None, 0)
 
-    def test_it_should_return_the_nth_element_from_the_back_with_negative_numbers(self):
+    def test_it_should_pass_negative_indexes_to_be_resolved_from_the_back(self):
         v = make_vector()
-        v.vector_at.returns = 0
-        v.vector_size.returns = 1
 
         v[-1]
 
-        assert v.vector_at.call_args[1] == 0
+        assert v.vector_checked_at.call_args == (None, -1)
 
-    def test_it_should_raise_index_error_if_neg_index_bigger_than_vector_size(self):
+    def test_it_should_access_the_element_with_a_single_call(self):
         v = make_vector()
-        v.vector_at.returns = -1
-        v.vector_size.returns = 2
 
-        with assert_raises(IndexError):
-            v[-3]
+        v[0]
+
+        assert v.vector_checked_at.number_of_calls == 1
+        assert v.vector_size.called is False
 
 
 class TestGetSlice(object):
@@ -155,117 +211,197 @@ class TestGetSlice(object):
         assert v[:] == []
 
     def test_it_should_use_0_for_start_if_not_given(self):
-        size, index, value = 1, 0, 1
+        size = 1
         v = make_vector()
         v.vector_size.returns = size
-        v.vector_at.returns = value
 
-        assert v[:size] == [value]
-        assert v.vector_at.call_args == (None, index)
+        assert v[:size] == [0]
+        assert v.vector_copy_range.call_args[:4] == (None, 0, size, 1)
 
     def test_it_should_use_size_for_end_if_not_given(self):
-        size, index, value = 1, 0, 1
+        size = 1
         v = make_vector()
         v.vector_size.returns = size
-        v.vector_at.returns = value
 
-        assert v[0:] == [value]
-        assert v.vector_at.call_args == (None, 0)
+        assert v[0:] == [0]
+        assert v.vector_copy_range.call_args[:4] == (None, 0, size, 1)
 
     def test_it_should_handle_begin_beign_bigger_than_end(self):
         v = make_vector()
         v.vector_size.returns = 10
 
         assert v[100:-100] == []
+        assert v.vector_copy_range.called is False
 
     def test_it_should_handle_negative_steps(self):
-        size, value = 10, 1
+        size = 10
         v = make_vector()
         v.vector_size.returns = size
-        v.vector_at.returns = value
 
-        print(v[100:-100:-1])
+        assert len(v[100:-100:-1]) == size
+        assert v.vector_copy_range.call_args[:4] == (None, 9, -1, -1)
 
-        assert v[100:-100:-1] == [1 for i in range(10)]
+    def test_it_should_copy_the_slice_with_a_single_call(self):
+        v = make_vector()
+        v.vector_size.returns = 10
 
+        v[::2]
 
-class TestSetItem(object):
-    def test_it_should_raise_index_error_if_vector_is_empty(self):
-        size, index, value = 0, 1, 5
+        assert v.vector_copy_range.number_of_calls == 1
+        assert v.vector_at.called is False
+
+    def test_it_should_return_a_new_vector_if_asked_to(self):
+        ref = 1
         v = make_vector()
-        v.vector_size.returns = size
+        v.vector_size.returns = 10
+        v.vector_slice.returns = ref
 
-        with assert_raises(IndexError):
-            v[index] = value
+        sliced = v.getslice(slice(2, 8, 3), as_vector=True)
 
-    def test_it_should_raise_index_error_if_index_bigger_than_vector_size(self):
-        size, index, value = 1, 1, 5
-        v = make_vector()
-        v.vector_size.returns = size
+        assert v.vector_slice.call_args == (None, 2, 8, 3)
+        assert sliced.vector is ref
+        assert sliced.managed is True
 
-        with assert_raises(IndexError):
-            v[index] = value
 
-    def test_it_should_raise_index_error_if_neg_index_bigger_than_vector_size(self):
-        size, index, value = 2, -3, 1
+class TestSetItem(object):
+    def test_it_should_raise_index_error_if_index_is_out_of_range(self):
         v = make_vector()
-        v.vector_size.returns = size
+        v.vector_checked_set.status = OUT_OF_RANGE
 
         with assert_raises(IndexError):
-            v[index] = value
+            v[1] = 5
 
-    def test_it_should_call_vector_set_when_setting_the_nth_element(self):
-        vector, size, index, value = None, 2, 1, 2
+    def test_it_should_call_vector_checked_set_when_setting_the_nth_element(self):
+        vector, index, value = None, 1, 2
         v = make_vector()
-        v.vector_size.returns = size
 
         v[index] = value
 
-        assert v.vector_set.call_args == (vector, index, value)
+        assert v.vector_checked_set.call_args == (vector, index, value)
 
-    def test_it_should_call_vector_set_when_setting_from_the_back(self):
-        vector, size, index, true_index, value = None, 3, -1, 2, 100
+    def test_it_should_call_vector_checked_set_when_setting_from_the_back(self):
+        vector, index, value = None, -1, 100
         v = make_vector()
-        v.vector_size.returns = size
 
         v[index] = value
 
-        assert v.vector_set.call_args == (vector, true_index, value)
+        assert v.vector_checked_set.call_args == (vector, index, value)
+        assert v.vector_size.called is False
 
 
-class TestInsert(object):
-    def test_it_should_raise_index_error_if_vector_is_empty(self):
-        size, index, value = 0, 1, 5
+class TestSetSlice(object):
+    def test_it_should_call_vector_replace_when_setting_a_slice(self):
         v = make_vector()
-        v.vector_size.returns = size
+        v.vector_size.returns = 10
 
-        with assert_raises(IndexError):
-            v.insert(index, value)
+        v[2:5] = [1, 2]
+
+        vector, begin, end, values, size = v.vector_replace.call_args
+        assert (begin, end, size) == (2, 5, 2)
+        assert values[:] == [1, 2]
 
-    def test_it_should_raise_index_error_if_index_bigger_than_vector_size(self):
-        size, index, value = 1, 1, 5
+    def test_it_should_not_replace_backwards_when_start_is_bigger_than_stop(self):
         v = make_vector()
-        v.vector_size.returns = size
+        v.vector_size.returns = 10
 
-        with assert_raises(IndexError):
-            v.insert(index, value)
+        v[5:2] = [1, 2]
+
+        assert v.vector_replace.call_args[1:3] == (5, 5)
 
-    def test_it_should_raise_index_error_if_neg_index_bigger_than_vector_size(self):
-        size, index, value = 2, -3, 1
+    def test_it_should_call_vector_assign_strided_for_extended_slices(self):
         v = make_vector()
-        v.vector_size.returns = size
+        v.vector_size.returns = 10
+
+        v[9::-4] = [1, 2, 3]
+
+        vector, start, step, values, size = v.vector_assign_strided.call_args
+        assert (start, step, size) == (9, -4, 3)
+
+    def test_it_should_raise_value_error_if_extended_slice_sizes_differ(self):
+        v = make_vector()
+        v.vector_size.returns = 10
+
+        with assert_raises(ValueError):
+            v[::2] = [1]
+
+        assert v.vector_assign_strided.called is False
+
+
+class TestReserve(object):
+    def test_it_should_call_vector_reserve(self):
+        v = make_vector()
+
+        v.reserve(10)
+
+        assert v.vector_reserve.call_args == (None, 10)
+
+    def test_it_should_raise_value_error_with_negative_capacity(self):
+        v = make_vector()
+
+        with assert_raises(ValueError):
+            v.reserve(-1)
+
+    def test_it_should_raise_overflow_error_with_capacities_beyond_size_t(self):
+        v = make_vector()
+
+        with assert_raises(OverflowError):
+            v.reserve(2 ** 64)
+
+        assert v.vector_reserve.called is False
+
+    def test_it_should_raise_memory_error_if_reserve_fails(self):
+        v = make_vector()
+        v.vector_reserve.returns = -1
+
+        with assert_raises(MemoryError):
+            v.reserve(10)
+
+
+class TestResize(object):
+    def test_it_should_call_vector_resize_with_zero_fill_by_default(self):
+        v = make_vector()
+
+        v.resize(10)
+
+        assert v.vector_resize.call_args == (None, 10, 0)
+
+    def test_it_should_raise_value_error_with_negative_size(self):
+        v = make_vector()
+
+        with assert_raises(ValueError):
+            v.resize(-1)
+
+    def test_it_should_raise_overflow_error_with_sizes_beyond_size_t(self):
+        v = make_vector()
+
+        with assert_raises(OverflowError):
+            v.resize(2 ** 64)
+
+        assert v.vector_resize.called is False
+
+    def test_it_should_raise_memory_error_if_resize_fails(self):
+        v = make_vector()
+        v.vector_resize.returns = -1
+
+        with assert_raises(MemoryError):
+            v.resize(10)
+
+
+class TestInsert(object):
+    def test_it_should_raise_index_error_if_index_is_out_of_range(self):
+        v = make_vector()
+        v.vector_checked_insert.status = OUT_OF_RANGE
 
         with assert_raises(IndexError):
-            v.insert(index, value)
+            v.insert(1, 5)
 
-    def test_it_should_call_vector_insert_when_inserting(self):
-        vector, size, index, value = None, 2, 1, 5
+    def test_it_should_call_vector_checked_insert_when_inserting(self):
+        vector, index, value = None, 1, 5
         v = make_vector()
-        v.vector_size.returns = size
 
         v.insert(index, value)
 
-        assert v.vector_insert.call_args == (vector, index, value)
+        assert v.vector_checked_insert.call_args == (vector, index, value)
 
 
 class TestAppend(object):
@@ -279,59 +415,109 @@ class TestAppend(object):
 
 
 class TestExtend(object):
-    def test_it_should_call_append_for_every_element_when_extending(self):
-        vector, values = None, [1, 2, 3]
+    def test_it_should_call_vector_extend_once_when_extending(self):
+        values = [1, 2, 3]
         v = make_vector()
         v.append = Spy()
 
         v.extend(values)
 
-        assert v.append.number_of_calls == len(values)
+        assert v.vector_extend.number_of_calls == 1
+        assert v.append.called is False
+
+    def test_it_should_pass_all_the_values_to_vector_extend(self):
+        values = [1, 2, 3]
+        v = make_vector()
+
+        v.extend(values)
+
+        vector, array, size = v.vector_extend.call_args
+        assert size == len(values)
+        assert array[:] == values
+
+    def test_it_should_not_call_vector_extend_when_extending_with_nothing(self):
+        v = make_vector()
+
+        v.extend([])
+
+        assert v.vector_extend.called is False
+
+    def test_it_should_raise_value_error_if_bytes_do_not_fit_values(self):
+        v = make_vector()
+
+        with assert_raises(ValueError):
+            v.extend(b'123')
 
 
 class TestIter(object):
     def test_it_should_return_an_iterable(self):
-        vector, values = None, [1, 1, 1]
+        values = (c_long * 3)(1, 1, 1)
         v = make_vector()
-        v.vector_at.returns = 1
+        v.vector_data.returns = addressof(values)
         v.vector_size.returns = 3
 
-        assert list(v) == values
+        assert list(v) == [1, 1, 1]
 
+    def test_it_should_not_call_vector_at_when_iterating(self):
+        values = (c_long * 3)(1, 1, 1)
+        v = make_vector()
+        v.vector_data.returns = addressof(values)
+        v.vector_size.returns = 3
 
-class TestDelItem(object):
-    def test_it_should_raise_index_error_if_vector_is_empty(self):
-        size, index = 0, 1
+        list(v)
+
+        assert v.vector_at.called is False
+
+
+class TestVectorIterator(object):
+    def test_it_should_read_the_vector_in_chunks(self):
+        values = (c_long * 5)(0, 1, 2, 3, 4)
         v = make_vector()
-        v.vector_size.returns = size
+        v.vector_data.returns = addressof(values)
+        v.vector_size.returns = 5
 
-        with assert_raises(IndexError):
-            del v[index]
+        chunks = list(VectorIterator(v, chunk_size=2).chunks())
 
-    def test_it_should_raise_index_error_if_index_bigger_than_vector_size(self):
-        size, index = 1, 1
+        assert chunks == [[0, 1], [2, 3], [4]]
+        assert v.vector_data.number_of_calls == 3
+
+    def test_it_should_iterate_over_all_the_elements(self):
+        values = (c_long * 5)(0, 1, 2, 3, 4)
         v = make_vector()
-        v.vector_size.returns = size
+        v.vector_data.returns = addressof(values)
+        v.vector_size.returns = 5
 
-        with assert_raises(IndexError):
-            del v[index]
+        assert list(VectorIterator(v, chunk_size=2)) == [0, 1, 2, 3, 4]
 
-    def test_it_should_raise_index_error_if_neg_index_bigger_than_vector_size(self):
-        size, index = 2, -3
+    def test_it_should_raise_runtime_error_if_size_changes(self):
+        values = (c_long * 5)(0, 1, 2, 3, 4)
         v = make_vector()
-        v.vector_size.returns = size
+        v.vector_data.returns = addressof(values)
+        v.vector_size.returns = 5
+        chunks = VectorIterator(v, chunk_size=2).chunks()
+
+        next(chunks)
+        v.vector_size.returns = 4
+
+        with assert_raises(RuntimeError):
+            next(chunks)
+
+
+class TestDelItem(object):
+    def test_it_should_raise_index_error_if_index_is_out_of_range(self):
+        v = make_vector()
+        v.vector_checked_erase.status = OUT_OF_RANGE
 
         with assert_raises(IndexError):
-            del v[index]
+            del v[1]
 
-    def test_it_should_call_vector_erase_when_deleting_an_element(self):
-        vector, size, index = None, 1, 0
+    def test_it_should_call_vector_checked_erase_when_deleting_an_element(self):
+        vector, index = None, -1
         v = make_vector()
-        v.vector_size.returns = size
 
         del v[index]
 
-        assert v.vector_erase.call_args == (vector, index)
+        assert v.vector_checked_erase.call_args == (vector, index)
 
 
 class TestDelItemSlice(object):
@@ -392,70 +578,68 @@ class TestIndex(object):
 class TestPop(object):
     def test_it_should_raise_index_error_when_pop_from_empty_vector(self):
         v = make_vector()
-        v.vector_size.returns = 0
+        v.vector_checked_pop.status = EMPTY
 
         with assert_raises(IndexError):
             v.pop()
 
-    def test_it_should_return_last_element_when_pop(self):
-        v = make_vector()
-        v.vector_size.returns = 1
-        v.vector_pop_back.returns = 0
-
-        value = v.pop()
-
-        assert value == 0
-
     def test_it_should_raise_index_error_when_pop_with_index_out_of_range(self):
         v = make_vector()
-        v.vector_size.returns = 1
+        v.vector_checked_pop.status = OUT_OF_RANGE
 
         with assert_raises(IndexError):
             v.pop(1)
 
-    def test_it_should_raise_index_error_when_pop_with_negative_index_out_of_range(self):
-        v = make_vector()
-        v.vector_size.returns = 1
-
-        with assert_raises(IndexError):
-            v.pop(-2)
-
-    def test_it_should_return_nth_element_when_pop_with_index(self):
+    def test_it_should_pop_the_last_element_by_default(self):
         v = make_vector()
-        v.vector_size.returns = 2
-        v.vector_at.returns = 0
+        v.vector_checked_pop.returns = 0
 
-        value = v.pop(0)
+        value = v.pop()
 
         assert value == 0
+        assert v.vector_checked_pop.call_args == (None, -1)
 
-    def test_it_should_remove_nth_element_when_pop_with_index(self):
+    def test_it_should_pop_the_nth_element_when_pop_with_index(self):
         v = make_vector()
-        v.vector_size.returns = 2
+        v.vector_checked_pop.returns = 3
 
-        v.pop(0)
+        value = v.pop(0)
 
-        assert v.vector_erase.called
+        assert value == 3
+        assert v.vector_checked_pop.call_args == (None, 0)
 
 
 class TestRemove(object):
     def test_it_should_raise_value_error_if_element_is_not_found(self):
         v = make_vector()
-        v.vector_size.returns = 0
         v.vector_find.returns = -1
 
         with assert_raises(ValueError):
             v.remove(0)
 
     def test_it_should_call_erase_with_found_element_index(self):
-        vector, index, element, size = None, 1, 0, 2
+        vector, index, element = None, 1, 0
         v = make_vector()
-        v.vector_size.returns = size
         v.vector_find.returns = index
 
         v.remove(element)
 
-        assert v.vector_erase.call_args == (vector, index)
+        assert v.vector_checked_erase.call_args == (vector, index)
+
+
+class TestCheckIndex(object):
+    def test_it_should_return_the_arguments_if_status_is_ok(self):
+        args = (None, 1)
+
+        assert _check_index(0, None, args) is args
+
+    def test_it_should_raise_index_error_if_out_of_range(self):
+        with assert_raises(IndexError):
+            _check_index(OUT_OF_RANGE, None, (None, 1))
+
+    def test_it_should_raise_index_error_if_empty(self):
+        with assert_raises(IndexError):
+            _check_index(EMPTY, None, (None, -1))
 
 
 class TestCount(object):
@@ -482,7 +666,283 @@ class TestSort(object):
 
         v.sort()
 
-        assert v.vector_sort.call_args == (None,)
+        assert v.vector_sort.call_args == (None, False, False, AUTO)
+
+    def test_it_should_not_remember_sorting_in_reverse(self):
+        v = make_vector(track_sorted=True)
+
+        v.sort(reverse=True, stable=True)
+
+        assert v.vector_sort.call_args == (None, True, True, AUTO)
+        assert v.sorted is False
+
+    def test_it_should_raise_index_error_for_nth_element_out_of_range(self):
+        v = make_vector()
+        patch(v, vector_size=Spy(returns=2))
+
+        with assert_raises(IndexError):
+            v.nth_element(2)
+
+        assert v.vector_nth_element.called is False
+
+
+class TestSorted(object):
+    def test_it_should_not_be_sorted_by_default(self):
+        v = make_vector()
+
+        assert v.sorted is False
+
+    def test_it_should_not_remember_sorting_if_not_tracking(self):
+        v = make_vector()
+
+        v.sort()
+
+        assert v.sorted is False
+
+    def test_it_should_remember_sorting_if_tracking(self):
+        v = make_vector(track_sorted=True)
+
+        v.sort()
+
+        assert v.sorted is True
+
+    def test_it_should_forget_sorting_when_changed(self):
+        v = make_vector(track_sorted=True)
+
+        for change in (lambda: v.append(1), lambda: v.insert(0, 1),
+                       lambda: v.__setitem__(0, 1), lambda: v.reverse(),
+                       lambda: v.resize(3)):
+            v.sort()
+            change()
+            assert v.sorted is False, change
+
+    def test_it_should_use_binary_search_when_sorted(self):
+        v = make_vector(track_sorted=True)
+        patch(v, vector_sorted_find=Spy(returns=2),
+              vector_sorted_count=Spy(returns=1))
+        v.sort()
+
+        assert 5 in v
+        assert v.index(5) == 2
+        assert v.count(5) == 1
+        assert v.vector_find.called is False
+        assert v.vector_count.called is False
+
+    def test_it_should_check_the_order_natively(self):
+        v = make_vector(track_sorted=True)
+        patch(v, vector_is_sorted=Spy(returns=1))
+
+        assert v.is_sorted() is True
+        assert v.sorted is True
+
+    def test_it_should_clip_bisect_ranges_to_the_vector(self):
+        v = make_vector()
+        patch(v, vector_size=Spy(returns=5))
+
+        v.bisect_left(3, 1, 10)
+
+        assert v.vector_lower_bound.call_args == (v.vector, 1, 5, 3)
+
+    def test_it_should_raise_value_error_with_negative_lo(self):
+        v = make_vector()
+
+        with assert_raises(ValueError):
+            v.bisect_right(3, -1)
+
+
+class TestSearchSorted(object):
+    def test_it_should_search_all_the_values_with_a_single_call(self):
+        v = make_vector()
+        out = array('l', [0, 0, 0])
+
+        assert v.searchsorted([1, 2, 3], side='right', out=out) is out
+
+        assert v.vector_searchsorted.number_of_calls == 1
+        assert v.vector_searchsorted.call_args[2:4] == (3, True)
+
+    def test_it_should_not_call_vector_searchsorted_without_values(self):
+        v = make_vector()
+
+        v.searchsorted([], out=array('l'))
+
+        assert v.vector_searchsorted.called is False
+
+    def test_it_should_search_arrays_of_the_same_type_in_place(self):
+        v = make_vector()
+        values = array('l', [-2 ** 63, 2, 2 ** 63 - 1])
+
+        v.searchsorted(values, out=array('l', [0, 0, 0]))
+
+        assert v.vector_searchsorted.call_args[1] == values.buffer_info()[0]
+
+
+class TestOperate(object):
+    def test_it_should_operate_with_a_single_call(self):
+        v = make_vector()
+        patch(v, vector_size=Spy(returns=3), vector_data=Spy(returns=16))
+
+        v.operate(ADD, 2, out=v)
+
+        assert v.vector_operate.number_of_calls == 1
+        operation, operands, left, right, out, size = v.vector_operate.call_args
+        assert (operation, operands, left, out, size) == (ADD, RIGHT_SCALAR, 16, 16, 3)
+        assert list(right) == [2]
+
+    def test_it_should_use_the_scalar_as_left_operand_if_reflected(self):
+        v = make_vector()
+        patch(v, vector_size=Spy(returns=3), vector_data=Spy(returns=16))
+
+        v.operate(SUB, 2, reflected=True, out=v)
+
+        operation, operands, left, right = v.vector_operate.call_args[:4]
+        assert (operands, list(left), right) == (LEFT_SCALAR, [2], 16)
+
+    def test_it_should_not_implement_other_operands(self):
+        v = make_vector()
+        patch(v, vector_size=Spy(returns=0))
+
+        assert v.operate(ADD, u'a') is NotImplemented
+        assert v.operate(ADD, [1]) is NotImplemented
+
+    def test_it_should_raise_zero_division_error_on_failure(self):
+        v = make_vector()
+        patch(v, vector_size=Spy(returns=0),
+              vector_operate=Spy(returns=ZERO_DIVISION))
+
+        with assert_raises(ZeroDivisionError):
+            v.operate(FLOORDIV, 0, out=v)
+
+
+class TestCompare(object):
+    def test_it_should_compare_with_a_single_call(self):
+        v = make_vector()
+        patch(v, vector_size=Spy(returns=3), vector_data=Spy(returns=16))
+
+        v.compare(GT, 2)
+
+        assert v.vector_compare.number_of_calls == 1
+        comparison, operands, left, right, out, size = v.vector_compare.call_args
+        assert (comparison, operands, left, size) == (GT, RIGHT_SCALAR, 16, 3)
+        assert list(right) == [2]
+
+    def test_it_should_raise_type_error_for_other_operands(self):
+        v = make_vector()
+        patch(v, vector_size=Spy(returns=0))
+
+        with assert_raises(TypeError):
+            v.compare(GT, u'a')
+
+    def test_it_should_not_call_c_for_scalars_out_of_range(self):
+        v = make_vector()
+        patch(v, vector_size=Spy(returns=3))
+
+        assert list(v.compare(GT, 2 ** 64)) == [0, 0, 0]
+        assert list(v.compare(GT, -2 ** 64)) == [1, 1, 1]
+        assert v.vector_compare.called is False
+
+
+class TestSelection(object):
+    def test_it_should_raise_index_error_when_taking_out_of_range(self):
+        v = make_vector()
+        patch(v, vector_size=Spy(returns=0),
+              vector_take=Spy(returns=OUT_OF_RANGE))
+
+        with assert_raises(IndexError):
+            v.take([3])
+
+    def test_it_should_put_a_scalar_for_all_indices(self):
+        v = make_vector()
+
+        v.put([0, 1, 2], 7)
+
+        indices, count, values, size = v.vector_put.call_args[1:]
+        assert (list(indices), count, list(values), size) == ([0, 1, 2], 3, [7], 1)
+
+    def test_it_should_raise_value_error_putting_other_number_of_values(self):
+        v = make_vector()
+
+        with assert_raises(ValueError):
+            v.put([0, 1, 2], [1, 2])
+
+        assert v.vector_put.called is False
+
+
+class TestSetOperation(object):
+    def test_it_should_operate_into_out_with_a_single_call(self):
+        v, out = make_vector(), make_vector()
+        patch(v, vector_size=Spy(returns=0), vector_data=Spy(returns=16))
+
+        assert v.union([1, 2], out=out) is out
+
+        assert v.vector_set_operation.number_of_calls == 1
+        operation, left, lsize, right, rsize, vector = v.vector_set_operation.call_args
+        assert (operation, left, lsize, list(right), rsize) == (UNION, 16, 0, [1, 2], 2)
+        assert vector == out.vector
+
+    def test_it_should_raise_type_error_for_out_of_other_type(self):
+        v = make_vector()
+        patch(v, vector_size=Spy(returns=0))
+
+        with assert_raises(TypeError):
+            v.union([], out=array('l'))
+
+
+class TestBincount(object):
+    def test_it_should_raise_value_error_for_negative_values(self):
+        v = make_vector()
+        patch(v, vector_bincount=Spy(returns=OUT_OF_RANGE))
+
+        with assert_raises(ValueError):
+            v.bincount()
+
+    def test_it_should_raise_memory_error_without_room_for_the_counts(self):
+        v = make_vector()
+        patch(v, vector_bincount=Spy(returns=NO_MEMORY))
+
+        with assert_raises(MemoryError):
+            v.bincount()
+
+    def test_it_should_raise_type_error_for_floating_point_values(self):
+        v = make_vector()
+        patch(v, value_type=c_double)
+
+        with assert_raises(TypeError):
+            v.bincount()
+
+        assert v.vector_bincount.called is False
+
+
+class TestSum(object):
+    def test_it_should_join_the_halves_of_integer_sums(self):
+        v = make_vector()
+        patch(v, vector_sum=CheckedSpy(returns=(-1, 2 ** 64 - 5, 0.0)))
+
+        assert v.sum(wide=True) == -5
+        assert v.vector_sum.call_args == (v.vector, True)
+
+    def test_it_should_return_floating_sums(self):
+        v = make_vector()
+        patch(v, value_type=c_double,
+              vector_sum=CheckedSpy(returns=(0, 0, 1.5)))
+
+        assert v.sum() == 1.5
+
+
+class TestMean(object):
+    def test_it_should_raise_value_error_if_empty(self):
+        v = make_vector()
+        patch(v, vector_size=Spy(returns=0))
+
+        with assert_raises(ValueError):
+            v.mean()
+
+    def test_it_should_divide_the_wide_sum(self):
+        v = make_vector()
+        patch(v, vector_size=Spy(returns=4),
+              vector_sum=CheckedSpy(returns=(0, 10, 0.0)))
+
+        assert v.mean() == 2.5
+        assert v.vector_sum.call_args == (v.vector, True)
 
 
 class TestReverse(object):